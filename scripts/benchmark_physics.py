@@ -0,0 +1,99 @@
+""" Benchmark of the physics presets.
+
+Runs random agents in all registered playgrounds, for each physics preset,
+and reports the number of steps per second and the tunnelling rate:
+the fraction of (entity, step) pairs where an agent or a movable element
+crosses a wall during the step.
+A crossing is detected with a segment query between the positions
+of the entity before and after the step.
+"""
+import time
+
+import pymunk
+
+# Importing the collection registers its playgrounds
+import simple_playgrounds.playgrounds.collection  # pylint: disable=unused-import
+from simple_playgrounds.playgrounds.playground import PlaygroundRegister
+
+from simple_playgrounds.engine import Engine
+from simple_playgrounds.agents.parts.controllers import RandomContinuous
+from simple_playgrounds.agents.agents import BaseAgent
+from simple_playgrounds.elements.collection.basic import Wall, WallLayout
+from simple_playgrounds.common.definitions import PHYSICS_PRESETS
+
+N_STEPS = 500
+N_AGENTS = 4
+
+
+def moving_bodies(playground):
+    """ Bodies of the agents that were not teleported, and of the dynamic elements of the playground."""
+
+    bodies = [agent.base_platform.pm_body for agent in playground.agents if not agent.is_teleporting]
+    bodies += [elem.pm_body for elem in playground.elements
+               if elem.pm_body is not None and elem.pm_body.body_type == pymunk.Body.DYNAMIC]
+
+    return bodies
+
+
+def is_wall(playground, shape):
+    return isinstance(playground.get_entity_from_shape(shape), (Wall, WallLayout))
+
+
+def crosses_wall(playground, start, end):
+    """
+    True if the segment between start and end goes through a wall of the playground.
+    Bodies whose center starts or ends inside a wall are pushed out by the solver, and are not counted.
+    """
+
+    if start == end:
+        return False
+
+    for point in (start, end):
+        if any(is_wall(playground, query.shape)
+               for query in playground.space.point_query(point, 0, pymunk.ShapeFilter())):
+            return False
+
+    return any(is_wall(playground, query.shape)
+               for query in playground.space.segment_query(start, end, 0, pymunk.ShapeFilter()))
+
+
+print('{:<30} {:<10} {:>10} {:>12}'.format('playground', 'preset', 'steps/s', 'tunnelling'))
+
+for group, playgrounds in PlaygroundRegister.playgrounds.items():
+    for playground_name, pg_class in playgrounds.items():
+
+        for preset in PHYSICS_PRESETS:
+
+            pg = pg_class(physics=preset)
+
+            for _ in range(N_AGENTS):
+                pg.add_agent(BaseAgent(controller=RandomContinuous(), lateral=True))
+
+            engine = Engine(playground=pg, time_limit=N_STEPS)
+
+            n_crossings = 0
+            n_entities = 0
+
+            duration = 0.
+
+            while engine.game_on:
+
+                actions = engine.get_actions()
+                previous_positions = {body: body.position for body in moving_bodies(pg)}
+
+                t_start = time.time()
+                engine.step(actions)
+                duration += time.time() - t_start
+
+                # Elements produced or removed during the step are ignored
+                for body in moving_bodies(pg):
+                    if body in previous_positions:
+                        n_crossings += crosses_wall(pg, previous_positions[body], body.position)
+                        n_entities += 1
+
+            steps_per_second = engine.elapsed_time / duration
+
+            print('{:<30} {:<10} {:>10.0f} {:>12.4f}'.format(
+                group + '/' + playground_name, preset, steps_per_second, n_crossings / max(n_entities, 1)))
+
+            engine.terminate()
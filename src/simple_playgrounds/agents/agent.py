@@ -18,11 +18,13 @@ if TYPE_CHECKING:
     from ..common.entity import Entity
 
 from abc import ABC
+from functools import lru_cache
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from ..common.position_utils import CoordinateSampler, Coordinate
 from .parts.parts import Part, Platform, AnchoredPart
+from .parts.actuators import ActionLayout
 
 # pylint: disable=too-many-instance-attributes
 # pylint: disable=no-member
@@ -30,6 +32,12 @@ from .parts.parts import Part, Platform, AnchoredPart
 _BORDER_IMAGE = 3
 
 
+@lru_cache(maxsize=None)
+def _load_font(size: int) -> ImageFont.FreeTypeFont:
+    """ Loads the font used for drawing actions, once per size."""
+    return ImageFont.truetype("Pillow/Tests/fonts/FreeMono.ttf", size)
+
+
 class Agent(ABC):
     """
     Base class for building agents.
@@ -85,12 +93,16 @@ class Agent(ABC):
 
         # Actuators
         self.actuators: List[Actuator] = []
+        self._action_layout: Optional[ActionLayout] = None
 
         self._controller: Optional[Controller] = None
 
         # Reward
         self.reward: float = 0
 
+        # Replaced by the random generator of the Playground when the agent is added
+        self.rng: np.random.Generator = np.random.default_rng()
+
         # Teleport
         self.is_teleporting: bool = False
 
@@ -117,6 +129,17 @@ class Agent(ABC):
 
     def add_actuator(self, actuator: Actuator):
         self.actuators.append(actuator)
+        self._action_layout = None
+
+    @property
+    def action_layout(self) -> ActionLayout:
+        """
+        Order of the actuators in action arrays, with their bounds.
+        """
+        if self._action_layout is None:
+            self._action_layout = ActionLayout(self.actuators)
+
+        return self._action_layout
 
     # OVERLAPPING STRATEGY
     @property
@@ -142,7 +165,7 @@ class Agent(ABC):
         if isinstance(self._initial_coordinates, tuple):
             return self._initial_coordinates
         if isinstance(self._initial_coordinates, CoordinateSampler):
-            return self._initial_coordinates.sample()
+            return self._initial_coordinates.sample(rng=self.rng)
 
         return self._initial_coordinates
 
@@ -252,9 +275,21 @@ class Agent(ABC):
             return True
         return False
 
+    @property
+    def observation_spec(self) -> List[Tuple[type, Optional[Tuple[int, ...]], Optional[np.dtype]]]:
+        """
+        Type, shape and dtype of each sensor, in the order of agent.sensors.
+        Shape and dtype are None for sensors whose values are not numpy arrays.
+        """
+        return [
+            (type(sensor), None if sensor.shape is None else tuple(sensor.shape), sensor.dtype)
+            for sensor in self.sensors
+        ]
+
     @property
     def observations(self):
-        return {sensor: sensor.sensor_values for sensor in self.sensors}
+        """ Sensor values of the agent. Pending lazy sensors are computed when read."""
+        return {sensor: sensor.observe() for sensor in self.sensors}
 
     def generate_sensor_image(self,
                               width_sensor: int = 200,
@@ -273,6 +308,7 @@ class Agent(ABC):
 
         list_sensor_images = []
         for sensor in self.sensors:
+            sensor.observe()
             list_sensor_images.append(sensor.draw(width_sensor, height_sensor))
 
         full_height = sum([im.shape[0] for im in list_sensor_images])\
@@ -316,6 +352,33 @@ class Agent(ABC):
         for actuator, value in actions_dict.items():
             actuator.apply_action(value)
 
+    def apply_action_array(self, actions: np.ndarray):
+        """
+        Apply actions given as an array, following the action layout of the agent.
+        Commands are clipped to the range of each actuator,
+        then the noise of all actuators is applied at once.
+
+        Args:
+            actions: array of commands. Values beyond the number of actuators are ignored.
+        """
+
+        layout = self.action_layout
+
+        if len(actions) < len(layout):
+            raise ValueError('Agent {} expects {} actions'.format(self.name, len(layout)))
+
+        commands = layout.clip(actions[:len(layout)])
+        values = layout.apply_noise(commands, self.rng)
+
+        for actuator, discrete, command, value in zip(layout.actuators, layout.discrete.tolist(),
+                                                      commands.tolist(), values.tolist()):
+
+            if discrete:
+                command, value = int(command), int(value)
+
+            actuator.apply_action(value, checked=True)
+            actuator.command = command
+
     def owns_shape(self, pm_shape: Shape):
         """
         Verifies if a pm_shape belongs to an agent.
@@ -418,8 +481,7 @@ class Agent(ABC):
                                 (255, 255, 255))
         drawer_action_image = ImageDraw.Draw(img_actions)
 
-        fnt = ImageFont.truetype("Pillow/Tests/fonts/FreeMono.ttf",
-                                 int(height_action * 2 / 3))
+        fnt = _load_font(int(height_action * 2 / 3))
 
         current_height = 0
 
@@ -1,8 +1,7 @@
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, List
 
 from abc import ABC, abstractmethod
 import numpy as np
-import random
 
 import pymunk
 from PIL import ImageFont, ImageDraw
@@ -43,6 +42,9 @@ class Actuator(ABC):
         self.has_key_mapping: bool = False
         self.key_map: Dict = {}
 
+        # Replaced by the random generator of the Playground when the agent is added
+        self.rng: np.random.Generator = np.random.default_rng()
+
         # Motor noise
         self._noise = noise
         if self._noise:
@@ -69,15 +71,28 @@ class Actuator(ABC):
 
     def apply_action(self,
                      value,
+                     checked: bool = False,
                      ):
+        """
+        Applies a command to the actuator.
+        The actuator acts on its value, which is the command after noise.
+
+        Args:
+            value: command of the actuator.
+            checked: If True, the value was already validated and made noisy by an ActionLayout.
+                The command before noise is then set by the caller.
+
+        """
 
         self.command = value
 
-        if not self._check_action_value(value):
-            raise ValueError("Value for command {} not compatible".format(value))
+        if not checked:
 
-        if self._noise:
-            value = self._apply_noise(value)
+            if not self._check_action_value(value):
+                raise ValueError("Value for command {} not compatible".format(value))
+
+            if self._noise:
+                value = self._apply_noise(value)
 
         self.value = value
 
@@ -104,6 +119,11 @@ class Actuator(ABC):
              fnt: ImageFont):
         ...
 
+    @property
+    def noise(self) -> Optional[str]:
+        """ Type of noise of the actuator, None if the actuator is not noisy."""
+        return self._noise
+
     @property
     @abstractmethod
     def default_value(self) -> float:
@@ -235,7 +255,7 @@ class InteractionActuator(DiscreteActuator, ABC):
                      ) -> int:
 
         if self._noise == 'random_flip':
-            flip = random.choices([True, False], weights=[self._proba_flip, 1 - self._proba_flip])
+            flip = self.rng.random() < self._proba_flip
 
             if flip:
                 action_index = 1-action_index
@@ -245,6 +265,14 @@ class InteractionActuator(DiscreteActuator, ABC):
         else:
             raise ValueError('Noise type not implemented')
 
+    @property
+    def flip_probability(self) -> float:
+        """ Probability of flipping the action, 0 without random_flip noise."""
+
+        if self._noise == 'random_flip':
+            return self._proba_flip
+        return 0
+
 
 class Activate(InteractionActuator):
 
@@ -252,10 +280,10 @@ class Activate(InteractionActuator):
         super().__init__(part)
         self.is_activating = 0
 
-    def apply_action(self, action_index: int):
+    def apply_action(self, action_index: int, checked: bool = False):
 
-        super().apply_action(action_index)
-        self.is_activating = self.actuator_values[action_index]
+        super().apply_action(action_index, checked)
+        self.is_activating = self.actuator_values[int(self.value)]
 
 
 class Grasp(InteractionActuator):
@@ -266,10 +294,10 @@ class Grasp(InteractionActuator):
         self.is_holding = False
         self.grasped = []
 
-    def apply_action(self, action_index: int):
+    def apply_action(self, action_index: int, checked: bool = False):
 
-        super().apply_action(action_index)
-        self.is_grasping = self.actuator_values[action_index]
+        super().apply_action(action_index, checked)
+        self.is_grasping = self.actuator_values[int(self.value)]
 
         if self.is_holding and not self.is_grasping:
             self.is_holding = False
@@ -372,7 +400,7 @@ class ContinuousActuator(Actuator, ABC):
 
         if self._noise == 'gaussian':
 
-            value += random.gauss(self._mean, self._scale)
+            value += self.rng.normal(self._mean, self._scale)
 
             value = value if value > self.min else self.min
             value = value if value < self.max else self.max
@@ -394,6 +422,22 @@ class ContinuousActuator(Actuator, ABC):
         else:
             raise ValueError('Noise type not implemented')
 
+    @property
+    def noise_mean(self) -> float:
+        """ Mean of the gaussian noise, 0 without gaussian noise."""
+
+        if self._noise == 'gaussian':
+            return self._mean
+        return 0
+
+    @property
+    def noise_scale(self) -> float:
+        """ Scale of the gaussian noise, 0 without gaussian noise."""
+
+        if self._noise == 'gaussian':
+            return self._scale
+        return 0
+
 
 class ForceActuator(ContinuousActuator):
 
@@ -412,32 +456,32 @@ class ForceActuator(ContinuousActuator):
 
 class LongitudinalForce(ForceActuator):
 
-    def apply_action(self, value: float):
+    def apply_action(self, value: float, checked: bool = False):
 
-        super().apply_action(value)
+        super().apply_action(value, checked)
 
         self.part.pm_body.apply_force_at_local_point(
-            pymunk.Vec2d(value, 0) * LINEAR_FORCE * self._action_range,
+            pymunk.Vec2d(self.value, 0) * LINEAR_FORCE * self._action_range,
             (0, 0))
 
 
 class LateralForce(ForceActuator):
 
-    def apply_action(self, value: float):
+    def apply_action(self, value: float, checked: bool = False):
 
-        super().apply_action(value)
+        super().apply_action(value, checked)
 
         self.part.pm_body.apply_force_at_local_point(
-            pymunk.Vec2d(0, value) * self._action_range * LINEAR_FORCE,
+            pymunk.Vec2d(0, self.value) * self._action_range * LINEAR_FORCE,
             (0, 0))
 
 
 class AngularVelocity(ForceActuator):
-    def apply_action(self, value: float):
+    def apply_action(self, value: float, checked: bool = False):
 
-        super().apply_action(value)
+        super().apply_action(value, checked)
 
-        self.part.pm_body.angular_velocity = value * ANGULAR_VELOCITY * self._action_range
+        self.part.pm_body.angular_velocity = self.value * ANGULAR_VELOCITY * self._action_range
 
 
 class MotorActuator(ContinuousActuator):
@@ -458,11 +502,12 @@ class MotorActuator(ContinuousActuator):
 
 class AngularRelativeVelocity(MotorActuator):
 
-    def apply_action(self, value: float):
+    def apply_action(self, value: float, checked: bool = False):
 
         self.part: AnchoredPart
 
-        super().apply_action(value)
+        super().apply_action(value, checked)
+        value = self.value
 
         theta_part = self.part.angle
         theta_anchor = self.part.anchor.angle
@@ -483,3 +528,98 @@ class AngularRelativeVelocity(MotorActuator):
 
         else:
             self.part.motor.rate = value * ANGULAR_VELOCITY * self._action_range
+
+
+class ActionLayout:
+    """
+    Fixed order of the actuators of an agent, used to exchange actions as arrays.
+
+    Index i of an action array holds the command of actuators[i].
+    As with apply_action, discrete actuators take the index of their value.
+
+    Attributes:
+        actuators: Actuators, in the order of the action arrays.
+        low: Lowest valid command of each actuator.
+        high: Highest valid command of each actuator.
+        discrete: True for discrete actuators.
+    """
+
+    def __init__(self, actuators: List[Actuator]):
+
+        self.actuators = list(actuators)
+
+        self.discrete = np.array([isinstance(actuator, DiscreteActuator)
+                                  for actuator in self.actuators], dtype=bool)
+
+        self.low = np.array([0 if isinstance(actuator, DiscreteActuator) else actuator.min
+                             for actuator in self.actuators], dtype=float)
+        self.high = np.array([actuator.range - 1 if isinstance(actuator, DiscreteActuator) else actuator.max
+                              for actuator in self.actuators], dtype=float)
+
+        # Noise parameters of the actuators, applied to all actuators at once
+        self._gaussian = np.array([isinstance(actuator, ContinuousActuator) and actuator.noise == 'gaussian'
+                                   for actuator in self.actuators], dtype=bool)
+        self._mean = np.array([actuator.noise_mean if isinstance(actuator, ContinuousActuator) else 0.
+                               for actuator in self.actuators])
+        self._scale = np.array([actuator.noise_scale if isinstance(actuator, ContinuousActuator) else 0.
+                                for actuator in self.actuators])
+
+        self._flip = np.array([isinstance(actuator, InteractionActuator) and actuator.noise == 'random_flip'
+                               for actuator in self.actuators], dtype=bool)
+        self._proba_flip = np.array([actuator.flip_probability if isinstance(actuator, InteractionActuator) else 0.
+                                     for actuator in self.actuators])
+
+    def __len__(self):
+        return len(self.actuators)
+
+    def clip(self, actions: np.ndarray) -> np.ndarray:
+        """
+        Clips commands to the valid range of each actuator.
+        Commands of discrete actuators are rounded to the closest index.
+
+        Args:
+            actions: Array of shape (len(layout),).
+
+        Returns: New array of valid commands.
+
+        """
+
+        actions = np.clip(actions, self.low, self.high)
+        actions[self.discrete] = np.rint(actions[self.discrete])
+
+        return actions
+
+    def apply_noise(self,
+                    actions: np.ndarray,
+                    rng: np.random.Generator,
+                    ) -> np.ndarray:
+        """
+        Applies the noise of all actuators at once.
+
+        Args:
+            actions: Array of valid commands.
+            rng: Random generator used to draw the noise.
+
+        Returns: Values of the actuators after noise.
+
+        """
+
+        values = actions
+
+        if self._gaussian.any():
+            noise = rng.normal(self._mean, self._scale)
+            values = np.where(self._gaussian, np.clip(values + noise, self.low, self.high), values)
+
+        if self._flip.any():
+            flips = self._flip & (rng.random(len(self)) < self._proba_flip)
+            values = np.where(flips, 1 - values, values)
+
+        return values
+
+    def to_dict(self, actions: np.ndarray) -> Dict[Actuator, float]:
+        """ Converts an action array into a dictionary of actions."""
+
+        return {
+            actuator: int(value) if discrete else value
+            for actuator, discrete, value in zip(self.actuators, self.discrete.tolist(), actions.tolist())
+        }
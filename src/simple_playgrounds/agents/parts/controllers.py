@@ -1,15 +1,20 @@
 """ Module implementing Controllers.
 Controllers are used to generate commands to control the actuators of an agent.
 """
-from typing import List, Dict
+from __future__ import annotations
+from typing import List, Dict, Optional, Union, TYPE_CHECKING
 
 from abc import ABC, abstractmethod
-import random
 
+import numpy as np
 import pygame
 from ...common.definitions import KeyTypes
 from .actuators import Actuator, DiscreteActuator, ContinuousActuator
 
+if TYPE_CHECKING:
+    from ..agent import Agent
+    from ...playgrounds.playground import Playground
+
 
 class Controller(ABC):
     """ Base Class for Controllers.
@@ -19,6 +24,21 @@ class Controller(ABC):
         self.require_key_mapping: bool = False
         self._controlled_actuators: List[Actuator] = []
 
+        # Controllers are independent of the random generator of the Playground,
+        # so that replaying recorded actions doesn't change the events of the Playground.
+        # Reseeded from the seed of the Playground when the agent is added
+        self.rng: np.random.Generator = np.random.default_rng()
+
+    def seed(self, seed: Optional[Union[int, np.random.SeedSequence]] = None):
+        """
+        Reseeds the random generator of the controller.
+
+        Args:
+            seed: Seed of the random generator.
+
+        """
+        self.rng = np.random.default_rng(seed)
+
     @abstractmethod
     def generate_actions(self) -> Dict[Actuator, float]:
         """ Generate actions for each actuator of an agent,
@@ -78,14 +98,14 @@ class RandomDiscrete(Controller):
         for actuator in self.controlled_actuators:
 
             if isinstance(actuator, DiscreteActuator):
-                act_value = random.choice([0, 1])
+                act_value = int(self.rng.integers(2))
 
             elif isinstance(actuator, ContinuousActuator):
 
                 if actuator.centered:
-                    act_value = random.choice([-1, 0, 1])
+                    act_value = int(self.rng.integers(-1, 2))
                 else:
-                    act_value = random.choice([0, 1])
+                    act_value = int(self.rng.integers(2))
 
             else:
                 raise ValueError("Actuator type not recognized")
@@ -110,14 +130,14 @@ class RandomContinuous(Controller):
             act_value = actuator.default_value
 
             if isinstance(actuator, DiscreteActuator):
-                act_value = random.choice([0, 1])
+                act_value = int(self.rng.integers(2))
 
             elif isinstance(actuator, ContinuousActuator):
 
                 if actuator.centered:
-                    act_value = random.uniform(-1, 1)
+                    act_value = self.rng.uniform(-1, 1)
                 else:
-                    act_value = random.uniform(0, 1)
+                    act_value = self.rng.uniform(0, 1)
 
             else:
                 raise ValueError("Actuator type not recognized")
@@ -127,6 +147,74 @@ class RandomContinuous(Controller):
         return commands
 
 
+class RandomPopulation:
+    """
+    A random controller for a population of agents.
+    It draws the commands of all agents at once, as an action array for Engine.step_array.
+    Commands follow the action layout of each agent:
+    continuous actuators are drawn uniformly in their range,
+    discrete actuators pick a random index.
+
+    Attributes:
+        rng: random generator of the population.
+
+    Note:
+        Agents must be given in the order of the agents of the Engine.
+        Columns beyond the number of actuators of an agent are set to 0.
+    """
+
+    def __init__(self,
+                 agents: List[Agent],
+                 seed: Optional[int] = None,
+                 discrete: bool = False,
+                 playground: Optional[Playground] = None,
+                 ):
+        """
+        Args:
+            agents: agents controlled by the population.
+            seed: seed of the random generator.
+                If None and a playground is given, the generator is spawned from the seed of the playground,
+                and reseeded with the playground.
+            discrete: If True, continuous actuators pick their commands in {-1, 0, 1}, or {0, 1} if not centered,
+                like RandomDiscrete.
+            playground: Playground of the agents.
+        """
+
+        layouts = [agent.action_layout for agent in agents]
+        n_actions = max((len(layout) for layout in layouts), default=0)
+
+        self._low = np.zeros((len(agents), n_actions))
+        self._high = np.zeros((len(agents), n_actions))
+        self._integer = np.zeros((len(agents), n_actions), dtype=bool)
+
+        for index, layout in enumerate(layouts):
+            self._low[index, :len(layout)] = layout.low
+            self._high[index, :len(layout)] = layout.high
+            self._integer[index, :len(layout)] = layout.discrete | discrete
+
+        # Integer commands are drawn in [low, high + 1), then floored
+        self._high[self._integer] += 1
+
+        self.rng = np.random.default_rng(seed)
+
+        if seed is None and playground is not None:
+            playground.add_population(self)
+
+    def seed(self, seed: Optional[Union[int, np.random.SeedSequence]] = None):
+        """ Reseeds the random generator of the population."""
+        self.rng = np.random.default_rng(seed)
+
+    def generate_actions(self) -> np.ndarray:
+        """
+        Returns: array of shape (n_agents, n_actions) of random commands.
+        """
+
+        actions = self.rng.uniform(self._low, self._high)
+        np.floor(actions, out=actions, where=self._integer)
+
+        return actions
+
+
 class Keyboard(Controller):
     """
     Keyboard controller require that a keymapping is defined in the agent.
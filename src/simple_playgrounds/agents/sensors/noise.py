@@ -0,0 +1,78 @@
+""" Noise applied to the values of Sensors.
+
+Noise is drawn from the random generator of each Sensor,
+and applied in place on the sensor values, so that noisy sensors
+cost about the same as noiseless ones and runs are reproducible for a given seed.
+
+Sensor values are expected to be float arrays with values between 0 and max_value.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+def add_gaussian_noise(values: np.ndarray,
+                       mean: float,
+                       scale: float,
+                       max_value: float,
+                       rng: np.random.Generator,
+                       buffer: Optional[np.ndarray] = None,
+                       ) -> np.ndarray:
+    """
+    Adds gaussian noise to values, in place, then clips them between 0 and max_value.
+
+    Args:
+        values: Sensor values.
+        mean: Mean of the noise.
+        scale: Standard deviation of the noise.
+        max_value: Maximum sensor value.
+        rng: Random generator of the Sensor.
+        buffer: Array where the noise is drawn. Reallocated if it doesn't match values.
+
+    Returns: The buffer, to be passed again at the next call.
+
+    """
+
+    if buffer is None or buffer.shape != values.shape:
+        buffer = np.empty(values.shape)
+
+    rng.standard_normal(out=buffer)
+
+    buffer *= scale
+    buffer += mean
+
+    values += buffer
+    np.clip(values, 0, max_value, out=values)
+
+    return buffer
+
+
+def apply_salt_pepper_noise(values: np.ndarray,
+                            probability: float,
+                            max_value: float,
+                            rng: np.random.Generator,
+                            ):
+    """
+    Turns values off (0) or to max_value, in place, each with probability / 2.
+
+    Instead of drawing a choice for every value, the number of noisy values is drawn,
+    then their indices.
+
+    Args:
+        values: Sensor values.
+        probability: Probability for a value to be turned off or to max_value.
+        max_value: Maximum sensor value.
+        rng: Random generator of the Sensor.
+
+    """
+
+    n_noisy = rng.binomial(values.size, probability)
+
+    if n_noisy == 0:
+        return
+
+    indices = rng.choice(values.size, size=n_noisy, replace=False)
+    salt = rng.random(n_noisy) < 0.5
+
+    values.flat[indices[salt]] = max_value
+    values.flat[indices[~salt]] = 0
@@ -3,17 +3,21 @@ This Module provides semantic sensors.
 These artificial sensors return semantic information about the detected entities.
 They return the actual instance of the entity detected, which allow to access their attributes.
 E.g. position, velocity, mass, shape can be accessed.
+
+With array_output, they instead return a fixed-size structured array of DETECTION_DTYPE,
+with one row per ray or cone. Entities are referred to by their id in the ElementRegistry
+of the Playground (see ElementRegistry.entity_from_id).
 """
-from typing import List, Optional, Dict, Union
+from typing import List, Optional, Dict, Union, Iterator
 
 import math
-from operator import attrgetter
 
 import numpy as np
 from skimage.draw import line, disk
 
 from .sensor import RayCollisionSensor
-from ...common.definitions import SensorTypes, Detection
+from ...playgrounds.registry import ElementRegistry
+from ...common.definitions import SensorTypes, Detection, DETECTION_DTYPE
 from ...configs import parse_configuration
 from ...common.entity import Entity
 from ..parts.parts import Part
@@ -25,6 +29,14 @@ class SemanticRay(RayCollisionSensor):
     This sensor returns the actual :Entity: object.
     All the attributes (position, physical properties, ...) of the returned
     entity can be accessed.
+
+    Note:
+        With array_output, sensor values are a structured array of DETECTION_DTYPE,
+        with one row per ray. Rays without detection, including the rays whose detection
+        was discarded by remove_duplicates, have valid set to False.
+        The array is reused and overwritten at each update: copy it before storing it,
+        e.g. in a replay buffer.
+        Noise is not implemented for semantic sensors, whatever the output mode.
     """
 
     def __init__(self,
@@ -33,7 +45,20 @@ class SemanticRay(RayCollisionSensor):
                  normalize: bool = True,
                  noise_params: Optional[Dict] = None,
                  remove_duplicates: bool = True,
+                 array_output: bool = False,
                  **kwargs):
+        """
+        Args:
+            anchor: Entity on which the sensor is attached.
+            invisible_elements: Elements which are invisible to the Sensor.
+            normalize: If True, distances are scaled between 0 and 1.
+            noise_params: Not implemented for semantic sensors, noise raises a ValueError.
+            remove_duplicates: If True, keeps the closest detection of each entity.
+                With array_output, the other rays detecting the entity are marked as not valid.
+            array_output: If True, sensor values are a structured array instead of a list of Detections.
+                The array is reused at each update.
+            **kwargs: Additional sensor params.
+        """
 
         default_config = parse_configuration('agent_sensors', SensorTypes.SEMANTIC_RAY)
         kwargs = {**default_config, **kwargs}
@@ -47,6 +72,22 @@ class SemanticRay(RayCollisionSensor):
 
         self._sensor_max_value = self._max_range
 
+        self._array_output = array_output
+
+        # Registry of the Playground, to look up the entities of the array output
+        self._registry: Optional[ElementRegistry] = None
+
+        self._ray_detections = np.zeros(len(self._ray_angles), dtype=DETECTION_DTYPE)
+        self._ray_detections['angle'] = self._ray_angles
+        self._ray_rows = {angle: row for row, angle in enumerate(self._ray_angles)}
+
+        # Array returned as sensor values in array mode
+        self._detection_array = self._ray_detections
+
+    @property
+    def array_output(self) -> bool:
+        return self._array_output
+
     def _compute_raw_sensor(self, playground, *_):
 
         collision_points = self._compute_points(playground)
@@ -56,8 +97,13 @@ class SemanticRay(RayCollisionSensor):
             for k, v in collision_points.items() if v != []
         }
 
-        self.sensor_values = self._collisions_to_detections(
-            playground, collision_points)
+        if self._array_output:
+            self._registry = playground.elements
+            self.sensor_values = self._collisions_to_array(playground, collision_points)
+
+        else:
+            self.sensor_values = self._collisions_to_detections(
+                playground, collision_points)
         # class Point just for modifying alpha and replace by distance
 
     def _collisions_to_detections(self, playground, collision_points):
@@ -91,8 +137,96 @@ class SemanticRay(RayCollisionSensor):
 
         return detections
 
+    def _collisions_to_array(self, playground, collision_points) -> np.ndarray:
+        """
+        Writes pymunk collisions in the rows of their rays.
+
+        Args:
+            playground (:obj: :Playground:): playground where the sensor is.
+            collision_points: dictionary of collision points
+
+        Returns:
+            Structured array of DETECTION_DTYPE, with one row per ray.
+
+        """
+
+        registry = playground.elements
+
+        rows = []
+        entity_ids = []
+        type_ids = []
+        distances = []
+
+        for sensor_angle, collision in collision_points.items():
+
+            if collision:
+
+                element_colliding = playground.get_entity_from_shape(
+                    pm_shape=collision.shape)
+
+                rows.append(self._ray_rows[sensor_angle])
+                entity_ids.append(registry.entity_id(element_colliding))
+                type_ids.append(registry.type_id(element_colliding))
+                distances.append(collision.alpha * self._max_range)
+
+        detections = self._ray_detections
+
+        detections['entity_id'] = -1
+        detections['type_id'] = -1
+        detections['distance'] = 0
+        detections['valid'] = False
+
+        detections['entity_id'][rows] = entity_ids
+        detections['type_id'][rows] = type_ids
+        detections['distance'][rows] = distances
+        detections['valid'][rows] = True
+
+        return detections
+
+    def _detections(self) -> Iterator[Detection]:
+        """ Iterates over the detections of the sensor values, in both output modes."""
+
+        if self.sensor_values is None:
+            return
+
+        if not self._array_output:
+            yield from self.sensor_values
+            return
+
+        assert self._registry is not None
+
+        detections = self.sensor_values[self.sensor_values['valid']]
+
+        for entity_id, distance, angle in zip(detections['entity_id'].tolist(),
+                                              detections['distance'].tolist(),
+                                              detections['angle'].tolist()):
+
+            yield Detection(entity=self._registry.entity_from_id(entity_id),
+                            distance=distance,
+                            angle=angle)
+
+    @property
+    def shape(self):
+
+        if self._array_output:
+            return self._detection_array.shape
+
+        return None
+
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+
+        if self._array_output:
+            return DETECTION_DTYPE
+
+        return None
+
     def _apply_normalization(self):
 
+        if self._array_output:
+            self.sensor_values['distance'] /= self._sensor_max_value
+            return
+
         for index, detection in enumerate(self.sensor_values):
 
             new_detection = Detection(entity=detection.entity,
@@ -109,7 +243,7 @@ class SemanticRay(RayCollisionSensor):
 
         img = np.zeros((width, width, 3))
 
-        for detection in self.sensor_values:
+        for detection in self._detections():
 
             distance = detection.distance
             if self._normalize:
@@ -184,40 +318,110 @@ class SemanticCones(SemanticRay):
                 for n in range(self.number_cones)
             ]
 
+        # Detections are assigned to the closest cone center, i.e. binned between the midpoints of centers
+        cone_centers = np.array(self.angles_cone_center, dtype=float)
+        self._cone_bounds = (cone_centers[1:] + cone_centers[:-1]) / 2
+
+        # Closest detection of each cone, -1 when the cone is empty
+        self._closest_per_cone = np.zeros(self.number_cones,
+                                          dtype=[('detection', np.int64), ('distance', np.float64)])
+
+        self._detection_array = np.zeros(self.number_cones, dtype=DETECTION_DTYPE)
+        self._detection_array['angle'] = self.angles_cone_center
+
     def _compute_raw_sensor(self, playground, *_):
 
         super()._compute_raw_sensor(playground)
 
-        detections_per_cone = {}
-        for cone_angle in self.angles_cone_center:
-            detections_per_cone[cone_angle] = []
+        if self._array_output:
+            self._ray_detections_to_cones()
+            return
+
+        detections = self.sensor_values
+        self.sensor_values = []
 
-        for detection in self.sensor_values:
-            # pylint: disable=all
-            cone_angle = min(self.angles_cone_center,
-                             key=lambda x: (x - detection.angle)**2)
-            detections_per_cone[cone_angle].append(detection)
+        angles = np.fromiter((detection.angle for detection in detections),
+                             dtype=float, count=len(detections))
+        distances = np.fromiter((detection.distance for detection in detections),
+                                dtype=float, count=len(detections))
 
-        # detections_per_cone = {k: v for k, v in detections_per_cone.items() if v != []}
+        closest = self._bin_cones(angles, distances)
 
-        self.sensor_values = []
+        for cone_angle, index, distance in zip(self.angles_cone_center,
+                                               closest['detection'].tolist(),
+                                               closest['distance'].tolist()):
+
+            if index >= 0:
+                self.sensor_values.append(Detection(entity=detections[index].entity,
+                                                    distance=distance,
+                                                    angle=cone_angle))
+
+    def _ray_detections_to_cones(self):
+
+        rays = self._ray_detections[self._ray_detections['valid']]
+
+        closest = self._bin_cones(rays['angle'], rays['distance'])
+        occupied = closest['detection'] >= 0
+        closest_rays = rays[closest['detection'][occupied]]
+
+        cones = self._detection_array
+
+        cones['entity_id'] = -1
+        cones['type_id'] = -1
+        cones['distance'] = 0
+        cones['valid'] = occupied
+
+        cones['entity_id'][occupied] = closest_rays['entity_id']
+        cones['type_id'][occupied] = closest_rays['type_id']
+        cones['distance'][occupied] = closest_rays['distance']
+
+        self.sensor_values = cones
+
+    def _bin_cones(self, angles: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        """
+        Finds the closest detection of each cone.
+
+        Args:
+            angles: Angles of the detections.
+            distances: Distances of the detections.
+
+        Returns:
+            Structured array with one row per cone, holding the index and distance of its
+            closest detection. Index is -1 for empty cones.
+
+        """
+
+        closest = self._closest_per_cone
+        closest['detection'] = -1
+        closest['distance'] = np.inf
+
+        if not len(angles):
+            return closest
+
+        # Group detections by cone, keeping their order within a cone
+        cones = np.searchsorted(self._cone_bounds, angles)
+        order = np.argsort(cones, kind='stable')
+        cones = cones[order]
+        distances = distances[order]
 
-        for cone_angle, detections in detections_per_cone.items():
+        starts = np.flatnonzero(np.diff(cones, prepend=-1))
+        min_distances = np.minimum.reduceat(distances, starts)
 
-            if detections:
-                detection = min(detections, key=attrgetter('distance'))
+        # First detection at the minimal distance of its cone
+        is_closest = distances == np.repeat(min_distances, np.diff(starts, append=len(cones)))
+        first_closest = np.minimum.reduceat(np.where(is_closest, np.arange(len(cones)), len(cones)), starts)
 
-                new_detection = Detection(entity=detection.entity,
-                                          distance=detection.distance,
-                                          angle=cone_angle)
+        occupied_cones = cones[starts]
+        closest['detection'][occupied_cones] = order[first_closest]
+        closest['distance'][occupied_cones] = min_distances
 
-                self.sensor_values.append(new_detection)
+        return closest
 
     def draw(self, width, *_):
 
         img = np.zeros((width, width, 3))
 
-        for detection in self.sensor_values:
+        for detection in self._detections():
 
             distance = detection.distance
             if self._normalize:
@@ -8,7 +8,7 @@ families of sensors and allow very fast computation.
 Apart if specified, all sensors are attached to an anchor.
 They compute sensor-values from the point of view of this anchor.
 """
-from typing import List, Dict, Optional, Union
+from typing import Any, List, Dict, Optional, Union, Callable
 
 from abc import abstractmethod, ABC
 import math
@@ -18,6 +18,7 @@ from pygame import Surface
 
 import pymunk
 import numpy as np
+from .noise import add_gaussian_noise, apply_salt_pepper_noise
 from ..parts.parts import Part
 from ...common.entity import Entity
 from ...playgrounds.playground import Playground
@@ -31,6 +32,9 @@ class Sensor(ABC):
             Sensor is attached to the center of the Anchor.
         sensor_values: current values of the sensor.
         name: Name of the sensor.
+        last_update: elapsed time of the engine when the sensor values were last computed.
+            None if they were never computed.
+        rng: random generator used to draw the noise of the sensor.
 
     Class Attributes:
         sensor_type: string that represents the type of sensor (e.g. 'rgb' or 'lidar').
@@ -52,6 +56,8 @@ class Sensor(ABC):
                  noise_params: Optional[Dict] = None,
                  invisible_elements: Optional[Union[List[Entity], Entity]] = None,
                  name: Optional[str] = None,
+                 update_period: int = 1,
+                 lazy: bool = False,
                  **_kwargs):
         """
         Sensors are attached to an anchor. They detect every visible Agent Part or Scene Element.
@@ -68,6 +74,9 @@ class Sensor(ABC):
             noise_params: Dictionary of noise parameters.
                 Noise is applied to the raw sensor, before normalization.
             name: name of the sensor. If not provided, a name will be chosen by default.
+            update_period: number of steps between two computations of the sensor values.
+                In between, the sensor keeps its previous values.
+            lazy: If True, sensor values are only computed when the observations of the agent are read.
 
         Noise Parameters:
             type: 'gaussian', 'salt_pepper'
@@ -98,7 +107,7 @@ class Sensor(ABC):
             Sensor._index_sensor += 1
 
         self.anchor = anchor
-        self.sensor_values = None
+        self.sensor_values: Optional[Any] = None
 
         if not invisible_elements:
             self.invisible_elements = []
@@ -127,6 +136,10 @@ class Sensor(ABC):
             else:
                 raise ValueError('Noise type not implemented')
 
+        # Replaced by a generator derived from the seed of the Playground when the agent is added
+        self.rng: np.random.Generator = np.random.default_rng()
+        self._noise_buffer: Optional[np.ndarray] = None
+
         self._max_range = max_range
         self._fov = fov * math.pi / 180
         self._resolution = resolution
@@ -148,15 +161,85 @@ class Sensor(ABC):
         self.requires_surface = False
         self.requires_scale = False
 
+        if update_period < 1:
+            raise ValueError('update period must be at least 1')
+
+        self._update_period = update_period
+        self._lazy = lazy
+
+        self.last_update: Optional[int] = None
+
+        # Set by the Engine when a lazy sensor is due, called when its values are read
+        self._pending_update: Optional[Callable[[Sensor], None]] = None
+
     @abstractmethod
     def apply_shape_filter(self,
                            sensor_collision_index: int,
+                           assign_elements: bool = True,
                            ) -> bool:
         ...
 
+    @property
+    def lazy(self) -> bool:
+        return self._lazy
+
+    def is_due(self, elapsed_time: int) -> bool:
+        """
+        Tests whether the sensor values must be computed at this time.
+
+        Args:
+            elapsed_time: elapsed time of the engine.
+
+        Returns: True if the last computation is older than the update period.
+
+        """
+
+        if self.last_update is None or elapsed_time < self.last_update:
+            return True
+
+        return elapsed_time - self.last_update >= self._update_period
+
+    def request_update(self, update: Callable[['Sensor'], None]):
+        """
+        Defers the computation of a lazy sensor until its values are read.
+
+        Args:
+            update: function that computes the sensor values.
+
+        """
+        self._pending_update = update
+
+    def observe(self):
+        """
+        Returns the sensor values, after computing them if a lazy update is pending.
+        """
+
+        if self._pending_update is not None:
+            update = self._pending_update
+            self._pending_update = None
+            update(self)
+
+        return self.sensor_values
+
+    def seed(self, seed: Optional[Union[int, np.random.SeedSequence]] = None):
+        """
+        Reseeds the random generator used for noise.
+
+        Args:
+            seed: Seed of the random generator.
+
+        """
+        self.rng = np.random.default_rng(seed)
+
+    def reset(self):
+        """ Forgets the previous computations, so that the sensor is due at the next update."""
+
+        self.last_update = None
+        self._pending_update = None
+
     def update(self,
                playground: Playground,
-               sensor_surface: Surface):
+               sensor_surface: Optional[Surface]):
 
         self._compute_raw_sensor(playground, sensor_surface)
 
@@ -169,7 +252,7 @@ class Sensor(ABC):
     @abstractmethod
     def _compute_raw_sensor(self,
                             playground: Playground,
-                            sensor_surface: Surface,
+                            sensor_surface: Optional[Surface],
                             ):
         pass
 
@@ -177,15 +260,37 @@ class Sensor(ABC):
     def _apply_normalization(self):
         pass
 
-    @abstractmethod
     def _apply_noise(self):
-        pass
+
+        if self._noise_type == 'gaussian':
+            self._noise_buffer = add_gaussian_noise(self.sensor_values,
+                                                    self._noise_mean,
+                                                    self._noise_scale,
+                                                    self._sensor_max_value,
+                                                    self.rng,
+                                                    self._noise_buffer)
+
+        elif self._noise_type == 'salt_pepper':
+            apply_salt_pepper_noise(self.sensor_values,
+                                    self._noise_probability,
+                                    self._sensor_max_value,
+                                    self.rng)
+
+        else:
+            raise ValueError('Noise type not implemented')
 
     @property
     def shape(self):
         """ Returns the shape of the numpy array, if applicable."""
         return None
 
+    @property
+    def dtype(self) -> Optional[np.dtype]:
+        """ Returns the dtype of the numpy array, if applicable."""
+        if self.shape is None:
+            return None
+        return np.dtype(float)
+
     @abstractmethod
     def draw(self,
              width: int,
@@ -215,6 +320,11 @@ class RayCollisionSensor(Sensor, ABC):
     They detect intersection with obstacles.
     Robotic sensors and Semantic sensors inherit from this class.
 
+    Note:
+        Ray collisions are cached by the Playground during a step.
+        Sensors on the same anchor, with the same rays, ranges and invisible elements,
+        share the same collisions and only differ in how they process them.
+
     """
 
     def __init__(self,
@@ -241,16 +351,31 @@ class RayCollisionSensor(Sensor, ABC):
                 for n in range(self._resolution)
             ]
 
+        self._ray_geometry = (tuple(self._ray_angles), self._min_range, self._max_range)
+
         self._shape_filter_applied = False
 
     def apply_shape_filter(self,
                            sensor_collision_index,
+                           assign_elements: bool = True,
                            ):
+        """
+        Makes the invisible elements of the sensor invisible to its rays.
+
+        Args:
+            sensor_collision_index: index of the shape filter category of the sensor.
+            assign_elements: If False, the category is already assigned to the invisible elements,
+                by another sensor with the same invisible elements.
+
+        Returns: True if the filter was applied.
+
+        """
 
         if not self._shape_filter_applied:
 
-            for elem in self.invisible_elements:
-                elem.assign_shape_filter(sensor_collision_index)
+            if assign_elements:
+                for elem in self.invisible_elements:
+                    elem.assign_shape_filter(sensor_collision_index)
 
             self.invisible_filter = pymunk.ShapeFilter(
                 categories=2 ** sensor_collision_index)
@@ -312,39 +437,25 @@ class RayCollisionSensor(Sensor, ABC):
                         playground: Playground,
                         ) -> Dict[float, Optional[pymunk.SegmentQueryInfo]]:
 
-        points = {}
+        body = self.anchor.pm_body
+        key = (self.anchor, body.position, body.angle, self._ray_geometry,
+               self.invisible_filter)
 
-        for sensor_angle in self._ray_angles:
-            collision = self._compute_collision(playground, sensor_angle)
-            points[sensor_angle] = collision
+        cached_points = playground.ray_cache.get(key)
 
-        if self._remove_duplicates:
-            points = self._remove_duplicate_collisions(points)
-
-        return points
+        if cached_points is None:
 
-    def _apply_noise(self):
+            cached_points = {}
 
-        if self._noise_type == 'gaussian':
-            additive_noise = np.random.normal(self._noise_mean,
-                                              self._noise_scale,
-                                              size=self.shape)
+            for sensor_angle in self._ray_angles:
+                collision = self._compute_collision(playground, sensor_angle)
+                cached_points[sensor_angle] = collision
 
-        elif self._noise_type == 'salt_pepper':
-            prob = [
-                self._noise_probability / 2, 1 - self._noise_probability,
-                self._noise_probability / 2
-            ]
-            additive_noise = np.random.choice(
-                [-self._sensor_max_value, 0, self._sensor_max_value],
-                p=prob,
-                size=self.shape)
+            playground.ray_cache[key] = cached_points
 
-        else:
-            raise ValueError
+        points = dict(cached_points)
 
-        self.sensor_values += additive_noise
+        if self._remove_duplicates:
+            points = self._remove_duplicate_collisions(points)
 
-        self.sensor_values[self.sensor_values < 0] = 0
-        self.sensor_values[self.sensor_values >
-                           self._sensor_max_value] = self._sensor_max_value
+        return points
@@ -2,7 +2,7 @@
 Module that defines TopDown Sensors.
 Topdown sensors are based computed using the image provided by the environment.
 """
-from typing import Tuple, List, Union
+from typing import Tuple, List, Union, Optional
 
 import math
 import numpy as np
@@ -106,6 +106,7 @@ class TopdownSensor(Sensor):
 
     def apply_shape_filter(self,
                            sensor_collision_index,
+                           assign_elements: bool = True,
                            ) -> bool:
         return False
 
@@ -132,7 +133,9 @@ class TopdownSensor(Sensor):
 
         return img_cropped
 
-    def _compute_raw_sensor(self, playground:Playground, sensor_surface: pygame.Surface):
+    def _compute_raw_sensor(self, playground: Playground, sensor_surface: Optional[pygame.Surface]):
+
+        assert sensor_surface is not None
 
         cropped_img = self._get_sensor_image(playground, sensor_surface)
 
@@ -154,34 +157,6 @@ class TopdownSensor(Sensor):
     def _apply_normalization(self):
         self.sensor_values /= self._sensor_max_value
 
-    def _apply_noise(self):
-
-        if self._noise_type == 'gaussian':
-
-            additive_noise = np.random.normal(self._noise_mean,
-                                              self._noise_scale,
-                                              size=self.shape)
-
-        elif self._noise_type == 'salt_pepper':
-
-            proba = [
-                self._noise_probability / 2, 1 - self._noise_probability,
-                self._noise_probability / 2
-            ]
-            additive_noise = np.random.choice(
-                [-self._sensor_max_value, 0, self._sensor_max_value],
-                p=proba,
-                size=self.shape)
-
-        else:
-            raise ValueError
-
-        self.sensor_values += additive_noise
-
-        self.sensor_values[self.sensor_values < 0] = 0
-        self.sensor_values[self.sensor_values >
-                           self._sensor_max_value] = self._sensor_max_value
-
     @property
     def shape(self):
 
@@ -250,6 +225,7 @@ class FullPlaygroundSensor(Sensor):
 
     def apply_shape_filter(self,
                            sensor_collision_index,
+                           assign_elements: bool = True,
                            ) -> bool:
 
         return False
@@ -270,7 +246,9 @@ class FullPlaygroundSensor(Sensor):
         np_image = np_image[::-1, :, ::-1]
         return np_image
 
-    def _compute_raw_sensor(self, playground: Playground, sensor_surface: pygame.Surface):
+    def _compute_raw_sensor(self, playground: Playground, sensor_surface: Optional[pygame.Surface]):
+
+        assert sensor_surface is not None
 
         full_image = self._get_sensor_image(playground, sensor_surface)
 
@@ -288,33 +266,6 @@ class FullPlaygroundSensor(Sensor):
     def _apply_normalization(self):
         self.sensor_values /= self._sensor_max_value
 
-    def _apply_noise(self):
-
-        if self._noise_type == 'gaussian':
-
-            additive_noise = np.random.normal(self._noise_mean,
-                                              self._noise_scale,
-                                              size=self.shape)
-
-        elif self._noise_type == 'salt_pepper':
-
-            additive_noise = np.random.choice(
-                [-self._sensor_max_value, 0, self._sensor_max_value],
-                p=[
-                    self._noise_probability / 2, 1 - self._noise_probability,
-                    self._noise_probability / 2
-                ],
-                size=self.shape)
-
-        else:
-            raise ValueError
-
-        self.sensor_values += additive_noise
-
-        self.sensor_values[self.sensor_values < 0] = 0
-        self.sensor_values[self.sensor_values >
-                           self._sensor_max_value] = self._sensor_max_value
-
     @property
     def shape(self):
 
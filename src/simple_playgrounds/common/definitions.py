@@ -5,6 +5,8 @@
 from collections import namedtuple
 from enum import Enum, IntEnum, auto
 
+import numpy as np
+
 SIMULATION_STEPS = 10
 SPACE_DAMPING = 0.9
 LINEAR_FORCE = 100
@@ -126,4 +128,42 @@ class SensorTypes(IntEnum):
     FULL_PLAYGROUND = auto()
 
 
-Detection = namedtuple('Detection', 'entity, distance, angle')
\ No newline at end of file
+Detection = namedtuple('Detection', 'entity, distance, angle')
+
+# Array output of semantic sensors, one row per ray or cone.
+# entity_id and type_id index the lookup tables of the ElementRegistry of the Playground,
+# they are -1 when nothing is detected (valid is False).
+DETECTION_DTYPE = np.dtype([('entity_id', np.int64),
+                            ('type_id', np.int64),
+                            ('distance', np.float64),
+                            ('angle', np.float64),
+                            ('valid', np.bool_)])
+
+# Physics parameters of a Playground.
+# substeps: number of pymunk steps per engine step (minimum number in adaptive mode).
+# max_substeps: maximum number of pymunk steps per engine step in adaptive mode.
+# iterations: number of iterations of the pymunk solver.
+# collision_slop: overlap allowed between shapes.
+# adaptive: if True, the number of substeps depends on the speed of the fastest body.
+# sleep_time_threshold: number of engine steps a body must stay idle before it falls asleep.
+#   Sleeping is disabled if infinite.
+# idle_speed_threshold: speed under which a body is considered idle.
+PhysicsParameters = namedtuple(
+    'PhysicsParameters',
+    'substeps, max_substeps, iterations, collision_slop, adaptive, sleep_time_threshold, idle_speed_threshold',
+    defaults=(float('inf'), 0.1))
+
+PHYSICS_PRESETS = {
+    'fast': PhysicsParameters(substeps=4, max_substeps=4, iterations=5,
+                              collision_slop=0.5, adaptive=False,
+                              sleep_time_threshold=5, idle_speed_threshold=0.5),
+    'default': PhysicsParameters(substeps=SIMULATION_STEPS, max_substeps=SIMULATION_STEPS,
+                                 iterations=10, collision_slop=0.1, adaptive=False),
+    'accurate': PhysicsParameters(substeps=20, max_substeps=20, iterations=20,
+                                  collision_slop=0.05, adaptive=False),
+    'adaptive': PhysicsParameters(substeps=2, max_substeps=40, iterations=10,
+                                  collision_slop=0.1, adaptive=True),
+}
+
+# In adaptive mode, bodies move at most this fraction of the smallest shape size during a substep
+ADAPTIVE_MAX_DISPLACEMENT = 0.25
@@ -9,6 +9,7 @@ Examples can be found in :
     - simple_playgrounds/agents/parts
     - simple_playgrounds/playgrounds/scene_elements
 """
+import copy
 import numbers
 from enum import IntEnum, auto
 from typing import Union, Tuple, Dict, List, Optional
@@ -16,12 +17,13 @@ from typing import Union, Tuple, Dict, List, Optional
 import math
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pymunk
 import pygame
 from simple_playgrounds.common.definitions import FRICTION_ENTITY, ELASTICITY_ENTITY, CollisionTypes
 
 from .position_utils import CoordinateSampler, Trajectory, InitCoord, Coordinate
-from .texture import Texture, TextureGenerator, ColorTexture
+from .texture import Texture, TextureGenerator, ColorTexture, surface_to_state, surface_from_state
 
 
 # pylint: disable=line-too-long
@@ -150,6 +152,9 @@ class Entity(ABC):
         else:
             self._texture_surface = self.texture.surface
 
+        # Last mask computed, for the visible and invisible shapes
+        self._masks: Dict[bool, Tuple[Tuple, pygame.Surface]] = {}
+
         # Used to set an element which is not supposed to overlap
         self._allow_overlapping = False
         self._overlapping_strategy_set = False
@@ -167,10 +172,62 @@ class Entity(ABC):
 
         self.temporary = temporary
 
+        # Set by the Playground, to draw random events reproducibly
+        self.rng: Optional[np.random.Generator] = None
+
     def get_pixel(self, relative_pos):
 
         return self.texture.get_pixel(relative_pos)
 
+    # SERIALIZATION
+
+    def __getstate__(self):
+
+        state = self.__dict__.copy()
+
+        # Masks are recomputed when needed
+        state['_masks'] = {}
+
+        # Most entities display the surface of their texture
+        if self._texture_surface is self.texture.surface:
+            state['_texture_surface'] = None
+        else:
+            state['_texture_surface'] = surface_to_state(self._texture_surface)
+
+        return state
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+
+        if state['_texture_surface'] is None:
+            self._texture_surface = self.texture.surface
+        else:
+            self._texture_surface = surface_from_state(state['_texture_surface'])
+
+    def __deepcopy__(self, memo):
+        """
+        Copies the entity and its pymunk body and shapes.
+        The texture, texture surface and masks are shared with the copy.
+        They are replaced, never modified, when the appearance of an entity changes.
+        """
+
+        entity = self.__class__.__new__(self.__class__)
+        memo[id(self)] = entity
+
+        for attr, value in self.__dict__.items():
+
+            if attr in ('texture', '_texture_surface'):
+                setattr(entity, attr, value)
+
+            elif attr == '_masks':
+                setattr(entity, attr, dict(value))
+
+            else:
+                setattr(entity, attr, copy.deepcopy(value, memo))
+
+        return entity
+
     @property
     def base_color(self):
         return self.texture.base_color
@@ -218,6 +275,14 @@ class Entity(ABC):
         if not movable:
             return pymunk.Body(body_type=pymunk.Body.STATIC)
 
+        moment = self._compute_moment()
+
+        assert isinstance(self.mass, (float, int))
+
+        return pymunk.Body(self.mass, moment)
+
+    def _compute_moment(self):
+
         assert isinstance(self.mass, (float, int))
 
         if self.physical_shape == PhysicalShapes.CIRCLE:
@@ -239,7 +304,7 @@ class Entity(ABC):
         else:
             raise ValueError
 
-        return pymunk.Body(self.mass, moment)
+        return moment
 
     def _compute_vertices(self, offset_angle=0., invisible=False):
 
@@ -317,8 +382,84 @@ class Entity(ABC):
 
         return pm_shape
 
+    def resize(self, ratio: float, mass: Optional[float] = None):
+        """
+        Scales the entity in place.
+        The shapes are modified on the existing body, and the masks are recomputed.
+
+        Args:
+            ratio: ratio applied to the dimensions of the entity.
+            mass: new mass of the entity. If None, the mass is unchanged.
+
+        Note:
+            The spatial index of the shapes is not updated by this method.
+            If the entity is in a space, its shapes must be reindexed.
+        """
+
+        self._radius_visible *= ratio
+        self._radius_invisible = self._radius_visible + self._invisible_range
+
+        if self.physical_shape == PhysicalShapes.RECTANGLE:
+            width, length = self._size_visible
+            self._size_visible = width * ratio, length * ratio
+            self._size_invisible = (self._size_visible[0] + self._invisible_range,
+                                    self._size_visible[1] + self._invisible_range)
+
+        else:
+            self._size_visible = (2 * self._radius_visible,
+                                  2 * self._radius_visible)
+            self._size_invisible = (2 * self._radius_invisible,
+                                    2 * self._radius_invisible)
+
+        if self.pm_visible_shape:
+            self._resize_pm_shape(self.pm_visible_shape)
+
+        for pm_shape in (self.pm_invisible_shape, self.pm_grasp_shape):
+            if pm_shape:
+                self._resize_pm_shape(pm_shape, invisible=True)
+
+        if mass is not None:
+            self.mass = mass
+
+            if self.pm_body.body_type == pymunk.Body.DYNAMIC:
+                self.pm_body.mass = mass
+                self.pm_body.moment = self._compute_moment()
+
+        self._masks = {}
+
+    def _resize_pm_shape(self, pm_shape, invisible=False):
+
+        if self.physical_shape == PhysicalShapes.CIRCLE:
+
+            if invisible:
+                pm_shape.unsafe_set_radius(self._radius_invisible)
+            else:
+                pm_shape.unsafe_set_radius(self._radius_visible)
+
+        else:
+            pm_shape.unsafe_set_vertices(
+                self._compute_vertices(invisible=invisible))
+
     # VISUAL APPEARANCE
 
+    def _get_mask(self, invisible=False, force_recompute_mask=False):
+        """
+        Returns the mask of the entity.
+        The last mask is reused as long as the angle and texture of the entity are unchanged.
+        """
+
+        key = self.angle, self._texture_surface
+
+        if not force_recompute_mask and invisible in self._masks:
+            mask_key, mask = self._masks[invisible]
+            if mask_key[0] == key[0] and mask_key[1] is key[1]:
+                return mask
+
+        mask = self._create_mask(invisible=invisible)
+        self._masks[invisible] = key, mask
+
+        return mask
+
     def _create_mask(self, invisible=False):
 
         # pylint: disable-all
@@ -392,7 +533,7 @@ class Entity(ABC):
             return self._initial_coordinates
 
         elif isinstance(self._initial_coordinates, CoordinateSampler):
-            return self._initial_coordinates.sample()
+            return self._initial_coordinates.sample(rng=self.rng)
 
         raise ValueError
 
@@ -403,6 +544,11 @@ class Entity(ABC):
             self.trajectory = init_coordinates
             self._initial_coordinates = next(self.trajectory)
 
+            # Entities following a trajectory are moved by setting their velocity
+            if self.pm_body.body_type == pymunk.Body.STATIC:
+                self.pm_body.body_type = pymunk.Body.KINEMATIC
+            self.background = False
+
         else:
             if not isinstance(init_coordinates, CoordinateSampler):
                 assert len(init_coordinates) == 2 and len(init_coordinates[0]) == 2
@@ -459,9 +605,6 @@ class Entity(ABC):
         Performs calculation before the physical environment steps.
         """
 
-        if self.trajectory:
-            self.position, self.angle = next(self.trajectory)
-
         if not self.background:
             self.drawn = False
 
@@ -491,13 +634,14 @@ class Entity(ABC):
         """
 
         if draw_invisible and (self.pm_invisible_shape or self.pm_grasp_shape):
-            invisible_mask = self._create_mask(invisible=True)
+            invisible_mask = self._get_mask(invisible=True,
+                                            force_recompute_mask=force_recompute_mask)
             mask_rect = invisible_mask.get_rect()
             mask_rect.center = self.position
             surface.blit(invisible_mask, mask_rect, None)
 
         if self.pm_visible_shape:
-            visible_mask = self._create_mask()
+            visible_mask = self._get_mask(force_recompute_mask=force_recompute_mask)
             mask_rect = visible_mask.get_rect()
             mask_rect.center = self.position
             surface.blit(visible_mask, mask_rect, None)
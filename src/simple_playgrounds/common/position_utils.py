@@ -2,17 +2,20 @@
 Module containing classes to generate random positions and trajectories
 
 """
-from typing import Tuple, Optional, Union
+from typing import Tuple, Optional, Union, List
 
 import pymunk
-import random
 import math
+import functools
 from collections.abc import Generator
 
 import numpy as np
 
 Coordinate = Tuple[Tuple[float, float], float]
 
+# Number of distinct paths whose trajectory points are kept in cache
+TRAJECTORY_CACHE_SIZE = 256
+
 
 class CoordinateSampler:
     """ Sampler for a random position within a particular area
@@ -94,14 +97,33 @@ class CoordinateSampler:
         else:
             raise ValueError('area shape not implemented')
 
+        # Used when sampling without the random generator of a Playground
+        self._rng = np.random.default_rng()
+
     def sample(self,
-               coordinates: Optional[Coordinate] = None) -> Coordinate:
+               coordinates: Optional[Coordinate] = None,
+               rng: Optional[np.random.Generator] = None,
+               ) -> Coordinate:
+        """
+        Samples coordinates in the area.
+
+        Args:
+            coordinates: If set, position and angle around which the area is centered.
+            rng: Random generator used for sampling.
+                If None, the sampler uses its own random generator.
+
+        Returns: Coordinate
+
+        """
+
+        if rng is None:
+            rng = self._rng
 
         x, y, theta = 0., 0., 0.
 
         if not coordinates:
             center = self._center
-            theta = random.uniform(*self._angle_range)
+            theta = rng.uniform(*self._angle_range)
 
         else:
             center, theta = coordinates
@@ -113,8 +135,8 @@ class CoordinateSampler:
             found_position = False
 
             while not found_position:
-                x = random.uniform(-self._width / 2, self._width / 2)
-                y = random.uniform(-self._length / 2, self._length / 2)
+                x = rng.uniform(-self._width / 2, self._width / 2)
+                y = rng.uniform(-self._length / 2, self._length / 2)
 
                 if not (-self._min_width / 2 < x < self._min_width / 2
                         and -self._min_length / 2 < y < self._min_length / 2):
@@ -125,8 +147,8 @@ class CoordinateSampler:
             found_position = False
 
             while not found_position:
-                x = random.uniform(-self._radius, self._radius)
-                y = random.uniform(-self._radius, self._radius)
+                x = rng.uniform(-self._radius, self._radius)
+                y = rng.uniform(-self._radius, self._radius)
 
                 r = math.sqrt(x**2 + y**2)
                 if self._min_radius < r < self._radius:
@@ -137,7 +159,7 @@ class CoordinateSampler:
             found_position = False
 
             while not found_position:
-                x, y = np.random.multivariate_normal(
+                x, y = rng.multivariate_normal(
                     (0, 0),
                     ((self._std**2, 0), (0, self._std**2)),
                 )
@@ -205,7 +227,7 @@ class Trajectory(Generator):
             self.waypoints = kwargs['waypoints']
 
         # Generate all trajectory points based on waypoints
-        self.trajectory_points = self._generate_trajectory()
+        self.points = self._get_trajectory_points()
 
         self._index_start = index_start
         self.current_index = self._index_start
@@ -220,7 +242,7 @@ class Trajectory(Generator):
 
             # Center the starting point on the x axis, angle 0
             return self._idx_start - int(
-                len(self.trajectory_points) / number_sides / 2)
+                len(self.points) / number_sides / 2)
 
         return self._idx_start
 
@@ -246,45 +268,21 @@ class Trajectory(Generator):
 
         return waypoints[::-1]
 
-    def _generate_trajectory(self):
-
-        shifted_waypoints = self.waypoints[1:] + self.waypoints[:1]
-        total_length = sum([
-            math.sqrt((x1[0] - x2[0])**2 + (x1[1] - x2[1])**2)
-            for x1, x2 in zip(self.waypoints, shifted_waypoints)
-        ])
-
-        trajectory_points = []
-
-        for pt_1, pt_2 in zip(self.waypoints, shifted_waypoints):
-
-            distance_between_points = math.sqrt((pt_1[0] - pt_2[0])**2 +
-                                                (pt_1[1] - pt_2[1])**2)
-
-            # Ratio of trajectory points between these two waypoints
-            ratio_points = distance_between_points / total_length
-            n_points = int(self.trajectory_duration * ratio_points)
-
-            pts_x = [
-                pt_1[0] + x * (pt_2[0] - pt_1[0]) / n_points
-                for x in range(n_points)
-            ]
-            pts_y = [
-                pt_1[1] + x * (pt_2[1] - pt_1[1]) / n_points
-                for x in range(n_points)
-            ]
-
-            for i in range(n_points):
-                trajectory_points.append([(pts_x[i], pts_y[i]), 0])
-
-        for pt_index, trajectory_point in enumerate(trajectory_points):
+    @property
+    def trajectory_points(self) -> List:
+        """ List of [(x, y), angle] points of the trajectory."""
+        return [[(x, y), angle] for x, y, angle in self.points.tolist()]
 
-            angle = (pt_index * self.n_rotations) * (
-                2 * math.pi) / len(trajectory_points) % (2 * math.pi)
+    def _get_trajectory_points(self) -> np.ndarray:
+        """
+        Returns the points of the trajectory as an array of (x, y, angle).
+        Arrays are cached and shared by trajectories that follow the same path.
+        They are read-only.
+        """
 
-            trajectory_point[1] = angle
+        waypoints = tuple(tuple(waypoint) for waypoint in self.waypoints)
 
-        return trajectory_points
+        return _trajectory_points(waypoints, self.trajectory_duration, self.n_rotations)
 
     def send(self, ignored_args):
         """ Function for generator. Sends current position, then changes current position depending on rotation side.
@@ -296,20 +294,24 @@ class Trajectory(Generator):
             position ('obj' list of :obj:'int'): next (x,y,theta) position
 
         """
-        returned_value = self.trajectory_points[self.current_index]
+        pos_x, pos_y, angle = self.points[self.current_index]
+        self.advance()
+
+        return (pos_x, pos_y), angle
+
+    def advance(self):
+        """ Moves the current index to the next point of the trajectory."""
 
         if self.counter_clockwise:
             self.current_index -= 1
-            if self.current_index == -(len(self.trajectory_points)):
+            if self.current_index == -(len(self.points)):
                 self.current_index = 0
 
         else:
             self.current_index += 1
-            if self.current_index == len(self.trajectory_points):
+            if self.current_index == len(self.points):
                 self.current_index = 0
 
-        return returned_value
-
     # pylint: disable=redefined-builtin
     # pylint: disable=arguments-differ
     def throw(self, type=None, value=None, traceback=None):
@@ -330,6 +332,61 @@ class Trajectory(Generator):
         self.current_index = self._index_start
 
 
+@functools.lru_cache(maxsize=TRAJECTORY_CACHE_SIZE)
+def _trajectory_points(waypoints: Tuple[Tuple[float, ...], ...],
+                       trajectory_duration: int,
+                       n_rotations: int) -> np.ndarray:
+    """ Trajectory points are shared between Trajectories that follow the same path."""
+
+    points = np.array([[x, y, angle]
+                       for (x, y), angle in _generate_trajectory(waypoints, trajectory_duration, n_rotations)],
+                      dtype=float)
+    points.setflags(write=False)
+
+    return points
+
+
+def _generate_trajectory(waypoints, trajectory_duration, n_rotations):
+
+    shifted_waypoints = waypoints[1:] + waypoints[:1]
+    total_length = sum([
+        math.sqrt((x1[0] - x2[0])**2 + (x1[1] - x2[1])**2)
+        for x1, x2 in zip(waypoints, shifted_waypoints)
+    ])
+
+    trajectory_points = []
+
+    for pt_1, pt_2 in zip(waypoints, shifted_waypoints):
+
+        distance_between_points = math.sqrt((pt_1[0] - pt_2[0])**2 +
+                                            (pt_1[1] - pt_2[1])**2)
+
+        # Ratio of trajectory points between these two waypoints
+        ratio_points = distance_between_points / total_length
+        n_points = int(trajectory_duration * ratio_points)
+
+        pts_x = [
+            pt_1[0] + x * (pt_2[0] - pt_1[0]) / n_points
+            for x in range(n_points)
+        ]
+        pts_y = [
+            pt_1[1] + x * (pt_2[1] - pt_1[1]) / n_points
+            for x in range(n_points)
+        ]
+
+        for i in range(n_points):
+            trajectory_points.append([(pts_x[i], pts_y[i]), 0])
+
+    for pt_index, trajectory_point in enumerate(trajectory_points):
+
+        angle = (pt_index * n_rotations) * (
+            2 * math.pi) / len(trajectory_points) % (2 * math.pi)
+
+        trajectory_point[1] = angle
+
+    return trajectory_points
+
+
 InitCoord = Union[Coordinate, CoordinateSampler,
                   Trajectory, ]
 
@@ -10,11 +10,43 @@ import math
 import itertools
 
 import numpy as np
-from pygame import Surface, draw
+from pygame import Surface, draw, SRCALPHA
 from pygame import surfarray
 from skimage.transform import resize
 
 
+def surface_to_state(surface: Optional[Surface]) -> Optional[Dict[str, np.ndarray]]:
+    """ Converts a pygame Surface into numpy arrays, so that it can be pickled."""
+
+    if surface is None:
+        return None
+
+    state = {'pixels': surfarray.array3d(surface)}
+
+    if surface.get_flags() & SRCALPHA:
+        state['alpha'] = surfarray.array_alpha(surface)
+
+    return state
+
+
+def surface_from_state(state: Optional[Dict[str, np.ndarray]]) -> Optional[Surface]:
+    """ Rebuilds a pygame Surface from the arrays created by surface_to_state."""
+
+    if state is None:
+        return None
+
+    pixels = state['pixels']
+
+    if 'alpha' not in state:
+        return surfarray.make_surface(pixels)
+
+    surface = Surface(pixels.shape[:2], SRCALPHA)
+    surfarray.blit_array(surface, pixels)
+    surfarray.pixels_alpha(surface)[...] = state['alpha']
+
+    return surface
+
+
 class Texture(ABC):
     """ Base Class for Textue"""
     def __init__(
@@ -73,6 +105,22 @@ class Texture(ABC):
     def surface(self):
         return self._surface
 
+    def __getstate__(self):
+
+        state = self.__dict__.copy()
+        state['_surface'] = surface_to_state(self._surface)
+
+        return state
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+        self._surface = surface_from_state(state['_surface'])
+
+    def __deepcopy__(self, memo):
+        # Textures are shared between copies of an entity
+        return self
+
 
 class TextureGenerator:
     """
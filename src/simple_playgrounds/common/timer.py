@@ -1,4 +1,5 @@
-from typing import Union, List, Tuple
+from typing import Union, List, Tuple, Dict, Optional
+import heapq
 
 
 class Timer(object):
@@ -9,16 +10,23 @@ class Timer(object):
             durations = [durations]
 
         assert isinstance(durations, (list, tuple))
+        assert all(duration > 0 for duration in durations)
 
         self._durations = durations
         self.timer_done = False
         self._current_index_timer = 0
         self._timer = self._durations[self._current_index_timer]
 
+        # Set when the timer is added to a TimerScheduler
+        self._scheduler: Optional[TimerScheduler] = None
+
     def reset(self):
         self._current_index_timer = 0
         self._timer = self._durations[self._current_index_timer]
 
+        if self._scheduler:
+            self._scheduler.schedule(self, self._timer)
+
     def step(self):
 
         self._timer -= 1
@@ -32,3 +40,142 @@ class Timer(object):
             self._timer = self._durations[self._current_index_timer]
 
             self.timer_done = True
+
+    def _fire(self):
+        """ Called by the TimerScheduler when the timer is due."""
+
+        self._current_index_timer = (self._current_index_timer + 1) % len(
+            self._durations)
+        self._timer = self._durations[self._current_index_timer]
+
+        self.timer_done = True
+
+        if self._scheduler:
+            self._scheduler.schedule(self, self._timer)
+
+
+class TimerScheduler:
+    """
+    Keeps track of the Timers of a Playground.
+
+    Instead of stepping every Timer at each step, the scheduler stores
+    the step at which each Timer is due in a heap.
+    Only the Timers that are due are touched when the scheduler steps.
+
+    Attributes:
+        current_step: number of steps of the scheduler.
+
+    Note:
+        When a Timer is reset or rescheduled, its previous entry in the heap is
+        invalidated rather than removed.
+    """
+
+    def __init__(self):
+
+        self.current_step = 0
+
+        self._queue: List[Tuple[int, int, Timer]] = []
+        self._entries: Dict[Timer, int] = {}
+        self._n_entries = 0
+
+        self._timers_done: List[Timer] = []
+
+    def add(self, timer: Timer):
+        """
+        Adds a Timer to the scheduler.
+        The Timer keeps its remaining duration.
+
+        Args:
+            timer: Timer to schedule.
+
+        """
+
+        if timer._scheduler is not None:
+            raise ValueError('Timer already scheduled')
+
+        timer._scheduler = self
+        self.schedule(timer, timer._timer)
+
+    def schedule(self, timer: Timer, duration: int):
+        """
+        (Re)schedules a Timer to be due in duration steps.
+
+        Args:
+            timer: Timer to schedule.
+            duration: Number of steps before the Timer is due.
+
+        """
+
+        entry = self._n_entries
+        self._n_entries += 1
+        self._entries[timer] = entry
+        heapq.heappush(self._queue, (self.current_step + duration, entry, timer))
+
+    def step(self) -> List[Timer]:
+        """
+        Advances the scheduler by one step.
+
+        Returns: List of Timers that are due at this step, in the order they were scheduled.
+
+        """
+
+        self.current_step += 1
+
+        for timer in self._timers_done:
+            timer.timer_done = False
+
+        self._timers_done = []
+
+        while self._queue and self._queue[0][0] <= self.current_step:
+
+            _, entry, timer = heapq.heappop(self._queue)
+
+            # Entry invalidated by a later reset
+            if self._entries.get(timer) != entry:
+                continue
+
+            timer._fire()
+            self._timers_done.append(timer)
+
+        return list(self._timers_done)
+
+    def next_event_step(self) -> Optional[int]:
+        """
+        Returns the step at which the next Timer is due,
+        or None if no Timer is scheduled.
+        """
+
+        while self._queue:
+
+            fire_step, entry, timer = self._queue[0]
+
+            if self._entries.get(timer) == entry:
+                return fire_step
+
+            heapq.heappop(self._queue)
+
+        return None
+
+    def skip(self, n_steps: int):
+        """
+        Advances the scheduler by n_steps where no Timer is due.
+
+        Args:
+            n_steps: Number of steps to skip.
+
+        """
+
+        next_event = self.next_event_step()
+
+        if next_event is not None and next_event <= self.current_step + n_steps:
+            raise ValueError('A Timer is due within the skipped steps')
+
+        for timer in self._timers_done:
+            timer.timer_done = False
+
+        self._timers_done = []
+
+        self.current_step += n_steps
+
+    def __len__(self):
+        return len(self._entries)
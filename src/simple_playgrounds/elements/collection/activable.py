@@ -1,10 +1,11 @@
 """
 InteractiveSceneElements can be activated by an agent.
 """
-from typing import Dict, Optional, Union, List, Type
+from typing import Dict, Optional, Union, Type
 from abc import ABC
 
 from ...elements.element import InteractiveElement, SceneElement, GemElement
+from ...elements.pool import ElementPool
 from ...common.definitions import CollisionTypes, ElementTypes
 
 from ...agents.agent import Agent
@@ -95,7 +96,10 @@ class Dispenser(ActivableElement):
             self._coordinates_sampler = production_area
 
         self.production_limit = production_limit
-        self.produced_entities: List[SceneElement] = []
+        self.produced_entities: Dict[SceneElement, None] = {}
+
+        # Set by the Playground, to recycle the SceneElements produced
+        self.element_pool: Optional[ElementPool] = None
 
     def activate(self, _):
 
@@ -108,20 +112,26 @@ class Dispenser(ActivableElement):
 
             if self._recompute_center:
                 initial_coordinate = self._coordinates_sampler.sample(
-                    self._center_elem.coordinates)
+                    self._center_elem.coordinates, rng=self.rng)
+            else:
+                initial_coordinate = self._coordinates_sampler.sample(rng=self.rng)
+
+            if self.element_pool is not None:
+                elem = self.element_pool.acquire(self.elem_class_produced,
+                                                 temporary=True,
+                                                 **self.element_produced_params)
             else:
-                initial_coordinate = self._coordinates_sampler.sample()
-            elem = self.elem_class_produced(temporary=True,
-                                            **self.element_produced_params)
+                elem = self.elem_class_produced(temporary=True,
+                                                **self.element_produced_params)
 
-            self.produced_entities.append(elem)
+            self.produced_entities[elem] = None
             elem_add = [(elem, initial_coordinate)]
 
         return None, elem_add
 
     def reset(self):
 
-        self.produced_entities = []
+        self.produced_entities = {}
         super().reset()
 
 
@@ -1,12 +1,14 @@
 """
 Module for Basic SceneElements
 """
-from typing import Union, Optional
+from typing import Union, Optional, List, Tuple, Dict
 
 import pymunk
+import pygame
 
 from ..element import SceneElement
-from simple_playgrounds.common.definitions import ElementTypes
+from simple_playgrounds.common.definitions import ElementTypes, FRICTION_ENTITY, ELASTICITY_ENTITY
+from ...common.texture import Texture, TextureGenerator
 from ...configs.parser import parse_configuration
 
 
@@ -76,6 +78,103 @@ class Wall(Physical):
             end_point - start_point).angle
 
 
+class WallLayout(SceneElement):
+    """ Walls of a playground layout, as shapes of a single static body.
+
+    The body is placed at the origin of the playground,
+    so that the vertices of the walls are expressed in playground coordinates.
+    The walls share a single texture, the size of the playground.
+    """
+    def __init__(self,
+                 walls: List[List[Tuple[float, float]]],
+                 size: Tuple[float, float],
+                 texture: Union[Texture, Dict, Tuple[int, int, int]],
+                 **entity_params):
+        """
+
+        Args:
+            walls: list of walls, each described by the vertices of its polygon.
+            size: size of the playground.
+            texture: texture shared by all the walls.
+            **entity_params: other params to configure entity. Refer to Entity class.
+        """
+
+        elem_config = parse_configuration('element_basic', ElementTypes.WALL)
+        elem_config = {**elem_config, **entity_params}
+
+        # Texture surfaces are transposed with respect to the texture size
+        if isinstance(texture, Dict):
+            width, length = size
+            texture = TextureGenerator.create(**{**texture, 'size': (length, width)})
+
+        super().__init__(visible_shape=False,
+                         invisible_shape=False,
+                         size=size,
+                         texture=texture,
+                         **elem_config)
+
+        self.pm_wall_shapes: List[pymunk.Poly] = []
+
+        for vertices in walls:
+            pm_shape = pymunk.Poly(self.pm_body, vertices)
+            pm_shape.friction = FRICTION_ENTITY
+            pm_shape.elasticity = ELASTICITY_ENTITY
+            pm_shape.filter = pymunk.ShapeFilter(
+                categories=2, mask=pymunk.ShapeFilter.ALL_MASKS() ^ 1)
+            self.pm_wall_shapes.append(pm_shape)
+
+        self.pm_elements += self.pm_wall_shapes
+
+        self.initial_coordinates = (0, 0), 0
+
+    def _set_shape_collision(self):
+        pass
+
+    def assign_shape_filter(self,
+                            category_index: int,
+                            ):
+
+        for pm_shape in self.pm_wall_shapes:
+            mask_filter = pm_shape.filter.mask ^ 2**category_index
+            pm_shape.filter = pymunk.ShapeFilter(
+                categories=pm_shape.filter.categories,
+                mask=mask_filter)
+
+    def get_pixel(self, relative_pos):
+
+        # Relative positions are rotated by pi/2 for regular entities
+        pos_x, pos_y = relative_pos[1], -relative_pos[0]
+
+        surface = self._texture_surface
+        pos_x = min(max(0, int(pos_x)), surface.get_width() - 1)
+        pos_y = min(max(0, int(pos_y)), surface.get_height() - 1)
+
+        return surface.get_at((pos_x, pos_y))[:3]
+
+    def _create_mask(self, invisible=False):
+
+        mask_size = int(self._size_visible[0]), int(self._size_visible[1])
+        mask = pygame.Surface(mask_size, pygame.SRCALPHA)
+        mask.fill((0, 0, 0, 0))
+
+        for pm_shape in self.pm_wall_shapes:
+            vertices = pm_shape.get_vertices()
+            center = sum(vertices, pymunk.Vec2d(0, 0)) / len(vertices)
+            vertices = [v - (v - center).normalized() for v in vertices]
+            pygame.draw.polygon(mask, (255, 255, 255, 255), vertices)
+
+        mask.blit(self._texture_surface, (0, 0), None, pygame.BLEND_MULT)
+
+        return mask
+
+    def draw(self, surface, draw_invisible=False, force_recompute_mask=False):
+
+        mask = self._get_mask(force_recompute_mask=force_recompute_mask)
+        surface.blit(mask, (0, 0), None)
+
+        self.drawn = True
+
+
 class Door(Physical):
     """ Door that can be opened with a switch.
 
@@ -3,8 +3,6 @@ Scene Elements used for conditioning experiments
 """
 from typing import List, Union, Dict, Tuple
 
-import random
-
 from ..element import InteractiveElement
 from simple_playgrounds.common.definitions import CollisionTypes, ElementTypes
 from ...configs.parser import parse_configuration
@@ -72,7 +70,7 @@ class ColorChanging(InteractiveElement):
             self.state = (self.state + 1) % len(self.textures)
 
         elif self._mode == 'random':
-            self.state = random.randint(0, len(self.textures) - 1)
+            self.state = int(self.rng.integers(len(self.textures)))
 
         else:
             raise ValueError('not implemented')
@@ -12,6 +12,10 @@ from ...configs.parser import parse_configuration
 # pylint: disable=line-too-long
 
 
+def _reindex_shapes(space, body):
+    space.reindex_shapes_for_body(body)
+
+
 class Edible(InteractiveElement, ABC):
     """
     Base class for edible Scene Elements.
@@ -44,22 +48,20 @@ class Edible(InteractiveElement, ABC):
                          reward=reward,
                          **entity_params)
 
-        self._entity_params = entity_params
-
         self._shrink_ratio = shrink_ratio
         self._min_reward = min_reward
 
+        # Used to restore the edible when reset
+        self._initial_reward = reward
+        self._initial_radius = self._radius_visible
+        self._initial_mass = self.mass
+
     def activate(self, _):
 
         super().activate(_)
         """" Change size, reward, and appearance."""
 
-        # Change reward, size and mass
-        prev_coordinates = self.coordinates
-
         new_reward = self._reward * self._shrink_ratio
-        new_mass = self.mass * self._shrink_ratio
-        new_radius = self._radius_visible * self._shrink_ratio
 
         continue_eating = False
 
@@ -69,29 +71,33 @@ class Edible(InteractiveElement, ABC):
         if self._reward < 0 and new_reward < self._min_reward:
             continue_eating = True
 
-        if continue_eating:
+        if not continue_eating:
+            return [self], None
+
+        # Shrink in place: shapes are resized on the same body.
+        new_mass = None
+        if self.mass is not None:
+            new_mass = self.mass * self._shrink_ratio
+
+        self.resize(self._shrink_ratio, mass=new_mass)
+        self.reward = new_reward
+
+        # Shapes are reindexed once the physical step is over
+        if self.pm_body.space:
+            self.pm_body.space.add_post_step_callback(_reindex_shapes,
+                                                      self.pm_body)
 
-            entity_params = {
-                **self._entity_params,
-                'radius': new_radius,
-                'reward': new_reward,
-                'shrink_ratio': self._shrink_ratio,
-                'min_reward': self._min_reward,
-                'mass': new_mass,
-                'texture': self.texture,
-                'generate_texture': False,
-                'temporary': True,
-            }
+        return None, None
 
-            new_edible = self.__class__(**entity_params)
+    def reset(self):
 
-            new_edible.activated = True
+        if self._radius_visible != self._initial_radius:
+            self.resize(self._initial_radius / self._radius_visible,
+                        mass=self._initial_mass)
 
-            elem_add = [(new_edible, prev_coordinates)]
-        else:
-            elem_add = None
+        self.reward = self._initial_reward
 
-        return [self], elem_add
+        super().reset()
 
     def _set_shape_collision(self):
         self.pm_invisible_shape.collision_type = CollisionTypes.ACTIVABLE
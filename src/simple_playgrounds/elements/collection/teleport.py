@@ -35,7 +35,7 @@ class TeleportToCoordinates(TeleportElement, ABC):
     def energize(self, agent: Agent):
 
         if isinstance(self.destination, CoordinateSampler):
-            return self.destination.sample()
+            return self.destination.sample(rng=self.rng)
 
         return self.destination
 
@@ -1,7 +1,9 @@
 """
 Module for Field
 """
-import random
+from typing import Dict
+
+import numpy as np
 
 from simple_playgrounds.common.definitions import ElementTypes
 
@@ -51,12 +53,25 @@ class Field:
         self.limit = limit
         self.total_limit = total_limit
         self.total_produced = 0
-        self.produced_entities = []
+        self.produced_entities: Dict = {}
+
+        # Set by the Playground, to recycle the SceneElements produced
+        self.element_pool = None
+
+        # Replaced by the Playground, to draw productions reproducibly
+        self.rng: np.random.Generator = np.random.default_rng()
 
         # Internal counter to assign identity number to each entity
         self.name = 'field_' + str(Field.id_number)
         Field.id_number += 1
 
+    @property
+    def reached_limit(self) -> bool:
+        """ True if the field can't produce anymore, and doesn't draw from its random generator. """
+
+        return len(self.produced_entities) >= self.limit \
+               or self.total_produced >= self.total_limit
+
     def can_produce(self):
         """
         Tests if the field can produce a new SceneElement.
@@ -67,9 +82,7 @@ class Field:
 
         """
 
-        return len(self.produced_entities) < self.limit \
-               and self.total_produced < self.total_limit\
-               and random.random() < self.probability
+        return not self.reached_limit and self.rng.random() < self.probability
 
     def produce(self):
         """
@@ -78,13 +91,18 @@ class Field:
 
         """
 
-        obj = self.entity_produced(**self.entity_produced_params)
+        if self.element_pool is not None:
+            obj = self.element_pool.acquire(self.entity_produced,
+                                            **self.entity_produced_params)
+        else:
+            obj = self.entity_produced(**self.entity_produced_params)
+
         obj.temporary = True
 
         self.total_produced += 1
-        self.produced_entities.append(obj)
+        self.produced_entities[obj] = None
 
-        initial_position = self.location_sampler.sample()
+        initial_position = self.location_sampler.sample(rng=self.rng)
 
         return obj, initial_position
 
@@ -93,5 +111,5 @@ class Field:
         Reset the field by resetting the total count of SceneElements produced.
         """
 
-        self.produced_entities = []
+        self.produced_entities = {}
         self.total_produced = 0
@@ -0,0 +1,115 @@
+"""
+Module for ElementPool.
+
+Fields and Dispensers produce temporary SceneElements during an episode.
+Instead of constructing a new SceneElement for every production,
+they can acquire one from an ElementPool, which recycles the temporary elements
+that were removed from the Playground.
+"""
+from typing import Dict, List, Set, Hashable, Type, Any
+
+from .element import SceneElement
+
+
+def _freeze(value: Any) -> Hashable:
+    """ Converts parameters of a SceneElement into a hashable key."""
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+
+    try:
+        hash(value)
+    except TypeError:
+        return id(value)
+
+    return value
+
+
+class ElementPool:
+    """
+    Pool of temporary SceneElements, grouped by class and parameters.
+
+    Elements created by the pool are kept track of.
+    When they are removed from the Playground, they are released to the pool.
+    Once recycled, they can be acquired again with the same class and parameters.
+
+    Note:
+        Elements are removed from the pymunk space after the physics step.
+        Released elements are only made available when recycle() is called,
+        so that the same pymunk body is never removed and added during a step.
+    """
+
+    def __init__(self):
+
+        self._available: Dict[Hashable, List[SceneElement]] = {}
+        self._released: Dict[SceneElement, None] = {}
+
+        # Elements in the available lists, for constant time membership tests
+        self._in_pool: Set[SceneElement] = set()
+        self._keys: Dict[SceneElement, Hashable] = {}
+
+    def acquire(self,
+                element_class: Type[SceneElement],
+                **element_params,
+                ) -> SceneElement:
+        """
+        Returns a SceneElement of class element_class, parametrized by element_params.
+        A released element is reset and recycled if possible, else a new element is created.
+
+        Args:
+            element_class: Class of the SceneElement.
+            **element_params: Parameters of the SceneElement.
+
+        Returns: SceneElement
+
+        """
+
+        key = (element_class, _freeze(element_params))
+
+        available = self._available.get(key)
+
+        if available:
+            element = available.pop()
+            self._in_pool.discard(element)
+            element.reset()
+            return element
+
+        element = element_class(**element_params)
+        self._keys[element] = key
+
+        return element
+
+    def release(self, element: SceneElement) -> bool:
+        """
+        Marks an element for recycling.
+        Elements that were not created by the pool are ignored.
+
+        Args:
+            element: SceneElement removed from the Playground.
+
+        Returns: True if the element was released to the pool.
+
+        """
+
+        if element not in self._keys:
+            return False
+
+        self._released[element] = None
+
+        return True
+
+    def recycle(self):
+        """ Makes the released elements available for acquisition."""
+
+        for element in self._released:
+            if element not in self._in_pool:
+                self._available.setdefault(self._keys[element], []).append(element)
+                self._in_pool.add(element)
+
+        self._released = {}
+
+    def __len__(self):
+        return len(self._in_pool)
@@ -15,7 +15,9 @@ Typical Usage:
     engine.terminate()
 """
 
-from typing import Union, Dict
+from typing import Union, Dict, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import copy
 
 import numpy as np
 
@@ -30,7 +32,10 @@ from skimage.transform import rescale
 from .playgrounds.playground import Playground
 from .agents.agent import Agent
 from .agents.parts.actuators import Actuator, Activate
-from .common.definitions import SIMULATION_STEPS
+from .agents.sensors.sensor import Sensor
+from .recorder import EpisodeRecorder, ActionLog
+from .observations import ObservationBuffers
+from .frame_writer import compose_layout
 
 _BORDER_IMAGE = 5
 _PYGAME_WAIT_DISPLAY = 30
@@ -44,6 +49,7 @@ class Engine:
         playground: Playground
         agents: list of all agents in the Playground.
         game_on: if True, the playground didn't reached termination.
+        observation_buffers: if set, arrays holding the observations, rewards and done flags of all agents.
     """
 
     # pylint: disable=too-many-function-args
@@ -57,6 +63,10 @@ class Engine:
         time_limit: Union[int, None] = None,
         screen: bool = False,
         debug: bool = False,
+        recorder: Optional[Union[EpisodeRecorder, ActionLog]] = None,
+        headless: bool = False,
+        sensor_workers: Optional[int] = None,
+        observation_buffers: bool = False,
     ):
         """
         Args:
@@ -66,6 +76,14 @@ class Engine:
             screen: If True, a pygame screen is created for display.
                 Default: False
             debug: If True, scene is displayed using debug colors instead of textures.
+            recorder: If set, steps and observations of the episode are recorded to disk.
+            headless: If True, the engine never initializes a pygame display.
+                Default: False
+            sensor_workers: If set, sensors of different agents are computed concurrently
+                by a pool of sensor_workers threads. Sensors that use pygame surfaces stay
+                in the main thread.
+            observation_buffers: If True, observations, rewards and done flags of all agents
+                are copied into preallocated arrays each time the observations are updated.
 
         Notes:
             A pygame screen is created by default if one agent is controlled by Keyboard.
@@ -75,6 +93,13 @@ class Engine:
             If time limit is defined in playground and engine, engine prevails.
             If time limit is False, environment never terminates.
 
+            In headless mode, the engine only uses plain pygame Surfaces and never touches the display,
+            so the global pygame state is left to other engines of the process.
+            Pygame surfaces are only allocated when sensors or rendering calls need them.
+
+            Ray collision queries release the GIL, so that agents with many ray-based sensors
+            are sensed in parallel. The space is only read while the observations are updated.
+
         """
 
         self.playground = playground
@@ -89,6 +114,31 @@ class Engine:
             self._time_limit = self.playground.time_limit
 
         self._debug = debug
+        self.recorder = recorder
+
+        self._headless = headless
+
+        if sensor_workers is not None and sensor_workers < 1:
+            raise ValueError('sensor_workers must be at least 1')
+
+        self._sensor_workers = sensor_workers
+        self._sensor_executor: Optional[ThreadPoolExecutor] = None
+
+        self.observation_buffers: Optional[ObservationBuffers] = None
+        if observation_buffers:
+            self.observation_buffers = ObservationBuffers(self.agents)
+
+        if headless and screen:
+            raise ValueError('Headless engine cannot have a screen')
+
+        self._create_surfaces(screen)
+
+        self.game_on = True
+        self.elapsed_time = 0
+
+        self.reset()
+
+    def _create_surfaces(self, screen: bool):
 
         # Display screen
         self._screen = None
@@ -98,22 +148,96 @@ class Engine:
             self._screen.set_alpha(None)
             self._quit_key_ready = True
 
-        # Pygame Surfaces to display the environment
-        self._surface_background = pygame.Surface(self.playground.size)
-        self._surface_background.fill(pygame.Color(0, 0, 0, 0))
+        # Pygame Surfaces to display the environment, allocated when needed
+        self._surface_background: Optional[pygame.Surface] = None
+        self._surface_buffer: Optional[pygame.Surface] = None
 
-        self._surface_buffer = pygame.Surface(self.playground.size)
+        if screen:
+            self._allocate_surfaces()
 
-        self.game_on = True
-        self.elapsed_time = 0
+    def _allocate_surfaces(self) -> Tuple[pygame.Surface, pygame.Surface]:
+        """ Allocates the surfaces the first time they are needed. Returns the background and buffer surfaces."""
 
-        self.reset()
+        if self._surface_background is None or self._surface_buffer is None:
+
+            self._surface_background = pygame.Surface(self.playground.size)
+            self._surface_buffer = pygame.Surface(self.playground.size)
+
+            self._draw_background()
+
+        return self._surface_background, self._surface_buffer
+
+    # SERIALIZATION
+
+    def __getstate__(self):
+        """
+        Engines can be pickled, with their Playground and Agents.
+
+        Note:
+            Pymunk does not save the contacts cached by the space.
+            A loaded engine can diverge slightly from the original one if entities were in contact.
+        """
+
+        state = self.__dict__.copy()
+
+        # Pygame surfaces are recreated when the engine is loaded
+        state['_screen'] = self._screen is not None
+        del state['_surface_background']
+        del state['_surface_buffer']
+
+        # Files of the recorder stay with the original engine
+        state['recorder'] = None
+
+        # Threads are started again when needed
+        state['_sensor_executor'] = None
+
+        return state
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+
+        self._create_surfaces(screen=state['_screen'])
+
+    def __deepcopy__(self, memo):
+
+        engine = self.__class__.__new__(self.__class__)
+        memo[id(self)] = engine
+
+        state = self.__dict__.copy()
+        del state['_screen']
+        del state['_surface_background']
+        del state['_surface_buffer']
+        state['recorder'] = None
+        state['_sensor_executor'] = None
+
+        engine.__dict__.update(copy.deepcopy(state, memo))
+
+        # The copy has no screen, and starts from the same background
+        engine._create_surfaces(screen=False)
+
+        if self._surface_background is not None:
+            engine._surface_background = self._surface_background.copy()
+            engine._surface_buffer = pygame.Surface(self.playground.size)
+
+        return engine
+
+    def clone(self) -> 'Engine':
+        """
+        Returns an independent copy of the Engine, its Playground and Agents.
+        The copy has no display screen.
+
+        Returns: Engine
+
+        """
+        return copy.deepcopy(self)
 
     # STEP
 
     def multiple_steps(self,
                        actions: Dict[Agent, Dict[Actuator, float]],
-                       n_steps: int = 1):
+                       n_steps: int = 1,
+                       observe: bool = False):
         """
         Runs multiple steps of the game, with the same actions for the agents.
         The physical actions are performed for n_steps.
@@ -122,54 +246,68 @@ class Engine:
         Args:
             actions: Dictionary containing the actions for each agent.
             n_steps: Number of consecutive steps where the same actions will be applied
+            observe: If True, observations are updated after the last step.
+
+        Note:
+            Held actions are checked and made noisy once, at the first step.
+            Intermediate steps apply the same commands with the same noisy values,
+            advance the physics and handle interactions.
+            The last step applies the actions again, with new noise.
+            Keyboard events are only processed after the last step.
 
         """
-        hold_actions: Dict[Agent, Dict[Actuator, float]] = {}
-        last_action: Dict[Agent, Dict[Actuator, float]] = {}
 
-        terminate = False
+        hold_actions: Dict[Agent, Dict[Actuator, float]] = {
+            agent: {
+                actuator: 0 if isinstance(actuator, Activate) else value
+                for actuator, value in agent_actions.items()
+            }
+            for agent, agent_actions in actions.items()
+        }
 
-        for agent_name, agent_actions in actions.items():
-            hold_actions[agent_name] = {}
-            last_action[agent_name] = {}
+        # Commands and noisy values of the held actions, set at the first step
+        held_commands: List[Tuple[Actuator, float, float]] = []
 
-            for actuator, value in agent_actions.items():
+        cumulated_rewards = np.zeros(len(self.agents))
 
-                last_action[agent_name][actuator] = value
-                hold_actions[agent_name][actuator] = value
+        for step in range(n_steps):
 
-                if isinstance(actuator, Activate):
-                    hold_actions[agent_name][actuator] = 0
+            if step == n_steps - 1:
+                for agent, agent_actions in actions.items():
+                    agent.apply_actions_to_actuators(agent_actions)
 
-        cumulated_rewards = {}
-        for agent in actions:
-            cumulated_rewards[agent] = 0
+            elif step == 0:
+                for agent, agent_actions in hold_actions.items():
+                    agent.apply_actions_to_actuators(agent_actions)
 
-        step = 0
+                held_commands = [
+                    (actuator, actuator.command, actuator.value)
+                    for agent_actions in hold_actions.values()
+                    for actuator in agent_actions
+                ]
 
-        while step < n_steps and not terminate:
-
-            if step < n_steps - 1:
-                action = hold_actions
+            # Held actions were checked and made noisy at the first step
             else:
-                action = last_action
+                for actuator, command, value in held_commands:
+                    actuator.apply_action(value, checked=True)
+                    actuator.command = command
 
-            self._engine_step(action)
+            self.playground.update()
+            self.elapsed_time += 1
 
-            for agent in self.agents:
-                cumulated_rewards[agent] += agent.reward
+            for index, agent in enumerate(self.agents):
+                cumulated_rewards[index] += agent.reward
 
-            step += 1
+            if self.playground.done or self._reached_time_limit():
+                break
 
-            terminate = self._has_terminated()
+        for agent, reward in zip(self.agents, cumulated_rewards.tolist()):
+            agent.reward = reward
 
-        for agent in self.agents:
-            agent.reward = cumulated_rewards[agent]
+        self._post_step(actions)
 
-        if self._reached_time_limit(
-        ) and self.playground.time_limit_reached_reward is not None:
-            for agent in self.agents:
-                agent.reward += self.playground.time_limit_reached_reward
+        if observe:
+            self.update_observations()
 
     def step(self, actions: Dict[Agent, Dict[Actuator, float]]):
         """
@@ -182,6 +320,54 @@ class Engine:
         """
 
         self._engine_step(actions)
+        self._post_step(actions)
+
+    def step_array(self, actions: np.ndarray):
+        """
+        Runs a single step of the game, with actions given as an array.
+
+        Args:
+            actions: Array of shape (n_agents, n_actions). Row i contains the commands of agent i,
+                following its action_layout. Columns beyond the number of actuators of an agent are ignored.
+
+        Note:
+            Commands are clipped to the range of each actuator instead of raising an error.
+
+        """
+
+        actions = np.asarray(actions, dtype=float)
+
+        if actions.ndim != 2 or actions.shape[0] != len(self.agents):
+            raise ValueError('Actions should be an array of shape (n_agents, n_actions)')
+
+        for agent, agent_actions in zip(self.agents, actions):
+            agent.apply_action_array(agent_actions)
+
+        self.playground.update()
+        self.elapsed_time += 1
+
+        # Actions are only converted to dictionaries when they are recorded
+        recorded_actions: Dict[Agent, Dict[Actuator, float]] = {}
+
+        if self.recorder is not None:
+            recorded_actions = {
+                agent: agent.action_layout.to_dict(
+                    agent.action_layout.clip(agent_actions[:len(agent.action_layout)]))
+                for agent, agent_actions in zip(self.agents, actions)
+            }
+
+        self._post_step(recorded_actions)
+
+    def _post_step(self, actions: Dict[Agent, Dict[Actuator, float]]):
+        """
+        Bookkeeping shared by all the ways of stepping the engine:
+        checks termination, adds the time limit reward and records the step.
+
+        Args:
+            actions: Actions applied during the step, as recorded.
+
+        """
+
         self._has_terminated()
 
         if self._reached_time_limit(
@@ -189,15 +375,56 @@ class Engine:
             for agent in self.agents:
                 agent.reward += self.playground.time_limit_reached_reward
 
+        if self.recorder is not None:
+            self.recorder.record_step(self, actions)
+
     def _engine_step(self, actions: Dict[Agent, Dict[Actuator, float]]):
 
         for agent in actions:
             agent.apply_actions_to_actuators(actions[agent])
 
-        self.playground.update(SIMULATION_STEPS)
+        self.playground.update()
 
         self.elapsed_time += 1
 
+    def fast_forward(self, max_steps: int) -> int:
+        """
+        Skips up to max_steps steps where nothing in the scene can change, without running them.
+
+        Steps are skipped when all bodies are asleep and the agents don't act.
+        The jump stops before the next Timer or Field event, or at the time limit.
+        Rewards and termination are the same as running the skipped steps with engine.step({}).
+
+        Args:
+            max_steps: Maximum number of steps to skip.
+
+        Returns:
+            Number of steps skipped, 0 if the scene is not idle.
+
+        Note:
+            Sleeping bodies require a physics preset with sleeping, such as 'fast'.
+            Observations are not updated.
+
+        """
+
+        if not self.game_on:
+            return 0
+
+        if self._time_limit:
+            max_steps = min(max_steps, self._time_limit - 1 - self.elapsed_time)
+
+        n_steps = self.playground.idle_steps(max_steps)
+
+        if n_steps == 0:
+            return 0
+
+        self.playground.skip(n_steps)
+        self.elapsed_time += n_steps
+
+        self._post_step({})
+
+        return n_steps
+
     # TERMINATION CONDITIONS
 
     def _has_terminated(self):
@@ -258,17 +485,20 @@ class Engine:
             if element.background and not element.drawn:
                 element.draw(self._surface_background, )
 
-    def _generate_surface_environment(self, with_interactions=False):
+    def _generate_surface_environment(self, with_interactions=False) -> pygame.Surface:
         """
         Draw all agents and entities on the surface environment.
         Additionally, draws the interaction areas.
 
+        Returns: The surface the environment was drawn on.
+
         """
+        surface_background, surface_buffer = self._allocate_surfaces()
         self._update_surface_background()
-        self._surface_buffer.blit(self._surface_background, (0, 0))
+        surface_buffer.blit(surface_background, (0, 0))
 
         for agent in self.agents:
-            agent.draw(self._surface_buffer)
+            agent.draw(surface_buffer)
 
         for entity in self.playground.elements:
 
@@ -276,9 +506,11 @@ class Engine:
             #     entity.draw(self._surface_buffer, draw_interaction=with_interactions)
 
             if not entity.background or entity.movable:
-                entity.draw(self._surface_buffer,
+                entity.draw(surface_buffer,
                             draw_invisible=with_interactions)
 
+        return surface_buffer
+
     def update_screen(self):
         """
         If the screen is set, updates the screen and displays the environment.
@@ -292,8 +524,8 @@ class Engine:
                 self.playground.space.debug_draw(options)
 
             else:
-                self._generate_surface_environment(with_interactions=True)
-                self._screen.blit(self._surface_buffer, (0, 0), None)
+                surface_buffer = self._generate_surface_environment(with_interactions=True)
+                self._screen.blit(surface_buffer, (0, 0), None)
 
             pygame.display.flip()
 
@@ -311,12 +543,7 @@ class Engine:
 
         """
 
-        self._generate_surface_environment(with_interactions=True)
-
-        np_image = pygame.surfarray.pixels3d(
-            self._surface_buffer.copy()) / 255.
-        np_image = np.rot90(np_image, -1, (1, 0))
-        np_image = np_image[::-1, :, ::-1]
+        np_image = self.capture_frame()[:, :, ::-1] / 255.
 
         if max_size is not None:
 
@@ -329,6 +556,23 @@ class Engine:
 
         return np_image
 
+    def capture_frame(self) -> np.ndarray:
+        """
+        Updates the Environment Surface and returns its raw pixels.
+        Cheaper than generate_playground_image, as the pixels are neither converted nor scaled.
+
+        Returns: uint8 array of shape (height, width, 3), in RGB order.
+
+        """
+
+        surface_buffer = self._generate_surface_environment(with_interactions=True)
+
+        width, height = surface_buffer.get_size()
+        frame = np.frombuffer(pygame.image.tobytes(surface_buffer, 'RGB'),
+                              dtype=np.uint8)
+
+        return frame.reshape(height, width, 3)
+
     # AGENTS
 
     def get_actions(self):
@@ -343,15 +587,64 @@ class Engine:
 
         """
 
+        main_thread_sensors: List[Sensor] = []
+        sensors_per_agent: Dict[Agent, List[Sensor]] = {}
+
         for agent in self.agents:
 
             for sensor in agent.sensors:
 
-                if sensor.requires_surface:
-                    self._update_surface_background()
-                    self._surface_buffer.blit(self._surface_background, (0, 0))
+                if not sensor.is_due(self.elapsed_time):
+                    continue
+
+                if sensor.lazy:
+                    sensor.request_update(self._update_sensor)
+
+                elif self._sensor_workers is None or sensor.requires_surface:
+                    main_thread_sensors.append(sensor)
+
+                else:
+                    sensors_per_agent.setdefault(agent, []).append(sensor)
+
+        # Agents are sensed by the pool while pygame-based sensors run in the main thread
+        futures = []
+        if sensors_per_agent:
+
+            if self._sensor_executor is None:
+                self._sensor_executor = ThreadPoolExecutor(max_workers=self._sensor_workers)
+
+            futures = [
+                self._sensor_executor.submit(self._update_sensors, sensors)
+                for sensors in sensors_per_agent.values()
+            ]
+
+        self._update_sensors(main_thread_sensors)
+
+        for future in futures:
+            future.result()
+
+        if self.observation_buffers is not None:
+            self.observation_buffers.fill(self)
+
+        if self.recorder is not None:
+            self.recorder.record_observations(self)
+
+    def _update_sensors(self, sensors: List[Sensor]):
+
+        for sensor in sensors:
+            self._update_sensor(sensor)
+
+    def _update_sensor(self, sensor: Sensor):
+
+        sensor_surface = None
 
-                sensor.update(playground=self.playground, sensor_surface=self._surface_buffer)
+        if sensor.requires_surface:
+            surface_background, sensor_surface = self._allocate_surfaces()
+            self._update_surface_background()
+            sensor_surface.blit(surface_background, (0, 0))
+
+        sensor.update(playground=self.playground, sensor_surface=sensor_surface)
+        sensor.last_update = self.elapsed_time
 
     def generate_agent_image(self,
                              agent,
@@ -419,80 +712,107 @@ class Engine:
                 width_sensor=width_sensors, height_sensor=height_sensor)
             images['sensors'] = sensor_image
 
-        full_width = _BORDER_IMAGE
-        full_height = 0
-
-        for column in layout:
-
-            if isinstance(column, str):
-                full_width += images[column].shape[1] + _BORDER_IMAGE
-                full_height = max(full_height,
-                                  images[column].shape[0] + 2 * _BORDER_IMAGE)
-
-            elif isinstance(column, tuple):
-                full_width += max([images[col].shape[1]
-                                   for col in column]) + _BORDER_IMAGE
-                full_height = max(
-                    full_height,
-                    _BORDER_IMAGE + sum(images[col].shape[0] + _BORDER_IMAGE
-                                        for col in column))
-
-        full_img = np.ones((full_height, full_width, 3))
-
-        current_width = _BORDER_IMAGE
+        full_img = compose_layout(images, layout, _BORDER_IMAGE)
 
-        for column in layout:
+        if plt_mode:
+            full_img = full_img[:, :, ::-1]
 
-            if isinstance(column, str):
-                full_img[_BORDER_IMAGE: _BORDER_IMAGE + images[column].shape[0],
-                         current_width:current_width + images[column].shape[1], :] \
-                         = images[column][:, :, :]
+        return full_img
 
-                current_width += images[column].shape[1] + _BORDER_IMAGE
+    def capture_agent_frame(self,
+                            agent: Agent,
+                            with_pg: bool = True,
+                            with_actions: bool = True,
+                            width_action: int = 200,
+                            height_action: int = 20,
+                            with_sensors: bool = True,
+                            width_sensors: int = 150,
+                            height_sensor: int = 20,
+                            ) -> Dict[str, np.ndarray]:
+        """
+        Captures the panels of an agent image, to be composed by a FrameWriter.
+        Cheaper than generate_agent_image, as the playground frame is neither converted nor scaled,
+        and the layout is composed in the background thread of the FrameWriter.
 
-            elif isinstance(column, tuple):
+        Args:
+            agent: Instance of agent.
+            with_pg: Capture the playground.
+            with_actions: Capture the actions.
+            width_action: Width of the action bars.
+            height_action: Height of the action bars.
+            with_sensors: Capture the sensors.
+            width_sensors: Width of the sensors.
+            height_sensor: Height of the sensors (when applicable).
 
-                current_height = _BORDER_IMAGE
+        Returns:
+            Dictionary of uint8 arrays of shape (height, width, 3), in RGB order,
+            under the keys 'playground', 'sensors' and 'actions'.
 
-                for col in column:
+        Note:
+            Sensor and action panels are drawn here, as they read values overwritten by the next step.
 
-                    # center
-                    delta_width = max([images[col].shape[1] for col in column
-                                       ]) - images[col].shape[1]
-                    delta_width = int(delta_width / 2)
+        """
 
-                    full_img[current_height: current_height + images[col].shape[0],
-                             current_width + delta_width:current_width + delta_width + images[col].shape[1], :] \
-                        = images[col][:, :, :]
+        panels = {}
 
-                    current_height += images[col].shape[0] + _BORDER_IMAGE
+        if with_pg:
+            panels['playground'] = self.capture_frame()
 
-                current_width += max([images[col].shape[1]
-                                      for col in column]) + _BORDER_IMAGE
+        if with_actions:
+            action_image = agent.generate_actions_image(
+                width_action=width_action, height_action=height_action, plt_mode=True)
+            panels['actions'] = (np.clip(action_image, 0, 1) * 255).astype(np.uint8)
 
-        if plt_mode:
-            full_img = full_img[:, :, ::-1]
+        if with_sensors:
+            sensor_image = agent.generate_sensor_image(
+                width_sensor=width_sensors, height_sensor=height_sensor, plt_mode=True)
+            panels['sensors'] = (np.clip(sensor_image, 0, 1) * 255).astype(np.uint8)
 
-        return full_img
+        return panels
 
-    def reset(self):
+    def reset(self, seed: Optional[int] = None):
         """
         Resets the game to its initial state.
 
+        Args:
+            seed: If set, the random generator of the Playground is reseeded before the reset.
+                Episodes started with the same seed and the same actions are identical.
+
         """
+        if seed is not None:
+            self.playground.seed(seed)
+
         self.playground.reset()
         self.elapsed_time = 0
+
+        for agent in self.agents:
+            for sensor in agent.sensors:
+                sensor.reset()
         self.game_on = True
 
+        if self.recorder is not None:
+            self.recorder.record_reset(self, seed)
+
         # Redraw everything
+        self._draw_background()
+
+    def _draw_background(self):
+
+        if self._surface_background is None:
+            return
+
         self._surface_background.fill(pygame.Color(0, 0, 0, 0))
 
         for elem in self.playground.elements:
             if elem.background:
                 elem.draw(self._surface_background)
 
-    def run(self, steps=None, update_screen=False, print_rewards=False):
-        """ Run the engine for the full duration of the game or a certain number of steps"""
+    def run(self, steps=None, update_screen=False, print_rewards=False, population=None):
+        """ Run the engine for the full duration of the game or a certain number of steps.
+
+        If a RandomPopulation is given, it generates the actions of all agents at once,
+        instead of the controllers of the agents.
+        """
 
         if self._screen is False and update_screen:
             raise ValueError("Can't update non-existing screen")
@@ -501,11 +821,16 @@ class Engine:
 
         while self.game_on and continue_for_n_steps:
 
-            actions = {}
-            for agent in self.agents:
-                actions[agent] = agent.controller.generate_actions()
+            if population is not None:
+                self.step_array(population.generate_actions())
+
+            else:
+                actions = {}
+                for agent in self.agents:
+                    actions[agent] = agent.controller.generate_actions()
+
+                self.step(actions)
 
-            self.step(actions)
             self.update_observations()
 
             if update_screen and self.game_on:
@@ -527,6 +852,15 @@ class Engine:
         Terminate the engine. Quits all pygame instances.
 
         """
-        pygame.quit()  # pylint: disable=no-member
+        if not self._headless:
+            pygame.quit()  # pylint: disable=no-member
+
+        if self.recorder is not None:
+            self.recorder.close()
+
+        if self._sensor_executor is not None:
+            self._sensor_executor.shutdown()
+            self._sensor_executor = None
+
         for elem in self.playground.elements:
             elem.drawn = False
@@ -0,0 +1,237 @@
+""" Contains FrameWriter class.
+
+FrameWriter writes frames of an Engine to disk in a background thread.
+The Engine only grabs the raw uint8 pixels of its surface.
+Scaling and encoding are done by the background thread.
+For agent images, the Engine captures the panels of the playground, sensors and actions as uint8 arrays,
+and the layout is also composed by the background thread.
+Frames are passed through a bounded queue: when the queue is full,
+frames are dropped instead of stalling the simulation.
+
+Typical Usage:
+    writer = FrameWriter('videos/episode_0', max_size=200)
+
+    while engine.game_on:
+        actions = engine.get_actions()
+        engine.step(actions)
+        writer.submit(engine.capture_frame(), engine.elapsed_time)
+        # or, for agent images
+        writer.submit(engine.capture_agent_frame(agent), engine.elapsed_time)
+
+    writer.close()
+"""
+from typing import Optional, Tuple, Dict, Union
+import os
+import queue
+import threading
+
+import numpy as np
+from PIL import Image
+
+_BORDER_IMAGE = 5
+
+Layout = Tuple[Union[str, Tuple[str, ...]], ...]
+
+
+def compose_layout(images: Dict[str, np.ndarray],
+                   layout: Layout,
+                   border: int = _BORDER_IMAGE,
+                   ) -> np.ndarray:
+    """
+    Places images side by side, following a layout.
+
+    Args:
+        images: Images of the panels, by name.
+        layout: Columns of the layout. A column is the name of a panel,
+            or a tuple of names of panels stacked vertically and centered.
+        border: Width of the border around the panels, in pixels.
+
+    Returns: Image of the layout on a white background, with the dtype of the panels.
+
+    """
+
+    dtype = next(iter(images.values())).dtype
+    white = np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else 1
+
+    columns = [(column,) if isinstance(column, str) else column for column in layout]
+    widths = [max(images[name].shape[1] for name in column) for column in columns]
+
+    full_width = border + sum(width + border for width in widths)
+    full_height = max(border + sum(images[name].shape[0] + border for name in column)
+                      for column in columns)
+
+    full_img = np.full((full_height, full_width, 3), white, dtype=dtype)
+
+    current_width = border
+
+    for column, width in zip(columns, widths):
+
+        current_height = border
+
+        for name in column:
+
+            height, panel_width = images[name].shape[:2]
+
+            # center
+            delta_width = int((width - panel_width) / 2)
+
+            full_img[current_height:current_height + height,
+                     current_width + delta_width:current_width + delta_width + panel_width, :] \
+                = images[name][:, :, :]
+
+            current_height += height + border
+
+        current_width += width + border
+
+    return full_img
+
+
+class FrameWriter:
+    """
+    Writes frames in a background thread, as image files named after their step.
+
+    Attributes:
+        directory: Directory where the frames are written.
+        written_frames: Number of frames written to disk.
+        dropped_frames: Number of frames dropped because the queue was full.
+
+    Note:
+        Frames are expected as uint8 arrays of shape (height, width, 3), in RGB order,
+        as returned by Engine.capture_frame(),
+        or as dictionaries of such panels, as returned by Engine.capture_agent_frame().
+        If a frame can't be written, the background thread discards the following frames,
+        and the error is raised by the next call to submit() or close().
+    """
+
+    def __init__(self,
+                 directory: str,
+                 max_size: Optional[int] = None,
+                 queue_size: int = 64,
+                 image_format: str = 'png',
+                 layout: Layout = ('playground', ('sensors', 'actions')),
+                 max_size_playground: Optional[int] = 200,
+                 ):
+        """
+        Args:
+            directory: Directory where the frames are written. Created if it doesn't exist.
+            max_size: If set, frames are scaled so that their largest side is max_size.
+            queue_size: Maximum number of frames waiting to be written.
+            image_format: Format of the image files, e.g. 'png' or 'jpg'.
+            layout: Layout of the panels of agent frames. See Engine.generate_agent_image.
+            max_size_playground: If set, the playground panel of agent frames is scaled
+                so that its largest side is max_size_playground.
+        """
+
+        if queue_size < 1:
+            raise ValueError('queue_size must be at least 1')
+
+        self.directory = directory
+        self._max_size = max_size
+        self._image_format = image_format
+        self._layout = layout
+        self._max_size_playground = max_size_playground
+
+        os.makedirs(directory, exist_ok=True)
+
+        self.written_frames = 0
+        self.dropped_frames = 0
+
+        self._error: Optional[Exception] = None
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._write_frames, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: Union[np.ndarray, Dict[str, np.ndarray]], step: int) -> bool:
+        """
+        Hands a frame to the background thread, without waiting.
+
+        Args:
+            frame: uint8 array of shape (height, width, 3), or dictionary of panels of an agent frame.
+            step: Step of the frame, used to name the file.
+
+        Returns: True if the frame was queued, False if it was dropped.
+
+        """
+
+        self._raise_error()
+
+        if not self._thread.is_alive():
+            raise ValueError('FrameWriter is closed')
+
+        try:
+            self._queue.put_nowait((step, frame))
+        except queue.Full:
+            self.dropped_frames += 1
+            return False
+
+        return True
+
+    @staticmethod
+    def _scaled_size(width: int, height: int, max_size: int) -> Tuple[int, int]:
+
+        scaling_factor = max_size / max(width, height)
+        return max(1, round(width * scaling_factor)), max(1, round(height * scaling_factor))
+
+    def _raise_error(self):
+
+        if self._error is not None:
+            raise self._error
+
+    def _write_frames(self):
+
+        while True:
+
+            item = self._queue.get()
+
+            if item is None:
+                break
+
+            # After an error, frames are discarded until the writer is closed
+            if self._error is not None:
+                continue
+
+            step, frame = item
+
+            try:
+                self._write_frame(step, frame)
+            except Exception as error:  # pylint: disable=broad-except
+                self._error = error
+
+    def _compose(self, panels: Dict[str, np.ndarray]) -> np.ndarray:
+
+        if 'playground' in panels and self._max_size_playground is not None:
+            playground = Image.fromarray(panels['playground'])
+            playground = playground.resize(self._scaled_size(*playground.size, self._max_size_playground),
+                                           Image.Resampling.BILINEAR)
+            panels = {**panels, 'playground': np.asarray(playground)}
+
+        return compose_layout(panels, self._layout)
+
+    def _write_frame(self, step: int, frame: Union[np.ndarray, Dict[str, np.ndarray]]):
+
+        if isinstance(frame, dict):
+            frame = self._compose(frame)
+
+        image = Image.fromarray(frame)
+
+        if self._max_size is not None:
+            image = image.resize(self._scaled_size(*image.size, self._max_size),
+                                 Image.Resampling.BILINEAR)
+
+        image.save(os.path.join(self.directory,
+                                'frame_{:06d}.{}'.format(step, self._image_format)))
+
+        self.written_frames += 1
+
+    def close(self):
+        """
+        Writes the frames remaining in the queue, then stops the background thread.
+        Raises the error of the background thread, if a frame couldn't be written.
+        """
+
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+        self._raise_error()
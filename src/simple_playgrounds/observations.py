@@ -0,0 +1,105 @@
+""" Contains ObservationBuffers class.
+
+ObservationBuffers holds the observations, rewards and done flags
+of all agents of an Engine in preallocated numpy arrays.
+The arrays are filled in place each time the observations are updated,
+so that multi-agent learners read a step through a few arrays
+instead of the observation dictionaries of each agent.
+
+Typical Usage:
+    engine = Engine(playground=my_playground, time_limit=10000, observation_buffers=True)
+    buffers = engine.observation_buffers
+
+    while engine.game_on:
+        engine.step_array(policy(buffers.sensors[0]))
+        engine.update_observations()
+
+        learner.store(buffers.sensors[0], buffers.rewards, buffers.dones)
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .engine import Engine
+    from .agents.agent import Agent
+    from .agents.sensors.sensor import Sensor
+
+
+class ObservationBuffers:
+    """
+    Preallocated arrays for the observations, rewards and done flags of all agents.
+
+    Attributes:
+        sensors: Arrays of shape (n_agents, *sensor shape), indexed by the position of the sensor in agent.sensors.
+            Row i contains the values of that sensor for agent i.
+            Only sensors whose values are numpy arrays are stacked.
+        rewards: Rewards of the agents, of shape (n_agents,).
+        dones: Done flags of the agents, of shape (n_agents,).
+
+    Note:
+        Agents are stacked in the order of engine.agents.
+        Sensors are matched across agents by their position in agent.sensors:
+        all agents must have the same sequence of sensor types, shapes and dtypes.
+        Buffers copy the values cached by the sensors: lazy or periodic sensors are not computed
+        by the copy, and their rows hold the values of their last update.
+        When agents are added to or removed from the Engine, the arrays are reallocated at the next fill.
+    """
+
+    def __init__(self, agents: List[Agent]):
+        """
+        Args:
+            agents: Agents of the Engine.
+        """
+
+        self._allocate(agents)
+
+    def _allocate(self, agents: List[Agent]):
+
+        specs = agents[0].observation_spec if agents else []
+
+        for agent in agents[1:]:
+            if agent.observation_spec != specs:
+                raise ValueError('Agent {} has different sensor types, shapes or dtypes than agent {}'.format(
+                    agent.name, agents[0].name))
+
+        n_agents = len(agents)
+
+        self.sensors: Dict[int, np.ndarray] = {
+            position: np.zeros((n_agents,) + shape, dtype=dtype)
+            for position, (_, shape, dtype) in enumerate(specs) if shape is not None
+        }
+
+        self.rewards = np.zeros(n_agents)
+        self.dones = np.zeros(n_agents, dtype=bool)
+
+        self._agents = list(agents)
+
+        self._slots: List[Tuple[np.ndarray, int, Sensor]] = [
+            (self.sensors[position], index, sensor)
+            for index, agent in enumerate(agents)
+            for position, sensor in enumerate(agent.sensors) if position in self.sensors
+        ]
+
+    def fill(self, engine: Engine):
+        """
+        Copies the current sensor values, rewards and done flags of the agents into the buffers.
+
+        Args:
+            engine: Engine whose observations were updated.
+
+        """
+
+        if engine.agents != self._agents:
+            self._allocate(engine.agents)
+
+        for buffer, index, sensor in self._slots:
+
+            if sensor.sensor_values is not None:
+                buffer[index] = sensor.sensor_values
+
+        for index, agent in enumerate(engine.agents):
+            self.rewards[index] = agent.reward
+
+        self.dones[:] = not engine.game_on
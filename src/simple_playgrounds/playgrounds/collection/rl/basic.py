@@ -1,7 +1,6 @@
 """
 Module containing classical RL environments.
 """
-import random
 
 from ...playground import PlaygroundRegister
 from ...layouts import SingleRoom
@@ -18,9 +17,9 @@ class CoinMaster(SingleRoom):
     The agent should collect the coins, grasp them,
     and bring them to the vending machine to collect rewards.
     """
-    def __init__(self):
+    def __init__(self, **playground_params):
 
-        super().__init__(size=(200, 200), wall_type='dark')
+        super().__init__(size=(200, 200), wall_type='dark', **playground_params)
 
         self.agent_starting_area, self.area_prod, self.area_vending = self._assign_areas(
         )
@@ -45,7 +44,7 @@ class CoinMaster(SingleRoom):
     def _assign_areas(self):
 
         list_coord = [(50, 50), (50, 150), (150, 150), (150, 50)]
-        random.shuffle(list_coord)
+        self.rng.shuffle(list_coord)
 
         # Starting area of the agent
         area_start_center = list_coord.pop()
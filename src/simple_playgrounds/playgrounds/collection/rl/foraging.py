@@ -8,9 +8,9 @@ from ....common.position_utils import CoordinateSampler, Trajectory
 
 @PlaygroundRegister.register('foraging', 'candy_fireballs')
 class CandyFireballs(SingleRoom):
-    def __init__(self, time_limit=100, probability_production=0.4):
+    def __init__(self, time_limit=100, probability_production=0.4, **playground_params):
 
-        super().__init__(size=(200, 200))
+        super().__init__(size=(200, 200), **playground_params)
 
         fireball_texture = {
             'texture_type': 'centered_random_tiles',
@@ -1,5 +1,3 @@
-import random
-
 from ...playground import PlaygroundRegister
 from ...layouts import GridRooms, SingleRoom
 from ....elements.collection.basic import Physical
@@ -21,9 +19,11 @@ class EndgoalRoomCue(SingleRoom):
         reward_reached_endgoal=10,
         reward_reached_deathtrap=-10,
         wall_texture_seed=None,
+        **playground_params,
     ):
 
-        super().__init__(size=(200, 200), wall_texture_seed=wall_texture_seed)
+        super().__init__(size=(200, 200), wall_texture_seed=wall_texture_seed,
+                         **playground_params)
 
         # Starting area of the agent
         area_center, _ = self.area_rooms[(0, 0)]
@@ -66,7 +66,7 @@ class EndgoalRoomCue(SingleRoom):
 
     def _set_goal(self):
 
-        index_goal = random.randint(0, 3)
+        index_goal = int(self.rng.integers(4))
         loc = self.goal_locations[index_goal]
         col = self.cue_colors[index_goal]
 
@@ -102,12 +102,13 @@ class Endgoal9Rooms(GridRooms):
     The agent must reach the invisible goal in the left-down corner.
     Each wall has a different color.
     """
-    def __init__(self, time_limit=1000, wall_texture_seed=None):
+    def __init__(self, time_limit=1000, wall_texture_seed=None, **playground_params):
 
         super().__init__(size=(450, 450),
                          room_layout=(3, 3),
                          wall_type='colorful',
-                         wall_texture_seed=wall_texture_seed)
+                         wall_texture_seed=wall_texture_seed,
+                         **playground_params)
 
         # Starting area of the agent
         area_start = CoordinateSampler(center=(225, 225),
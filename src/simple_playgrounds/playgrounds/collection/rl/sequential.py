@@ -1,5 +1,3 @@
-import random
-
 from ...playground import PlaygroundRegister
 from ...layouts import GridRooms
 from ....elements.collection.gem import Key, Coin
@@ -19,13 +17,15 @@ class DispenserEnv(GridRooms):
         self,
         time_limit=1000,
         wall_texture_seed=None,
+        **playground_params,
     ):
 
         super().__init__(size=(450, 300),
                          room_layout=(3, 2),
                          doorstep_size=60,
                          wall_type='colorful',
-                         wall_texture_seed=wall_texture_seed)
+                         wall_texture_seed=wall_texture_seed,
+                         **playground_params)
 
         self.initial_agent_coordinates, self.area_prod, self.area_dispenser = self._assign_areas(
         )
@@ -39,7 +39,7 @@ class DispenserEnv(GridRooms):
         list_room_coordinates = [
             room_coord for room_coord, _ in self.area_rooms.items()
         ]
-        random.shuffle(list_room_coordinates)
+        self.rng.shuffle(list_room_coordinates)
 
         # Starting area of the agent
         area_start_center, area_start_shape = self.area_rooms[
@@ -90,13 +90,15 @@ class DoorDispenserCoin(GridRooms):
         self,
         time_limit=1000,
         wall_texture_seed=None,
+        **playground_params,
     ):
 
         super().__init__(size=(450, 150),
                          room_layout=(3, 1),
                          doorstep_size=60,
                          wall_type='colorful',
-                         wall_texture_seed=wall_texture_seed)
+                         wall_texture_seed=wall_texture_seed,
+                         **playground_params)
 
         self.time_limit = time_limit
 
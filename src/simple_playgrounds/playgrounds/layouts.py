@@ -7,9 +7,11 @@ from typing import Union, Tuple, Optional, List
 import numpy as np
 
 from .playground import Playground
+from ..common.definitions import PhysicsParameters
 from ..common.position_utils import CoordinateSampler
 from ..configs import parse_configuration
-from .rooms import Doorstep, RectangleRoom
+from .rooms import Doorstep, RectangleRoom, merge_wall_pieces
+from ..elements.collection.basic import WallLayout
 
 
 class GridRooms(Playground):
@@ -27,6 +29,9 @@ class GridRooms(Playground):
         wall_type='classic',
         wall_depth: float = 10,
         playground_seed: Optional[int] = None,
+        merge_walls: bool = False,
+        seed: Optional[int] = None,
+        physics: Union[str, PhysicsParameters] = 'default',
         **wall_params,
     ):
         """
@@ -38,6 +43,11 @@ class GridRooms(Playground):
             doorstep_type:
             wall_type:
             wall_texture_seed:
+            merge_walls: If True, the wall pieces of all rooms are merged
+                and added as a single WallLayout element, which is much faster for large layouts.
+                By default, each piece is a Wall element.
+            seed: Seed of the random generator of the Playground.
+            physics: Name of a physics preset, or PhysicsParameters.
             **wall_params:
 
 
@@ -52,7 +62,7 @@ class GridRooms(Playground):
                and isinstance(room_layout[0], int)\
                and isinstance(room_layout[1], int)
 
-        super().__init__(size=size)
+        super().__init__(size=size, seed=seed, physics=physics)
 
         self._size_door = (wall_depth, doorstep_size)
 
@@ -66,6 +76,7 @@ class GridRooms(Playground):
         }
         self._wall_texture_params = wall_params
         self._wall_depth = wall_depth
+        self._merge_walls = merge_walls
 
         # Set random texture for possible replication
 
@@ -93,6 +104,7 @@ class GridRooms(Playground):
         size_room = width_room, length_room
 
         rooms: List[List[RectangleRoom]] = []
+        wall_pieces = []
 
         doorstep_down: Optional[Doorstep]
         doorstep_up: Optional[Doorstep]
@@ -184,13 +196,28 @@ class GridRooms(Playground):
                     wall_texture_params=self._wall_texture_params,
                 )
 
-                for wall in room.generate_walls():
-                    self.add_element(wall)
+                if self._merge_walls:
+                    wall_pieces += list(room.generate_wall_pieces())
+
+                else:
+                    for wall in room.generate_walls():
+                        self.add_element(wall)
 
                 col_rooms.append(room)
 
             rooms.append(col_rooms)
 
+        if self._merge_walls:
+
+            # Gaps between collinear walls are closed, unless they are doorsteps
+            max_gap = 0.0
+            if doorstep_size > self._wall_depth:
+                max_gap = self._wall_depth
+
+            walls = merge_wall_pieces(wall_pieces, self._wall_depth, max_gap)
+            self.add_element(
+                WallLayout(walls, self.size, texture=self._wall_texture_params))
+
         return rooms
 
 
@@ -204,6 +231,9 @@ class SingleRoom(GridRooms):
         wall_type='classic',
         wall_depth=10,
         playground_seed: Union[int, None] = None,
+        merge_walls: bool = False,
+        seed: Optional[int] = None,
+        physics: Union[str, PhysicsParameters] = 'default',
         **wall_params,
     ):
 
@@ -213,6 +243,9 @@ class SingleRoom(GridRooms):
                          doorstep_size=0,
                          wall_depth=wall_depth,
                          playground_seed=playground_seed,
+                         merge_walls=merge_walls,
+                         seed=seed,
+                         physics=physics,
                          **wall_params)
 
     def _compute_doorsteps(self):
@@ -232,6 +265,9 @@ class LineRooms(GridRooms):
         wall_type='classic',
         wall_depth=10,
         playground_seed=None,
+        merge_walls: bool = False,
+        seed: Optional[int] = None,
+        physics: Union[str, PhysicsParameters] = 'default',
         **wall_params,
     ):
 
@@ -242,4 +278,7 @@ class LineRooms(GridRooms):
                          wall_depth=wall_depth,
                          playground_seed=playground_seed,
                          random_doorstep_position=random_doorstep_position,
+                         merge_walls=merge_walls,
+                         seed=seed,
+                         physics=physics,
                          **wall_params)
@@ -10,23 +10,31 @@ Examples can be found in :
     - simple_playgrounds/playgrounds/collection
 """
 
-from typing import Tuple, Union, List, Dict, Optional, Type
+from typing import Tuple, Union, List, Dict, Optional, Type, FrozenSet
 
 from abc import ABC
+import copy
+import math
+
+import numpy as np
 import pymunk
 
-from ..common.definitions import SPACE_DAMPING, CollisionTypes
+from ..common.definitions import SPACE_DAMPING, CollisionTypes, SIMULATION_STEPS, \
+    PhysicsParameters, PHYSICS_PRESETS, ADAPTIVE_MAX_DISPLACEMENT
 
 from ..agents.agent import Agent
 from ..agents.parts.parts import Part
 from ..agents.parts.actuators import Actuator, Grasp, Activate
+from ..agents.parts.controllers import RandomPopulation
 from ..common.entity import Entity
 from ..elements.element import SceneElement, InteractiveElement, TeleportElement, GemElement
 from ..elements.field import Field
 from ..elements.collection.activable import Dispenser
+from ..elements.pool import ElementPool
 from ..common.position_utils import InitCoord
+from .registry import ElementRegistry
 
-from ..common.timer import Timer
+from ..common.timer import Timer, TimerScheduler
 
 # pylint: disable=unused-argument
 # pylint: disable=line-too-long
@@ -39,12 +47,13 @@ class Playground(ABC):
 
     Attributes:
         size: size of the scene (width, length).
-        elements: list of SceneElements present in the Playground.
+        elements: registry of SceneElements present in the Playground.
         fields: list of fields producing SceneElements in the Playground.
         agents: list of Agents present in the Playground.
         initial_agent_coordinates: position or PositionAreaSampler,
             Starting position of an agent (single agent).
         done: bool, True if the playground reached termination.
+        rng: random generator shared by the Agents, SceneElements and Fields of the Playground.
 
     Notes:
           In the case of multi-agent setting, individual initial positions can be defined when
@@ -59,7 +68,24 @@ class Playground(ABC):
     def __init__(
         self,
         size: Tuple[int, int],
+        seed: Optional[int] = None,
+        physics: Union[str, PhysicsParameters] = 'default',
     ):
+        """
+        Args:
+            size: size of the scene (width, length).
+            seed: Seed of the random generator of the Playground.
+            physics: Name of a physics preset ('fast', 'default', 'accurate' or 'adaptive'),
+                or PhysicsParameters.
+        """
+
+        # Random events of the Playground are drawn from a single generator
+        self.rng = np.random.default_rng(seed)
+
+        # Sensors, controllers and populations draw from their own generators,
+        # spawned from the seed of the Playground
+        self._seed_sequence = np.random.SeedSequence(seed)
+        self._populations: List[RandomPopulation] = []
 
         # Generate Scene
         assert isinstance(size, (tuple, list))
@@ -71,18 +97,31 @@ class Playground(ABC):
         # Initialization of the pymunk space, modelling all the physics
         self.space = self._initialize_space()
 
+        self.physics: PhysicsParameters = PHYSICS_PRESETS['default']
+        self.set_physics(physics)
+
+        # Smallest collision shape, used to choose the number of substeps in adaptive mode
+        self._min_shape_size: Optional[float] = None
+
         # Public attributes for entities in the playground
-        self.elements: List[SceneElement] = []
-        self.fields: List[Field] = []
+        self.elements: ElementRegistry = ElementRegistry()
         self.agents: List[Agent] = []
 
         # Private attributes for managing interactions in playground
-        self._disappeared_scene_elements: List[SceneElement] = []
+        self._disappeared_scene_elements: Dict[SceneElement, None] = {}
         self._grasped_elements: Dict[SceneElement, Actuator] = {}
         self._teleported: List[Tuple[Agent, SceneElement]] = []
 
+        # Recycles temporary elements produced by Fields and Dispensers
+        self._element_pool = ElementPool()
+
+        # Pymunk objects added or removed during a physics step, applied in order after the step
+        self._in_physics_step = False
+        self._space_changes: List[Tuple[bool, Tuple]] = []
+
         # Timers to handle periodic events
         self._timers: Dict[Timer, InteractiveElement] = {}
+        self.timer_scheduler = TimerScheduler()
 
         self.done = False
         self.initial_agent_coordinates: Optional[InitCoord] = None
@@ -90,6 +129,12 @@ class Playground(ABC):
         self._handle_interactions()
         self.sensor_collision_index = 2
 
+        # Sensors with the same invisible elements share a collision index
+        self._sensor_collision_indices: Dict[FrozenSet[Entity], int] = {}
+
+        # Ray collisions of the current step, shared by sensors with the same rays
+        self.ray_cache: Dict[Tuple, Dict[float, Optional[pymunk.SegmentQueryInfo]]] = {}
+
     @staticmethod
     def _initialize_space() -> pymunk.Space:
         """ Method to initialize Pymunk empty space for 2D physics.
@@ -103,33 +148,188 @@ class Playground(ABC):
 
         return space
 
-    def update(self, steps: int):
+    @property
+    def fields(self) -> List[Field]:
+        """ Fields producing SceneElements in the Playground."""
+        return self.elements.fields
+
+    def set_physics(self, physics: Union[str, PhysicsParameters]):
+        """
+        Sets the parameters of the physics engine.
+
+        Args:
+            physics: Name of a physics preset ('fast', 'default', 'accurate' or 'adaptive'),
+                or PhysicsParameters.
+
+        """
+
+        if isinstance(physics, str):
+
+            if physics not in PHYSICS_PRESETS:
+                raise ValueError('Unknown physics preset {}'.format(physics))
+
+            physics = PHYSICS_PRESETS[physics]
+
+        if not 1 <= physics.substeps <= physics.max_substeps:
+            raise ValueError('substeps must be between 1 and max_substeps')
+
+        self.physics = physics
+        self.space.iterations = physics.iterations
+        self.space.collision_slop = physics.collision_slop
+
+        # Idle bodies fall asleep and are not integrated until something wakes them up
+        self.space.sleep_time_threshold = physics.sleep_time_threshold
+        self.space.idle_speed_threshold = physics.idle_speed_threshold
+
+    def _compute_substeps(self) -> int:
+        """
+        Number of physics steps for the next update.
+        In adaptive mode, the fastest body must not move by more than a fraction
+        of the smallest shape during one substep.
+        """
+
+        if not self.physics.adaptive:
+            return self.physics.substeps
+
+        if self._min_shape_size is None:
+
+            sizes = [
+                min(shape.bb.right - shape.bb.left, shape.bb.top - shape.bb.bottom)
+                for shape in self.space.shapes if not shape.sensor
+            ]
+            self._min_shape_size = max(min(sizes, default=1), 1)
+
+        max_speed = max((body.velocity.length for body in self.space.bodies), default=0)
+
+        substeps = math.ceil(max_speed / (ADAPTIVE_MAX_DISPLACEMENT * self._min_shape_size))
+
+        return min(max(substeps, self.physics.substeps), self.physics.max_substeps)
+
+    def _scale_agent_forces(self, factor: float):
+
+        for agent in self.agents:
+            for part in agent.parts:
+
+                # Setting forces wakes sleeping bodies up
+                if part.pm_body.force != (0, 0) or part.pm_body.torque != 0:
+                    part.pm_body.force = part.pm_body.force * factor
+                    part.pm_body.torque *= factor
+
+    def update(self, steps: Optional[int] = None):
         """ Update the Playground
 
         Update all SceneElements, Fields, Timers and Grasps
         Runs the Physics engine for n steps.
 
         Args:
-            steps: Number of steps
+            steps: Number of steps. If None, the number of steps is set by the physics parameters.
+
+        Note:
+            Pymunk only applies forces during the first step.
+            Forces of the agents are scaled by the number of steps,
+            so that agents move alike with all physics parameters.
 
         """
 
+        if steps is None:
+            steps = self._compute_substeps()
+
+        if steps != SIMULATION_STEPS:
+            self._scale_agent_forces(steps / SIMULATION_STEPS)
+
         for agent in self.agents:
             agent.pre_step()
 
-        for elem in self.elements:
+        for elem in self.elements.active:
             elem.pre_step()
-            if elem.trajectory:
-                self.space.reindex_shapes_for_body(elem.pm_body)
 
+        self._move_along_trajectories()
+
+        self._in_physics_step = True
         for _ in range(steps):
             self.space.step(1. / steps)
+        self._in_physics_step = False
+
+        self.ray_cache.clear()
+
+        self._element_pool.recycle()
 
         self._fields_produce()
         self._update_timers()
         self._release_grasps()
         self._check_teleports()
 
+    def idle_steps(self, max_steps: int) -> int:
+        """
+        Number of upcoming updates, up to max_steps, where nothing in the Playground can change
+        if the agents don't act.
+
+        The Playground is idle when all dynamic bodies are asleep,
+        no element follows a trajectory and no element is grasped.
+        Idle updates end before the next Timer is due or the next Field produces.
+
+        Args:
+            max_steps: Maximum number of updates to look ahead.
+
+        Returns:
+            Number of idle updates, 0 if the Playground is not idle.
+
+        """
+
+        if self.done or max_steps < 1:
+            return 0
+
+        if self.elements.trajectories or self._grasped_elements:
+            return 0
+
+        if not all(body.is_sleeping for body in self.space.bodies
+                   if body.body_type == pymunk.Body.DYNAMIC):
+            return 0
+
+        next_event = self.timer_scheduler.next_event_step()
+        if next_event is not None:
+            max_steps = min(max_steps, next_event - self.timer_scheduler.current_step - 1)
+
+        max_steps = max(max_steps, 0)
+
+        # Fields draw in turn at each update, possibly from the same generator
+        for rng, fields in self._drawing_fields():
+
+            state = rng.bit_generator.state
+            draws = rng.random((max_steps, len(fields)))
+            rng.bit_generator.state = state
+
+            probabilities = np.array([field.probability for field in fields])
+            productions = np.flatnonzero((draws < probabilities).any(axis=1))
+
+            if productions.size:
+                max_steps = int(productions[0])
+
+        return max_steps
+
+    def skip(self, n_steps: int):
+        """
+        Advances the Playground by n_steps idle updates, without running the physics.
+
+        Args:
+            n_steps: Number of updates to skip. Must not exceed idle_steps(n_steps).
+
+        """
+
+        if self.idle_steps(n_steps) < n_steps:
+            raise ValueError('Playground is not idle for {} steps'.format(n_steps))
+
+        for agent in self.agents:
+            agent.pre_step()
+
+        for elem in self.elements.active:
+            elem.pre_step()
+
+        for rng, fields in self._drawing_fields():
+            rng.random(n_steps * len(fields))
+
+        self.timer_scheduler.skip(n_steps)
+
     def reset(self):
         """
         Reset the Playground to its initial state.
@@ -149,6 +349,8 @@ class Playground(ABC):
             self._add_element_to_playground(element)
             self._move_to_initial_position(element)
 
+        self._element_pool.recycle()
+
         # reset fields
         for field in self.fields:
             field.reset()
@@ -164,8 +366,125 @@ class Playground(ABC):
 
         self._teleported = []
 
+        self._reindex_space()
+        self.ray_cache.clear()
+
         self.done = False
 
+    def _add_to_space(self, *pm_elements):
+        """
+        Adds pymunk objects to the space.
+        During a physics step, pymunk defers additions in a set, which doesn't preserve their order.
+        Instead, they are added after the step in the order of the calls, to keep episodes reproducible.
+        """
+
+        self.ray_cache.clear()
+        self._min_shape_size = None
+
+        if not self._in_physics_step:
+            self.space.add(*pm_elements)
+            return
+
+        self._space_changes.append((True, pm_elements))
+        self.space.add_post_step_callback(self._apply_space_changes, 'space_changes')
+
+    def _remove_from_space(self, *pm_elements):
+        """ Removes pymunk objects from the space. See _add_to_space."""
+
+        self.ray_cache.clear()
+        self._min_shape_size = None
+
+        if not self._in_physics_step:
+            self.space.remove(*pm_elements)
+            return
+
+        self._space_changes.append((False, pm_elements))
+        self.space.add_post_step_callback(self._apply_space_changes, 'space_changes')
+
+    def _apply_space_changes(self, space: pymunk.Space, _key):
+
+        for add, pm_elements in self._space_changes:
+            if add:
+                space.add(*pm_elements)
+            else:
+                space.remove(*pm_elements)
+
+        self._space_changes = []
+
+    def _reindex_space(self):
+        """
+        Removes and adds back all pymunk bodies, shapes and constraints, in the order of the Playground.
+        The spatial index and the contacts cached by pymunk then only depend on the current positions,
+        so that resets with the same seed lead to identical episodes.
+        """
+
+        entities = list(self.elements)
+        for agent in self.agents:
+            entities += agent.parts
+
+        for entity in entities:
+            self.space.remove(*entity.pm_elements)
+
+        for entity in entities:
+            self.space.add(*entity.pm_elements)
+
+    def clone(self) -> 'Playground':
+        """
+        Returns an independent copy of the Playground, with its Agents, SceneElements and Timers.
+        The copy can be stepped without affecting the original Playground,
+        which makes it possible to branch rollouts from the current state.
+
+        Note:
+            Textures and masks are shared between the Playground and its copy.
+            The pymunk space is copied with its bodies and shapes.
+
+        Returns: Playground
+
+        """
+        return copy.deepcopy(self)
+
+    def seed(self, seed: Optional[int] = None):
+        """
+        Reseeds the random generator of the Playground.
+        The generator is reseeded in place, as it is shared with Agents, SceneElements and Fields.
+        The generators of the sensors, controllers and populations are reseeded from the same seed.
+
+        Args:
+            seed: Seed of the random generator.
+
+        """
+        self.rng.bit_generator.state = np.random.default_rng(seed).bit_generator.state
+
+        self._seed_sequence = np.random.SeedSequence(seed)
+        for agent in self.agents:
+            self._seed_agent(agent)
+
+        for population in self._populations:
+            population.seed(self._seed_sequence.spawn(1)[0])
+
+    def _seed_agent(self, agent: Agent):
+
+        *sensor_seeds, controller_seed = self._seed_sequence.spawn(len(agent.sensors) + 1)
+
+        for sensor, sensor_seed in zip(agent.sensors, sensor_seeds):
+            sensor.seed(sensor_seed)
+
+        if agent.controller is not None:
+            agent.controller.seed(controller_seed)
+
+    def add_population(self, population: RandomPopulation):
+        """
+        Seeds a RandomPopulation from the seed of the Playground,
+        and reseeds it whenever the Playground is reseeded.
+
+        Args:
+            population: RandomPopulation controlling agents of the Playground.
+
+        """
+
+        self._populations.append(population)
+        population.seed(self._seed_sequence.spawn(1)[0])
+
     def add_agent(
         self,
         agent: Agent,
@@ -218,20 +537,19 @@ class Playground(ABC):
 
         agent.reset()
         for part in agent.parts:
-            self.space.remove(*part.pm_elements)
+            self._remove_from_space(*part.pm_elements)
 
         self.agents.remove(agent)
+        self.elements.remove_agent(agent)
         assert not agent.in_playground
 
     def add_field(self, field: Field):
 
         assert isinstance(field, Field)
 
-        # If already there
-        if field in self.fields:
-            raise ValueError('Field already in Playground')
-
-        self.fields.append(field)
+        self.elements.add_field(field)
+        field.element_pool = self._element_pool
+        field.rng = self.rng
 
     def add_element(
         self,
@@ -278,23 +596,38 @@ class Playground(ABC):
         assert element in self.elements
 
         self._timers[timer] = element
+        self.timer_scheduler.add(timer)
 
     # Private methods for Agents
 
     def _add_agent_to_playground(self, agent: Agent):
 
         self.agents.append(agent)
+        self.elements.add_agent(agent)
         agent.in_a_playground = True
 
+        agent.rng = self.rng
+        for actuator in agent.actuators:
+            actuator.rng = self.rng
+
+        self._seed_agent(agent)
+
         for body_part in agent.parts:
-            self.space.add(*body_part.pm_elements)
+            self._add_to_space(*body_part.pm_elements)
 
     def _set_sensor_filters(self, agent: Agent):
 
         # Set the invisible element filters
         for sensor in agent.sensors:
 
-            if sensor.apply_shape_filter(self.sensor_collision_index):
+            invisible_elements = frozenset(sensor.invisible_elements)
+            shared_index = self._sensor_collision_indices.get(invisible_elements)
+
+            if shared_index is not None:
+                sensor.apply_shape_filter(shared_index, assign_elements=False)
+
+            elif sensor.apply_shape_filter(self.sensor_collision_index):
+                self._sensor_collision_indices[invisible_elements] = self.sensor_collision_index
                 self.sensor_collision_index += 1
 
                 if self.sensor_collision_index == 32:
@@ -312,11 +645,15 @@ class Playground(ABC):
         if element in self.elements:
             raise ValueError('Scene element already in Playground')
 
-        if element in self._disappeared_scene_elements:
-            self._disappeared_scene_elements.remove(element)
+        self._disappeared_scene_elements.pop(element, None)
+
+        self._add_to_space(*element.pm_elements)
+        self.elements.add(element)
 
-        self.space.add(*element.pm_elements)
-        self.elements.append(element)
+        element.rng = self.rng
+
+        if isinstance(element, Dispenser):
+            element.element_pool = self._element_pool
 
     # Private methods for Agents and Elements
 
@@ -356,27 +693,19 @@ class Playground(ABC):
 
         assert element in self.elements
 
-        self.space.remove(*element.pm_elements)
+        self._remove_from_space(*element.pm_elements)
+
+        # Also removes the element from the entities produced by its Field or Dispenser
         self.elements.remove(element)
 
         if not element.temporary:
-            self._disappeared_scene_elements.append(element)
-
-        dispensers = [
-            elem for elem in self.elements if isinstance(elem, Dispenser)
-        ]
-
-        for dispenser in dispensers:
-            if element in dispenser.produced_entities:
-                dispenser.produced_entities.remove(element)
-
-        for field in self.fields:
-            if element in field.produced_entities:
-                field.produced_entities.remove(element)
+            self._disappeared_scene_elements[element] = None
+        else:
+            self._element_pool.release(element)
 
         if element in self._grasped_elements.keys():
             body_part = self._grasped_elements[element]
-            self.space.remove(*body_part.grasped)
+            self._remove_from_space(*body_part.grasped)
             body_part.grasped = []
 
         return True
@@ -385,6 +714,7 @@ class Playground(ABC):
         self,
         elems_remove: Optional[List[SceneElement]],
         elems_add: Optional[List[Tuple[SceneElement, InitCoord]]],
+        source: Optional[InteractiveElement] = None,
     ):
 
         if elems_remove:
@@ -394,11 +724,61 @@ class Playground(ABC):
         if elems_add:
             for elem, coordinates in elems_add:
                 self._add_element_to_playground(elem)
+
+                if isinstance(source, Dispenser):
+                    self.elements.register_production(source, elem)
+
                 if coordinates:
+                    # Temporary elements can be reset when recycled
+                    if elem.temporary:
+                        elem.initial_coordinates = coordinates
                     elem.coordinates = coordinates
                 else:
                     self._move_to_initial_position(elem)
 
+    def _move_along_trajectories(self):
+        """
+        Sets the velocity of the kinematic bodies of the elements following a Trajectory,
+        so that they reach the next point of their trajectory at the end of the update.
+        """
+
+        elements = self.elements.trajectories
+
+        if not elements:
+            return
+
+        targets = np.empty((len(elements), 3))
+        current = np.empty((len(elements), 3))
+
+        for row, elem in enumerate(elements):
+            trajectory = elem.trajectory
+            targets[row] = trajectory.points[trajectory.current_index]
+            trajectory.advance()
+
+            current[row, :2] = elem.pm_body.position
+            current[row, 2] = elem.pm_body.angle
+
+        # An update of the playground lasts one unit of time
+        velocities = targets[:, :2] - current[:, :2]
+        angular_velocities = (targets[:, 2] - current[:, 2] + math.pi) % (2 * math.pi) - math.pi
+
+        for elem, velocity, angular_velocity in zip(elements,
+                                                   velocities.tolist(),
+                                                   angular_velocities.tolist()):
+            elem.pm_body.velocity = velocity
+            elem.pm_body.angular_velocity = angular_velocity
+
+    def _drawing_fields(self) -> List[Tuple[np.random.Generator, List[Field]]]:
+        """ Fields that draw at each update, grouped by random generator, in order of drawing. """
+
+        groups: Dict[int, Tuple[np.random.Generator, List[Field]]] = {}
+
+        for field in self.fields:
+            if not field.reached_limit:
+                groups.setdefault(id(field.rng), (field.rng, []))[1].append(field)
+
+        return list(groups.values())
+
     def _fields_produce(self):
 
         for field in self.fields:
@@ -406,15 +786,15 @@ class Playground(ABC):
             if field.can_produce():
                 element, position = field.produce()
                 self.add_element(element, position)
+                self.elements.register_production(field, element)
 
     def _update_timers(self):
 
-        for timer, element in self._timers.items():
+        for timer in self.timer_scheduler.step():
 
-            timer.step()
-            if timer.timer_done:
-                elems_remove, elems_add = element.activate(timer)
-                self._add_remove_within(elems_remove, elems_add)
+            element = self._timers[timer]
+            elems_remove, elems_add = element.activate(timer)
+            self._add_remove_within(elems_remove, elems_add, element)
 
     def _release_grasps(self):
 
@@ -491,16 +871,11 @@ class Playground(ABC):
         self,
         pm_shape: pymunk.Shape,
     ) -> Optional[SceneElement]:
-        return next(
-            iter([e for e in self.elements if pm_shape in e.pm_elements]),
-            None)
+        return self.elements.element_from_shape(pm_shape)
 
     def _get_agent_from_shape(self,
                               pm_shape: pymunk.Shape) -> Union[None, Agent]:
-        for agent in self.agents:
-            if agent.owns_shape(pm_shape):
-                return agent
-        return None
+        return self.elements.agent_from_shape(pm_shape)
 
     def _get_agent_from_part(self, part: Part) -> Optional[Agent]:
         for agent in self.agents:
@@ -516,13 +891,7 @@ class Playground(ABC):
         if element:
             return element
 
-        for agent in self.agents:
-
-            part = agent.get_part_from_shape(pm_shape)
-            if part is not None:
-                return part
-
-        return None
+        return self.elements.part_from_shape(pm_shape)
 
     def _get_closest_agent(self, element: SceneElement) -> Agent:
         return min(self.agents,
@@ -543,7 +912,7 @@ class Playground(ABC):
         agent.reward += touched_element.reward
 
         elems_remove, elems_add = touched_element.activate(agent)
-        self._add_remove_within(elems_remove, elems_add)
+        self._add_remove_within(elems_remove, elems_add, touched_element)
 
         if touched_element.terminate_upon_activation:
             self.done = True
@@ -553,7 +922,7 @@ class Playground(ABC):
     def _agent_activates_element(self, arbiter, space, data):
 
         agent: Agent = self._get_agent_from_shape(arbiter.shapes[0])
-        part: Part = agent.get_part_from_shape(arbiter.shapes[0])
+        part: Part = self.elements.part_from_shape(arbiter.shapes[0])
         activable_element = self._get_element_from_shape(arbiter.shapes[1])
 
         if not activable_element:
@@ -570,7 +939,7 @@ class Playground(ABC):
                     agent.reward += activable_element.reward
 
                     elems_remove, elems_add = activable_element.activate(agent)
-                    self._add_remove_within(elems_remove, elems_add)
+                    self._add_remove_within(elems_remove, elems_add, activable_element)
 
                     if activable_element.terminate_upon_activation:
                         self.done = True
@@ -582,7 +951,7 @@ class Playground(ABC):
     def _agent_grasps_element(self, arbiter, space, data):
 
         agent: Agent = self._get_agent_from_shape(arbiter.shapes[0])
-        part: Part = agent.get_part_from_shape(arbiter.shapes[0])
+        part: Part = self.elements.part_from_shape(arbiter.shapes[0])
         grasped_element = self._get_element_from_shape(arbiter.shapes[1])
 
         if not grasped_element:
@@ -608,7 +977,7 @@ class Playground(ABC):
                     j_4 = pymunk.PinJoint(part.pm_body, grasped_element.pm_body,
                                           (0, -20), (0, 0))
 
-                    self.space.add(j_1, j_2, j_3, j_4)
+                    self._add_to_space(j_1, j_2, j_3, j_4)
                     actuator.grasped = [j_1, j_2, j_3, j_4]
 
                     self._grasped_elements[grasped_element] = actuator
@@ -630,7 +999,7 @@ class Playground(ABC):
         assert isinstance(gem, GemElement)
 
         elems_remove, elems_add = activable_element.activate(gem)
-        self._add_remove_within(elems_remove, elems_add)
+        self._add_remove_within(elems_remove, elems_add, activable_element)
 
         if activable_element.activated:
             agent.reward += activable_element.reward
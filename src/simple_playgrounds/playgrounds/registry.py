@@ -0,0 +1,291 @@
+""" Contains the ElementRegistry, used by Playgrounds to index their entities.
+
+The registry replaces the plain list of SceneElements of a Playground.
+It provides constant-time membership tests, insertion and removal,
+buckets of elements grouped by category (dispensers, interactive, movable, background, trajectories, active),
+reverse maps from pymunk shapes to the entities that own them,
+reverse maps from produced elements to the Field or Dispenser that produced them,
+and stable integer ids for entities and entity types.
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Union, Iterator, KeysView, Tuple, TYPE_CHECKING
+
+import pymunk
+
+from ..elements.element import SceneElement, InteractiveElement
+from ..elements.field import Field
+from ..elements.collection.activable import Dispenser
+
+if TYPE_CHECKING:
+    from ..common.entity import Entity
+    from ..agents.agent import Agent
+    from ..agents.parts.parts import Part
+
+Producer = Union[Field, Dispenser]
+
+
+class ElementRegistry:
+    """ Indexes the SceneElements, Fields and Agent Parts of a Playground.
+
+    The registry behaves like an ordered collection of SceneElements:
+    it can be iterated over, and supports len() and membership tests.
+
+    Attributes:
+        fields: list of Fields of the Playground.
+        entities_by_id: lookup table from entity ids to entities.
+        types_by_id: lookup table from type ids to entity classes.
+
+    Notes:
+        Iteration follows the order in which elements were added.
+        Ids are assigned the first time an entity or class is registered, and are never reused.
+        An element removed and added again keeps its id.
+    """
+
+    def __init__(self):
+
+        self._elements: Dict[SceneElement, None] = {}
+
+        # Buckets of elements, grouped by category
+        self._dispensers: Dict[Dispenser, None] = {}
+        self._interactive: Dict[InteractiveElement, None] = {}
+        self._movable: Dict[SceneElement, None] = {}
+        self._background: Dict[SceneElement, None] = {}
+        self._trajectories: Dict[SceneElement, None] = {}
+        self._active: Dict[SceneElement, None] = {}
+
+        self._buckets: Tuple[Dict, ...] = (self._dispensers, self._interactive, self._movable,
+                                           self._background, self._trajectories, self._active)
+
+        self.fields: List[Field] = []
+
+        # Reverse maps
+        self._element_shapes: Dict[pymunk.Shape, SceneElement] = {}
+        self._part_shapes: Dict[pymunk.Shape, Tuple[Agent, Part]] = {}
+        self._producers: Dict[SceneElement, Producer] = {}
+
+        # Stable ids
+        self.entities_by_id: List[Entity] = []
+        self.types_by_id: List[type] = []
+        self._entity_ids: Dict[Entity, int] = {}
+        self._type_ids: Dict[type, int] = {}
+
+    # Collection interface
+
+    def __contains__(self, element) -> bool:
+        return element in self._elements
+
+    def __iter__(self) -> Iterator[SceneElement]:
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def copy(self) -> List[SceneElement]:
+        """ Returns a list of the elements, safe to iterate over while the registry is modified."""
+        return list(self._elements)
+
+    # Buckets
+
+    @property
+    def dispensers(self) -> KeysView[Dispenser]:
+        return self._dispensers.keys()
+
+    @property
+    def interactive(self) -> KeysView[InteractiveElement]:
+        return self._interactive.keys()
+
+    @property
+    def movable(self) -> KeysView[SceneElement]:
+        return self._movable.keys()
+
+    @property
+    def background(self) -> KeysView[SceneElement]:
+        return self._background.keys()
+
+    @property
+    def trajectories(self) -> KeysView[SceneElement]:
+        """ Elements following a Trajectory."""
+        return self._trajectories.keys()
+
+    @property
+    def active(self) -> KeysView[SceneElement]:
+        """ Elements that need to be prepared at each step: interactive elements and elements drawn at each frame."""
+        return self._active.keys()
+
+    # Elements
+
+    def add(self, element: SceneElement):
+        """
+        Registers a SceneElement and the pymunk shapes it owns.
+
+        Args:
+            element: SceneElement to register.
+
+        """
+
+        if element in self._elements:
+            raise ValueError('Scene element already in registry')
+
+        self._elements[element] = None
+        self.entity_id(element)
+        self.type_id(element)
+
+        if isinstance(element, Dispenser):
+            self._dispensers[element] = None
+
+        if isinstance(element, InteractiveElement):
+            self._interactive[element] = None
+
+        if element.movable:
+            self._movable[element] = None
+
+        if element.background:
+            self._background[element] = None
+
+        if element.trajectory:
+            self._trajectories[element] = None
+
+        if not element.background or isinstance(element, InteractiveElement):
+            self._active[element] = None
+
+        for pm_elem in element.pm_elements:
+            if isinstance(pm_elem, pymunk.Shape):
+                self._element_shapes[pm_elem] = element
+
+    def remove(self, element: SceneElement) -> Optional[Producer]:
+        """
+        Unregisters a SceneElement.
+        If the element was produced by a Field or a Dispenser, it is removed from its produced entities.
+
+        Args:
+            element: SceneElement to unregister.
+
+        Returns: The producer of the element, if any.
+
+        """
+
+        del self._elements[element]
+
+        for bucket in self._buckets:
+            if element in bucket:
+                del bucket[element]
+
+        for pm_elem in element.pm_elements:
+            if isinstance(pm_elem, pymunk.Shape):
+                self._element_shapes.pop(pm_elem, None)
+
+        producer = self._producers.pop(element, None)
+        if producer is not None and element in producer.produced_entities:
+            del producer.produced_entities[element]
+
+        return producer
+
+    def element_from_shape(self, pm_shape: pymunk.Shape) -> Optional[SceneElement]:
+        return self._element_shapes.get(pm_shape)
+
+    # Fields and produced elements
+
+    def add_field(self, field: Field):
+
+        if field in self.fields:
+            raise ValueError('Field already in Playground')
+
+        self.fields.append(field)
+
+    def register_production(self, producer: Producer, element: SceneElement):
+        """
+        Keeps track of the Field or Dispenser that produced an element.
+
+        Args:
+            producer: Field or Dispenser.
+            element: SceneElement produced.
+
+        """
+        self._producers[element] = producer
+
+    def producer_of(self, element: SceneElement) -> Optional[Producer]:
+        return self._producers.get(element)
+
+    # Agents
+
+    def add_agent(self, agent: Agent):
+        """ Registers the shapes of the parts of an agent."""
+
+        for part in agent.parts:
+            self.entity_id(part)
+            self.type_id(part)
+
+            for pm_elem in part.pm_elements:
+                if isinstance(pm_elem, pymunk.Shape):
+                    self._part_shapes[pm_elem] = agent, part
+
+    def remove_agent(self, agent: Agent):
+
+        for part in agent.parts:
+            for pm_elem in part.pm_elements:
+                if isinstance(pm_elem, pymunk.Shape):
+                    self._part_shapes.pop(pm_elem, None)
+
+    def agent_from_shape(self, pm_shape: pymunk.Shape) -> Optional[Agent]:
+
+        agent_part = self._part_shapes.get(pm_shape)
+        if agent_part is None:
+            return None
+        return agent_part[0]
+
+    def part_from_shape(self, pm_shape: pymunk.Shape) -> Optional[Part]:
+
+        agent_part = self._part_shapes.get(pm_shape)
+        if agent_part is None:
+            return None
+        return agent_part[1]
+
+    # Ids
+
+    def entity_id(self, entity: Entity) -> int:
+        """
+        Returns the id of an entity, assigning a new one the first time the entity is seen.
+
+        Args:
+            entity: SceneElement or Part.
+
+        Returns: Index of the entity in entities_by_id.
+
+        """
+
+        entity_id = self._entity_ids.get(entity)
+
+        if entity_id is None:
+            entity_id = len(self.entities_by_id)
+            self._entity_ids[entity] = entity_id
+            self.entities_by_id.append(entity)
+
+        return entity_id
+
+    def type_id(self, entity: Entity) -> int:
+        """
+        Returns the id of the class of an entity, assigning a new one the first time the class is seen.
+
+        Args:
+            entity: SceneElement or Part.
+
+        Returns: Index of the class in types_by_id.
+
+        """
+
+        entity_type = type(entity)
+        type_id = self._type_ids.get(entity_type)
+
+        if type_id is None:
+            type_id = len(self.types_by_id)
+            self._type_ids[entity_type] = type_id
+            self.types_by_id.append(entity_type)
+
+        return type_id
+
+    def entity_from_id(self, entity_id: int) -> Optional[Entity]:
+        """ Returns the entity with this id, or None for invalid ids (e.g. -1)."""
+
+        if 0 <= entity_id < len(self.entities_by_id):
+            return self.entities_by_id[entity_id]
+        return None
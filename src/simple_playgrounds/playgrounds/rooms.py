@@ -9,6 +9,116 @@ from ..elements.element import SceneElement
 import numpy as np
 
 
+# Tolerance used to compare wall coordinates
+_EPSILON = 1e-3
+
+Rectangle = Tuple[float, float, float, float]
+
+
+def merge_wall_pieces(
+    pieces: List[Tuple[pymunk.Vec2d, pymunk.Vec2d]],
+    wall_depth: float,
+    max_gap: float = 0,
+) -> List[List[Tuple[float, float]]]:
+    """
+    Merges wall pieces into a smaller number of walls.
+
+    Axis-aligned pieces are converted to rectangles.
+    Rectangles are merged when they have the same extent along one axis,
+    and touch or overlap along the other axis.
+    This merges the walls shared by adjacent rooms, and the pieces that follow each other.
+    Collinear rectangles separated by a gap smaller than max_gap are also merged.
+    Other pieces are kept as they are.
+
+    Args:
+        pieces: start and end points of each wall piece.
+        wall_depth: depth of the walls.
+        max_gap: gaps larger than max_gap (e.g. doorsteps) are preserved.
+
+    Returns: list of walls, each described by the vertices of its polygon.
+
+    """
+
+    rectangles: List[Rectangle] = []
+    walls: List[List[Tuple[float, float]]] = []
+
+    for start, end in pieces:
+
+        start, end = pymunk.Vec2d(*start), pymunk.Vec2d(*end)
+        direction = (end - start).normalized()
+        normal = direction.perpendicular() * wall_depth / 2
+
+        if abs(direction.x) < _EPSILON or abs(direction.y) < _EPSILON:
+            corners = [start + normal, end - normal]
+            rectangles.append((min(pt.x for pt in corners), max(pt.x for pt in corners),
+                               min(pt.y for pt in corners), max(pt.y for pt in corners)))
+
+        else:
+            corners = [start + normal, end + normal, end - normal, start - normal]
+            walls.append([(pt.x, pt.y) for pt in corners])
+
+    n_rectangles = None
+
+    while n_rectangles != len(rectangles):
+
+        n_rectangles = len(rectangles)
+
+        for gap in (0, max_gap):
+            rectangles = _merge_rectangles(rectangles, axis=0, gap=gap)
+            rectangles = _merge_rectangles(rectangles, axis=1, gap=gap)
+
+    for x_min, x_max, y_min, y_max in rectangles:
+        walls.append([(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)])
+
+    return walls
+
+
+def _merge_rectangles(rectangles: List[Rectangle], axis: int, gap: float) -> List[Rectangle]:
+    """
+    Merges rectangles along an axis (0 for x, 1 for y).
+    Rectangles are grouped by their extent on the other axis,
+    then sorted and swept along the axis.
+    """
+
+    groups: Dict[Tuple[int, int], List[Rectangle]] = {}
+
+    for rect in rectangles:
+        other_min, other_max = rect[2 - 2 * axis], rect[3 - 2 * axis]
+        key = round(other_min / _EPSILON), round(other_max / _EPSILON)
+        groups.setdefault(key, []).append(rect)
+
+    merged: List[Rectangle] = []
+
+    for group in groups.values():
+
+        group.sort(key=lambda rect: rect[2 * axis])
+
+        other_min, other_max = group[0][2 - 2 * axis], group[0][3 - 2 * axis]
+        start, end = group[0][2 * axis], group[0][2 * axis + 1]
+
+        for rect in group[1:]:
+
+            if rect[2 * axis] - end <= gap + _EPSILON:
+                end = max(end, rect[2 * axis + 1])
+
+            else:
+                merged.append(_rectangle(start, end, other_min, other_max, axis))
+                start, end = rect[2 * axis], rect[2 * axis + 1]
+
+        merged.append(_rectangle(start, end, other_min, other_max, axis))
+
+    return merged
+
+
+def _rectangle(start: float, end: float, other_min: float, other_max: float, axis: int) -> Rectangle:
+    """ Builds a rectangle from its extent along an axis and along the other axis."""
+
+    if axis == 0:
+        return start, end, other_min, other_max
+
+    return other_min, other_max, start, end
+
+
 class Doorstep:
     def __init__(self,
                  position: float,
@@ -66,66 +176,57 @@ class RectangleRoom:
         else:
             self._rng = np.random.default_rng()
 
-    def generate_walls(self):
+    def generate_wall_pieces(self):
+        """ Yields the start and end points of each wall piece of the room."""
 
         # UP walls
         start = self.center + (-self.width / 2, -self.length / 2)
         end = self.center + (self.width / 2, -self.length / 2)
-        for wall in self._generate_wall(start, end, self.doorstep_up):
-            yield wall
+        yield from self._split_wall(start, end, self.doorstep_up)
 
         # DOWN WALLS
         start = self.center + (-self.width / 2, self.length / 2)
         end = self.center + (self.width / 2, self.length / 2)
-        for wall in self._generate_wall(start, end, self.doorstep_down):
-            yield wall
+        yield from self._split_wall(start, end, self.doorstep_down)
 
         # LEFT WALLS
         start = self.center + (-self.width / 2, -self.length / 2)
         end = self.center + (-self.width / 2, self.length / 2)
-        for wall in self._generate_wall(start, end, self.doorstep_left):
-            yield wall
+        yield from self._split_wall(start, end, self.doorstep_left)
 
         # RIGHT WALLS
         start = self.center + (self.width / 2, -self.length / 2)
         end = self.center + (self.width / 2, self.length / 2)
-        for wall in self._generate_wall(start, end, self.doorstep_right):
-            yield wall
+        yield from self._split_wall(start, end, self.doorstep_right)
 
-    def _generate_wall(self, start: pymunk.Vec2d, end: pymunk.Vec2d,
-                       doorstep: Doorstep):
+    def generate_walls(self):
+
+        for start, end in self.generate_wall_pieces():
+            yield Wall(start,
+                       end,
+                       wall_depth=self._wall_depth,
+                       texture=self._wall_texture_params)
+
+    @staticmethod
+    def _split_wall(start: pymunk.Vec2d, end: pymunk.Vec2d,
+                    doorstep: Doorstep):
 
         if doorstep:
             assert isinstance(doorstep, Doorstep)
 
             middle_left = start + (end - start).normalized() * (
                 doorstep.position - doorstep.size / 2)
-            wall = Wall(start,
-                        middle_left,
-                        wall_depth=self._wall_depth,
-                        texture=self._wall_texture_params)
-
-            yield wall
+            yield start, middle_left
 
             middle_right = start + (end - start).normalized() * (
                 doorstep.position + doorstep.size / 2)
-            wall = Wall(middle_right,
-                        end,
-                        wall_depth=self._wall_depth,
-                        texture=self._wall_texture_params)
-
-            yield wall
+            yield middle_right, end
 
             doorstep.start_point = middle_left
             doorstep.end_point = middle_right
 
         else:
-
-            wall = Wall(start,
-                        end,
-                        wall_depth=self._wall_depth,
-                        texture=self._wall_texture_params)
-            yield wall
+            yield start, end
 
     def get_partial_area(
         self,
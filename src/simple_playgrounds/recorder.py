@@ -0,0 +1,483 @@
+""" Contains EpisodeRecorder and ActionLog classes.
+
+EpisodeRecorder streams episodes of an Engine to disk, for offline learning.
+Actions, rewards, termination flags, agent body states and sensor values
+are appended step by step to chunked .npy files, opened as numpy memmaps.
+A JSON manifest describes the chunks of each stream.
+Only the current chunk of each stream is mapped in memory.
+
+ActionLog only records the seed and the actions of an episode.
+The episode is reconstructed with replay(), which renders frames
+or computes observations only for the requested steps.
+
+Typical Usage:
+    recorder = EpisodeRecorder('episodes/episode_0', chunk_size=1000)
+    engine = Engine(playground=my_playground, time_limit=10000, recorder=recorder)
+
+    while engine.game_on:
+        actions = engine.get_actions()
+        engine.step(actions)
+        engine.update_observations()
+
+    recorder.close()
+
+    episode = load_episode('episodes/episode_0')
+
+Replay Usage:
+    action_log = ActionLog(seed=0)
+    engine = Engine(playground=my_playground, time_limit=10000, recorder=action_log)
+    engine.reset(seed=action_log.seed)
+    ...
+    action_log.save('episode_0.npz')
+
+    # With an Engine built the same way
+    for elapsed_time, image in replay(engine, ActionLog.load('episode_0.npz'), steps=range(100, 200)):
+        ...
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Iterable, Iterator, Tuple, TYPE_CHECKING
+import json
+import os
+
+import numpy as np
+
+from .agents.parts.actuators import DiscreteActuator
+
+if TYPE_CHECKING:
+    from .engine import Engine
+    from .agents.agent import Agent
+    from .agents.parts.actuators import Actuator
+
+MANIFEST = 'manifest.json'
+
+
+class _Stream:
+    """
+    Append-only sequence of arrays of fixed shape and dtype,
+    stored in chunks of chunk_size rows.
+    The stream is created when the first value is appended.
+    """
+
+    def __init__(self, directory: str, name: str, chunk_size: int):
+
+        self.directory = directory
+        self.name = name
+        self.chunk_size = chunk_size
+
+        self.shape: Optional[tuple] = None
+        self.dtype: Optional[np.dtype] = None
+
+        self.chunks: List[str] = []
+        self.length = 0
+
+        self._memmap: Optional[np.memmap] = None
+
+    def append(self, value):
+
+        value = np.asarray(value)
+
+        if self.shape is None:
+            self.shape = value.shape
+            self.dtype = value.dtype
+
+        index = self.length % self.chunk_size
+
+        if index == 0:
+            self._open_chunk()
+
+        self._memmap[index] = value
+        self.length += 1
+
+    def _open_chunk(self):
+
+        self.flush()
+
+        filename = '{}_{:05d}.npy'.format(self.name.replace('/', '.'),
+                                          len(self.chunks))
+        self.chunks.append(filename)
+
+        self._memmap = np.lib.format.open_memmap(
+            os.path.join(self.directory, filename),
+            mode='w+',
+            dtype=self.dtype,
+            shape=(self.chunk_size,) + self.shape)
+
+    def flush(self):
+
+        if self._memmap is not None:
+            self._memmap.flush()
+
+    def close(self):
+
+        self.flush()
+        self._memmap = None
+
+    @property
+    def description(self) -> Dict:
+
+        shape = self.shape if self.shape is not None else ()
+
+        return {
+            'dtype': str(self.dtype),
+            'shape': list(shape),
+            'length': self.length,
+            'chunks': self.chunks
+        }
+
+
+class EpisodeRecorder:
+    """
+    Records the episode of an Engine into a directory.
+
+    At each step of the Engine, records:
+        - episode: index of the episode, incremented each time the engine is reset.
+        - elapsed_time: elapsed time of the engine.
+        - done: True if the engine terminated.
+        - <agent name>/actions: values of the actions, following the order of agent.actuators.
+        - <agent name>/reward: reward of the agent.
+        - <agent name>/state: position (x, y), angle, velocity (x, y) and angular velocity of the agent.
+
+    Each time the observations are updated, records:
+        - observation_episode: index of the episode.
+        - observation_time: elapsed time of the engine.
+        - <agent name>/<sensor name>: sensor values.
+
+    Attributes:
+        directory: Directory where the episode is written.
+        chunk_size: Number of steps in each chunk file.
+        episode: Index of the episode currently recorded.
+
+    Note:
+        Successive episodes of the engine are written to the same streams,
+        and are told apart by their episode index.
+        Only sensors whose values are numpy arrays can be recorded.
+        The manifest is rewritten each time a new chunk is opened, and when the recorder is closed.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 chunk_size: int = 1000,
+                 sensors: Optional[List[str]] = None,
+                 ):
+        """
+        Args:
+            directory: Directory where the episode is written. Created if it doesn't exist.
+            chunk_size: Number of steps in each chunk file.
+            sensors: Names of the sensors recorded. If None, all sensors with array values are recorded.
+        """
+
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self._sensors = sensors
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._streams: Dict[str, _Stream] = {}
+        self._n_chunks = 0
+
+        self.episode = 0
+        self._episode_recorded = False
+
+    def _append(self, name: str, value):
+
+        self._episode_recorded = True
+
+        stream = self._streams.get(name)
+
+        if stream is None:
+            stream = _Stream(self.directory, name, self.chunk_size)
+            self._streams[name] = stream
+
+        stream.append(value)
+
+    def _check_new_chunks(self):
+
+        n_chunks = sum(len(stream.chunks) for stream in self._streams.values())
+
+        if n_chunks != self._n_chunks:
+            self._n_chunks = n_chunks
+            self.write_manifest()
+
+    @staticmethod
+    def _body_state(agent: Agent) -> np.ndarray:
+
+        body = agent.base_platform.pm_body
+
+        return np.array([
+            body.position.x, body.position.y, body.angle, body.velocity.x,
+            body.velocity.y, body.angular_velocity
+        ])
+
+    def record_step(self,
+                    engine: Engine,
+                    actions: Dict[Agent, Dict[Actuator, float]],
+                    ):
+        """
+        Records actions, rewards, done flag and agent states after a step of the engine.
+
+        Args:
+            engine: Engine that was stepped.
+            actions: Actions applied during the step.
+
+        """
+
+        self._append('episode', np.int64(self.episode))
+        self._append('elapsed_time', np.int64(engine.elapsed_time))
+        self._append('done', not engine.game_on)
+
+        for agent in engine.agents:
+
+            agent_actions = actions.get(agent, {})
+            self._append(
+                agent.name + '/actions',
+                np.array([float(agent_actions.get(actuator, 0))
+                          for actuator in agent.actuators]))
+
+            self._append(agent.name + '/reward', np.float64(agent.reward))
+            self._append(agent.name + '/state', self._body_state(agent))
+
+        self._check_new_chunks()
+
+    def record_observations(self, engine: Engine):
+        """
+        Records the sensor values of the agents, after the observations of the engine were updated.
+
+        Args:
+            engine: Engine whose observations were updated.
+
+        """
+
+        self._append('observation_episode', np.int64(self.episode))
+        self._append('observation_time', np.int64(engine.elapsed_time))
+
+        for agent in engine.agents:
+            for sensor in agent.sensors:
+
+                if self._sensors is not None and sensor.name not in self._sensors:
+                    continue
+
+                sensor_values = sensor.observe()
+
+                if not isinstance(sensor_values, np.ndarray):
+                    continue
+
+                self._append(agent.name + '/' + sensor.name, sensor_values)
+
+        self._check_new_chunks()
+
+    def record_reset(self, engine: Engine, seed: Optional[int] = None):
+        """
+        Starts a new episode when the engine is reset.
+        Resets happening before anything was recorded don't start a new episode.
+
+        Args:
+            engine: Engine that was reset.
+            seed: Seed used for the reset, if any.
+
+        """
+
+        if self._episode_recorded:
+            self.episode += 1
+            self._episode_recorded = False
+
+    def write_manifest(self):
+        """ Writes the description of all streams in the manifest of the episode."""
+
+        manifest = {
+            'chunk_size': self.chunk_size,
+            'streams': {
+                name: stream.description
+                for name, stream in self._streams.items()
+            }
+        }
+
+        with open(os.path.join(self.directory, MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def close(self):
+        """ Flushes all streams and writes the manifest."""
+
+        for stream in self._streams.values():
+            stream.close()
+
+        self.write_manifest()
+
+
+def load_episode(directory: str) -> Dict[str, np.ndarray]:
+    """
+    Loads an episode written by an EpisodeRecorder.
+    Chunks are opened in read-only memmap mode and concatenated.
+
+    Args:
+        directory: Directory of the episode.
+
+    Returns: Dictionary of arrays, indexed by stream names.
+
+    """
+
+    with open(os.path.join(directory, MANIFEST), 'r') as f:
+        manifest = json.load(f)
+
+    episode = {}
+
+    for name, description in manifest['streams'].items():
+
+        chunks = [
+            np.load(os.path.join(directory, filename), mmap_mode='r')
+            for filename in description['chunks']
+        ]
+
+        episode[name] = np.concatenate(chunks)[:description['length']]
+
+    return episode
+
+
+class ActionLog:
+    """
+    Records the seed and the actions of an episode.
+    Episodes that start from the same seed, with the same actions, are identical:
+    the episode can be reconstructed by replaying the actions.
+
+    The actions of each agent are stored in the order of agent.actuators.
+    Agents are identified by their index in the Engine.
+
+    Attributes:
+        seed: Seed used to reset the Engine before the episode.
+        elapsed_time: Elapsed time of the engine after each recorded step.
+        actions: For each agent, the actions of each recorded step.
+
+    Note:
+        The Engine must be reset with the seed of the log before the episode is recorded.
+    """
+
+    def __init__(self, seed: int):
+
+        self.seed = seed
+        self.elapsed_time: List[int] = []
+        self.actions: List[List[np.ndarray]] = []
+
+    def __len__(self):
+        return len(self.elapsed_time)
+
+    def record_step(self,
+                    engine: Engine,
+                    actions: Dict[Agent, Dict[Actuator, float]],
+                    ):
+
+        if not self.actions:
+            self.actions = [[] for _ in engine.agents]
+
+        self.elapsed_time.append(engine.elapsed_time)
+
+        for agent, agent_log in zip(engine.agents, self.actions):
+            agent_actions = actions.get(agent, {})
+            agent_log.append(np.array([float(agent_actions.get(actuator, 0))
+                                       for actuator in agent.actuators]))
+
+    def record_observations(self, engine: Engine):
+        pass
+
+    def record_reset(self, engine: Engine, seed: Optional[int] = None):
+        """ An ActionLog holds a single episode: resetting the engine starts a new log."""
+
+        if seed is not None:
+            self.seed = seed
+
+        self.elapsed_time = []
+        self.actions = []
+
+    def close(self):
+        pass
+
+    def save(self, path: str):
+        """ Saves the log in a compressed .npz file."""
+
+        agent_actions: Dict[str, Any] = {
+            'agent_' + str(index): np.array(agent_log)
+            for index, agent_log in enumerate(self.actions)
+        }
+
+        np.savez_compressed(path,
+                            seed=self.seed,
+                            elapsed_time=np.array(self.elapsed_time, dtype=np.int64),
+                            **agent_actions)
+
+    @classmethod
+    def load(cls, path: str) -> ActionLog:
+        """ Loads a log saved with save()."""
+
+        with np.load(path) as data:
+
+            action_log = cls(seed=int(data['seed']))
+            action_log.elapsed_time = data['elapsed_time'].tolist()
+
+            n_agents = len(data.files) - 2
+            action_log.actions = [list(data['agent_' + str(index)])
+                                  for index in range(n_agents)]
+
+        return action_log
+
+
+def replay(engine: Engine,
+           action_log: ActionLog,
+           steps: Optional[Iterable[int]] = None,
+           render: bool = True,
+           observe: bool = False,
+           ) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """
+    Replays an episode recorded in an ActionLog.
+    The engine is reset with the seed of the log, then stepped with the recorded actions.
+    Nothing is rendered or sensed, except for the requested steps.
+
+    Note:
+        The Playground of the engine must be built like the one used for recording the episode,
+        including the seed of its layout when elements are placed at random during construction.
+
+    Args:
+        engine: Engine built like the one used for recording the episode.
+        action_log: ActionLog of the episode.
+        steps: Elapsed times at which the engine is rendered or observed.
+            If None, every recorded step is requested.
+        render: If True, an image of the playground is generated for the requested steps.
+        observe: If True, observations of the agents are updated for the requested steps.
+
+    Yields: Elapsed time and image of the playground (None if render is False), for each requested step.
+
+    """
+
+    requested = None if steps is None else set(steps)
+
+    engine.reset(seed=action_log.seed)
+
+    previous_time = 0
+
+    for index, elapsed_time in enumerate(action_log.elapsed_time):
+
+        actions = {
+            agent: {
+                actuator: int(value) if isinstance(actuator, DiscreteActuator) else value
+                for actuator, value in zip(agent.actuators, agent_log[index].tolist())
+            }
+            for agent, agent_log in zip(engine.agents, action_log.actions)
+        }
+
+        n_steps = elapsed_time - previous_time
+        previous_time = elapsed_time
+
+        if n_steps > 1:
+            engine.multiple_steps(actions, n_steps=n_steps)
+        else:
+            engine.step(actions)
+
+        if requested is not None and elapsed_time not in requested:
+            continue
+
+        if observe:
+            engine.update_observations()
+
+        image = engine.generate_playground_image() if render else None
+
+        yield elapsed_time, image
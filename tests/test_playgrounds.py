@@ -1,11 +1,30 @@
+import os
+import pickle
+
+import numpy as np
+import pygame
+import pymunk
+import pytest
+from PIL import Image
+
 from simple_playgrounds.engine import Engine
+from simple_playgrounds.recorder import EpisodeRecorder, load_episode, ActionLog, replay
+from simple_playgrounds.frame_writer import FrameWriter, compose_layout
 
 from simple_playgrounds.agents.agents import BaseAgent
-from simple_playgrounds.agents.sensors import Touch
-from simple_playgrounds.agents.parts.controllers import RandomContinuous
+from simple_playgrounds.agents.sensors import Touch, RgbCamera, TopdownSensor, Lidar
+from simple_playgrounds.agents.parts.controllers import RandomContinuous, RandomDiscrete, External, RandomPopulation
+
+from simple_playgrounds.playgrounds.layouts import SingleRoom, GridRooms
+from simple_playgrounds.common.position_utils import CoordinateSampler, Trajectory
 
-from simple_playgrounds.playgrounds.layouts import SingleRoom
-from simple_playgrounds.common.position_utils import CoordinateSampler
+from simple_playgrounds.playgrounds.collection.test.test_playgrounds import Fields, Trajectories, Conditioning
+from simple_playgrounds.elements.collection.edible import Apple
+from simple_playgrounds.elements.field import Field
+from simple_playgrounds.elements.collection.basic import Wall, WallLayout, Physical
+from simple_playgrounds.common.timer import Timer, TimerScheduler
+from simple_playgrounds.common.definitions import PHYSICS_PRESETS
+from simple_playgrounds.agents.parts.actuators import LongitudinalForce
 
 
 # Add/remove agent from a playground
@@ -253,3 +272,1034 @@ def test_agent_in_different_environments(base_forward_agent):
     pg_1.reset()
     pg_2.reset()
     pg_1.add_agent(agent)
+
+
+def test_element_registry(base_forward_agent):
+
+    playground = Fields()
+    playground.add_agent(base_forward_agent)
+
+    engine = Engine(playground, time_limit=200)
+    engine.run()
+
+    for field in playground.fields:
+        for element in field.produced_entities:
+            assert element in playground.elements
+            assert playground.elements.producer_of(element) is field
+            assert playground.get_entity_from_shape(element.pm_visible_shape) is element
+
+    for part in base_forward_agent.parts:
+        assert playground.get_entity_from_shape(part.pm_visible_shape) is part
+
+    engine.reset()
+
+    assert not [elem for elem in playground.elements if elem.temporary]
+    assert all(not field.produced_entities for field in playground.fields)
+
+    playground.remove_agent(base_forward_agent)
+
+
+def test_element_pool(base_forward_agent):
+
+    playground = Fields()
+    playground.add_agent(base_forward_agent)
+
+    engine = Engine(playground, time_limit=200)
+    engine.run()
+
+    produced = [elem for elem in playground.elements if elem.temporary]
+    assert produced
+
+    engine.reset()
+    engine.run()
+
+    recycled = [elem for elem in playground.elements if elem.temporary]
+    assert set(produced) & set(recycled)
+
+    playground.remove_agent(base_forward_agent)
+
+
+def test_edible_shrinks_in_place():
+
+    playground = SingleRoom(size=(200, 200))
+    apple = Apple(reward=20, min_reward=1, shrink_ratio=0.5)
+    playground.add_element(apple, ((100, 100), 0))
+
+    shape = apple.pm_visible_shape
+    radius = apple.radius
+
+    elems_remove, elems_add = apple.activate(None)
+
+    assert not elems_remove and not elems_add
+    assert apple in playground.elements
+    assert apple.pm_visible_shape is shape
+    assert shape.radius == apple.radius == radius * 0.5
+    assert apple.reward == 10
+
+    playground.reset()
+    apple.pre_step()
+
+    assert shape.radius == apple.radius == radius
+    assert apple.reward == 20
+
+
+def test_timer_scheduler():
+
+    scheduler = TimerScheduler()
+
+    scheduled_timer = Timer([10, 5])
+    stepped_timer = Timer([10, 5])
+    scheduler.add(scheduled_timer)
+
+    assert scheduler.next_event_step() == 10
+
+    for _ in range(100):
+        due = scheduler.step()
+        stepped_timer.step()
+
+        assert (scheduled_timer in due) == stepped_timer.timer_done
+        assert scheduled_timer.timer_done == stepped_timer.timer_done
+
+    # Reset invalidates the previous event
+    scheduled_timer.reset()
+    assert scheduler.next_event_step() == scheduler.current_step + 10
+    assert len(scheduler) == 1
+
+
+def test_trajectories_kinematic():
+
+    playground = Trajectories()
+    engine = Engine(playground, time_limit=100)
+
+    elements = list(playground.elements.trajectories)
+    assert len(elements) == 3
+
+    for elem in elements:
+        assert elem.pm_body.body_type == pymunk.Body.KINEMATIC
+        assert not elem.background
+
+    for _ in range(100):
+        targets = [elem.trajectory.points[elem.trajectory.current_index]
+                   for elem in elements]
+        engine.step({})
+
+        for elem, (pos_x, pos_y, _) in zip(elements, targets):
+            assert elem.position.get_distance((pos_x, pos_y)) < 1e-6
+
+    # Trajectories following the same path share their points
+    trajectory_1 = Trajectory('shape', trajectory_duration=200, shape='square',
+                              center=[100, 70, 0], radius=50)
+    trajectory_2 = Trajectory('shape', trajectory_duration=200, shape='square',
+                              center=[100, 70, 0], radius=50, index_start=10)
+    assert trajectory_1.points is trajectory_2.points
+
+
+def test_merged_walls():
+
+    playground = GridRooms(size=(600, 600), room_layout=(3, 3), doorstep_size=60,
+                           playground_seed=0)
+    n_shapes = len(playground.space.shapes)
+    assert all(isinstance(elem, Wall) for elem in playground.elements)
+
+    playground = GridRooms(size=(600, 600), room_layout=(3, 3), doorstep_size=60,
+                           playground_seed=0, merge_walls=True)
+
+    assert len(playground.elements) == 1
+    walls = next(iter(playground.elements))
+    assert isinstance(walls, WallLayout)
+    assert len(playground.space.shapes) < n_shapes / 2
+
+    # Doorsteps are still open
+    room = playground.grid_rooms[0][0]
+    doorstep = room.doorstep_right
+    start, end = doorstep.start_point, doorstep.end_point
+    middle = (start + end) / 2
+    assert not playground.space.point_query(middle, 0, pymunk.ShapeFilter())
+
+    # Walls between rooms are detected
+    query = playground.space.segment_query_first((100, 100), (300, 100), 1,
+                                                 pymunk.ShapeFilter())
+    assert playground.get_entity_from_shape(query.shape) is walls
+
+
+def test_pickle_engine():
+
+    playground = Conditioning()
+    agent = BaseAgent(controller=External(), interactive=True)
+    agent.add_sensor(RgbCamera(agent.base_platform, invisible_elements=agent.parts))
+    agent.add_sensor(TopdownSensor(agent.base_platform))
+
+    # Pymunk doesn't pickle cached contacts, so the agent starts away from walls and elements
+    playground.add_agent(agent, ((100, 100), 0))
+
+    engine = Engine(playground, time_limit=100)
+    actions = {agent: {actuator: 1 for actuator in agent.actuators}}
+
+    for _ in range(10):
+        engine.step(actions)
+
+    loaded_engine = pickle.loads(pickle.dumps(engine))
+    loaded_agent = loaded_engine.agents[0]
+    loaded_actions = {loaded_agent: {actuator: 1 for actuator in loaded_agent.actuators}}
+
+    assert np.array_equal(engine.generate_playground_image(),
+                          loaded_engine.generate_playground_image())
+
+    for _ in range(10):
+        engine.step(actions)
+        loaded_engine.step(loaded_actions)
+
+    engine.update_observations()
+    loaded_engine.update_observations()
+
+    assert agent.position == loaded_agent.position
+    for sensor, loaded_sensor in zip(agent.sensors, loaded_agent.sensors):
+        assert np.array_equal(sensor.sensor_values, loaded_sensor.sensor_values)
+
+
+def test_clone_engine():
+
+    playground = Conditioning()
+    agent = BaseAgent(controller=External(), interactive=True)
+    agent.add_sensor(RgbCamera(agent.base_platform, invisible_elements=agent.parts))
+    playground.add_agent(agent)
+
+    engine = Engine(playground, time_limit=100)
+    actions = {agent: {actuator: 1 for actuator in agent.actuators}}
+
+    for _ in range(10):
+        engine.step(actions)
+
+    position = agent.position
+    cloned_engine = engine.clone()
+    cloned_agent = cloned_engine.agents[0]
+    cloned_actions = {cloned_agent: {actuator: 1 for actuator in cloned_agent.actuators}}
+
+    assert cloned_agent is not agent
+    assert cloned_engine.playground is not playground
+    assert cloned_engine.playground.space is not playground.space
+
+    # Appearance is shared with the clone
+    for elem, cloned_elem in zip(playground.elements, cloned_engine.playground.elements):
+        assert cloned_elem.texture is elem.texture
+
+    assert np.array_equal(engine.generate_playground_image(),
+                          cloned_engine.generate_playground_image())
+
+    # Stepping the clone leaves the original untouched
+    for _ in range(10):
+        cloned_engine.step(cloned_actions)
+
+    assert agent.position == position
+    assert cloned_agent.position != position
+
+    # Clones branched from the same state follow the same rollout
+    # Contacts cached by pymunk are not copied, so the original can diverge slightly
+    branch_1, branch_2 = engine.clone(), engine.clone()
+
+    for branch in (branch_1, branch_2):
+        branch_agent = branch.agents[0]
+        for _ in range(10):
+            branch.step({branch_agent: {actuator: 1 for actuator in branch_agent.actuators}})
+        branch.update_observations()
+
+    agent_1, agent_2 = branch_1.agents[0], branch_2.agents[0]
+    assert agent_1.position == agent_2.position
+    assert np.array_equal(agent_1.sensors[0].sensor_values, agent_2.sensors[0].sensor_values)
+
+
+def test_episode_recorder(tmp_path):
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=RandomContinuous(), interactive=True)
+    agent.add_sensor(RgbCamera(agent.base_platform, invisible_elements=agent.parts, name='camera'))
+    agent.add_sensor(Touch(agent.base_platform, name='touch'))
+    playground.add_agent(agent)
+
+    recorder = EpisodeRecorder(str(tmp_path), chunk_size=16, sensors=['camera'])
+    engine = Engine(playground, time_limit=50, recorder=recorder)
+
+    positions = []
+    while engine.game_on:
+        engine.step(engine.get_actions())
+        engine.update_observations()
+        positions.append(agent.position)
+
+    last_camera = agent.sensors[0].sensor_values.copy()
+    engine.terminate()
+
+    episode = load_episode(str(tmp_path))
+    n_steps = len(positions)
+
+    assert episode['elapsed_time'].tolist() == list(range(1, n_steps + 1))
+    assert episode['done'].tolist() == [False] * (n_steps - 1) + [True]
+    assert episode[agent.name + '/actions'].shape == (n_steps, len(agent.actuators))
+    assert np.allclose(episode[agent.name + '/state'][:, :2], positions)
+
+    # Only selected sensors are recorded
+    assert np.array_equal(episode[agent.name + '/camera'][-1], last_camera)
+    assert agent.name + '/touch' not in episode
+
+    # Episode is split in chunks
+    assert len(list(tmp_path.glob('done_*.npy'))) == -(-n_steps // 16)
+
+
+def test_episode_recorder_reset(tmp_path):
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=RandomContinuous())
+    playground.add_agent(agent)
+
+    recorder = EpisodeRecorder(str(tmp_path), chunk_size=16)
+    engine = Engine(playground, time_limit=10, recorder=recorder)
+    engine.reset()
+
+    for _ in range(3):
+        engine.run()
+        engine.reset()
+
+    engine.terminate()
+
+    episode = load_episode(str(tmp_path))
+
+    # Episodes end one step before the time limit
+    assert episode['episode'].tolist() == [0] * 9 + [1] * 9 + [2] * 9
+    assert episode['elapsed_time'].tolist() == list(range(1, 10)) * 3
+    assert episode['observation_episode'].tolist() == episode['episode'].tolist()
+
+
+def test_seeded_reset():
+
+    def run_episode(engine, seed):
+        engine.reset(seed=seed)
+        agent = engine.agents[0]
+        for _ in range(50):
+            engine.step({agent: {actuator: 1 for actuator in agent.actuators}})
+        return [elem.position for elem in engine.playground.elements]
+
+    playground = Fields()
+    playground.add_agent(BaseAgent(controller=External()))
+    engine = Engine(playground, time_limit=100)
+
+    assert run_episode(engine, 3) == run_episode(engine, 3)
+    assert run_episode(engine, 3) != run_episode(engine, 4)
+
+
+def test_seeded_construction():
+
+    def run_episode(seed):
+        playground = Fields(seed=seed)
+        agent = BaseAgent(controller=External())
+        playground.add_agent(agent)
+        engine = Engine(playground, time_limit=100)
+        for _ in range(50):
+            engine.step({agent: {actuator: 1 for actuator in agent.actuators}})
+        return [elem.position for elem in engine.playground.elements]
+
+    assert run_episode(3) == run_episode(3)
+    assert run_episode(3) != run_episode(4)
+
+
+def test_seeded_controllers():
+
+    def run_episode(engine, seed):
+        engine.reset(seed=seed)
+        actions = []
+        for _ in range(20):
+            step_actions = engine.get_actions()
+            actions.append([list(agent_actions.values()) for agent_actions in step_actions.values()])
+            engine.step(step_actions)
+        return actions
+
+    def build(seed=None):
+        playground = SingleRoom(size=(200, 200), seed=seed)
+        playground.add_agent(BaseAgent(controller=RandomContinuous(), interactive=True))
+        playground.add_agent(BaseAgent(controller=RandomDiscrete(), interactive=True))
+        return Engine(playground, time_limit=100)
+
+    engine = build()
+
+    assert run_episode(engine, 3) == run_episode(engine, 3)
+    assert run_episode(engine, 3) != run_episode(engine, 4)
+    assert run_episode(build(), 3) == run_episode(engine, 3)
+
+    # Controllers are seeded when the agents are added
+    assert run_episode(build(seed=5), None) == run_episode(build(seed=5), None)
+
+
+def test_standalone_field():
+
+    field = Field(Apple, production_area=CoordinateSampler(center=(50, 50), area_shape='circle', radius=10),
+                  probability=1)
+
+    assert field.can_produce()
+    element, _ = field.produce()
+    assert element in field.produced_entities
+
+
+def test_action_log_replay(tmp_path):
+
+    def build_engine(recorder=None):
+        playground = Fields()
+        playground.add_agent(BaseAgent(controller=RandomContinuous(), interactive=True))
+        return Engine(playground, time_limit=60, recorder=recorder)
+
+    action_log = ActionLog(seed=12)
+    engine = build_engine(action_log)
+    engine.reset(seed=action_log.seed)
+
+    states = {}
+    while engine.game_on:
+        engine.step(engine.get_actions())
+        states[engine.elapsed_time] = [elem.position for elem in engine.playground.elements]
+
+    action_log.save(str(tmp_path / 'episode.npz'))
+    loaded_log = ActionLog.load(str(tmp_path / 'episode.npz'))
+
+    assert len(loaded_log) == len(states)
+
+    replay_engine = build_engine()
+    replayed_steps = []
+
+    for elapsed_time, image in replay(replay_engine, loaded_log, steps=range(20, 30)):
+        assert image.shape[:2] == replay_engine.playground.size[::-1]
+        assert [elem.position for elem in replay_engine.playground.elements] == states[elapsed_time]
+        replayed_steps.append(elapsed_time)
+
+    assert replayed_steps == list(range(20, 30))
+
+
+def test_frame_writer(tmp_path):
+
+    playground = SingleRoom(size=(200, 100))
+    agent = BaseAgent(controller=RandomContinuous())
+    playground.add_agent(agent)
+    engine = Engine(playground, time_limit=100)
+
+    frame = engine.capture_frame()
+    assert frame.dtype == np.uint8
+    assert frame.shape == (100, 200, 3)
+    assert np.array_equal(frame[:, :, ::-1] / 255., engine.generate_playground_image())
+
+    writer = FrameWriter(str(tmp_path), max_size=50, queue_size=1)
+
+    submitted = 0
+    for step in range(10):
+        engine.step(engine.get_actions())
+        submitted += writer.submit(engine.capture_frame(), step)
+
+    writer.close()
+
+    assert writer.written_frames == submitted
+    assert writer.written_frames + writer.dropped_frames == 10
+    assert len(list(tmp_path.glob('frame_*.png'))) == submitted
+
+
+def test_frame_writer_agent_frames(tmp_path):
+
+    playground = SingleRoom(size=(200, 100))
+    agent = BaseAgent(controller=RandomContinuous())
+    agent.add_sensor(Touch(agent.base_platform, invisible_elements=agent.parts))
+    playground.add_agent(agent)
+    engine = Engine(playground, time_limit=100)
+
+    engine.step(engine.get_actions())
+    engine.update_observations()
+
+    panels = engine.capture_agent_frame(agent, with_actions=False)
+    assert all(panel.dtype == np.uint8 for panel in panels.values())
+    assert panels['playground'].shape == (100, 200, 3)
+
+    # The playground panel is scaled and the layout is composed by the background thread
+    writer = FrameWriter(str(tmp_path), layout=('playground', 'sensors'), max_size_playground=100)
+    writer.submit(panels, 0)
+    writer.close()
+
+    frame = np.asarray(Image.open(tmp_path / 'frame_000000.png'))
+    sensors = panels['sensors']
+
+    assert frame.shape == (max(50, sensors.shape[0]) + 10, 100 + sensors.shape[1] + 15, 3)
+    assert np.array_equal(frame[5:5 + sensors.shape[0], 110:110 + sensors.shape[1]], sensors)
+
+
+def test_compose_layout():
+
+    images = {'a': np.zeros((10, 20, 3)), 'b': np.zeros((4, 6, 3)), 'c': np.zeros((8, 10, 3))}
+
+    full_img = compose_layout(images, ('a', ('b', 'c')), border=5)
+
+    assert full_img.shape == (4 + 8 + 15, 20 + 10 + 15, 3)
+    assert full_img.dtype == np.float64
+
+    # Panels stacked in a column are centered
+    assert not full_img[5:9, 32:38].any()
+    assert full_img[5:9, 30:32].all()
+    assert not full_img[14:22, 30:40].any()
+
+
+def test_frame_writer_error(tmp_path):
+
+    writer = FrameWriter(str(tmp_path))
+
+    # Image can't be built from a 1D array of strings
+    writer.submit(np.array(['not', 'a', 'frame']), 0)
+
+    with pytest.raises(TypeError):
+        writer.close()
+
+    # The error of the background thread is raised instead of 'FrameWriter is closed'
+    with pytest.raises(TypeError):
+        writer.submit(np.zeros((10, 10, 3), dtype=np.uint8), 1)
+
+
+def test_headless_engine():
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=RandomContinuous())
+    playground.add_agent(agent)
+
+    with pytest.raises(ValueError):
+        Engine(playground, screen=True, headless=True)
+
+    video_driver = os.environ.get('SDL_VIDEODRIVER')
+    engine = Engine(playground, time_limit=100, headless=True)
+
+    # The process-wide SDL configuration is left untouched
+    assert os.environ.get('SDL_VIDEODRIVER') == video_driver
+
+    for _ in range(10):
+        engine.step(engine.get_actions())
+        engine.update_observations()
+
+    # No sensor or render call needed the surfaces
+    assert engine._surface_buffer is None
+
+    assert engine.capture_frame().shape == (200, 200, 3)
+    assert engine._surface_buffer is not None
+
+    playground_camera = SingleRoom(size=(200, 200))
+    agent_camera = BaseAgent(controller=RandomContinuous())
+    agent_camera.add_sensor(TopdownSensor(agent_camera.base_platform))
+    playground_camera.add_agent(agent_camera)
+
+    engine_camera = Engine(playground_camera, time_limit=100, headless=True)
+    engine_camera.update_observations()
+
+    assert engine_camera._surface_buffer is not None
+    assert agent_camera.sensors[0].sensor_values.max() > 0
+
+    # Terminating a headless engine leaves pygame to the other engines
+    display_initialized = pygame.display.get_init()
+    engine.terminate()
+    assert pygame.display.get_init() == display_initialized
+
+
+def test_sensor_update_period():
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=RandomContinuous())
+
+    camera = RgbCamera(agent.base_platform, invisible_elements=agent.parts,
+                       update_period=3, name='camera')
+    lazy_camera = RgbCamera(agent.base_platform, invisible_elements=agent.parts,
+                            lazy=True, name='lazy_camera')
+    agent.add_sensor(camera)
+    agent.add_sensor(lazy_camera)
+    playground.add_agent(agent)
+
+    with pytest.raises(ValueError):
+        RgbCamera(agent.base_platform, update_period=0)
+
+    engine = Engine(playground, time_limit=100)
+
+    update_times = []
+
+    for _ in range(7):
+        engine.update_observations()
+        update_times.append(camera.last_update)
+        engine.step(engine.get_actions())
+
+    assert update_times == [0, 0, 0, 3, 3, 3, 6]
+
+    # Lazy sensors are only computed when their values are read
+    assert lazy_camera.last_update is None
+    observations = agent.observations
+    assert lazy_camera.last_update == engine.elapsed_time
+    assert observations[lazy_camera] is lazy_camera.sensor_values
+
+    engine.reset()
+    assert camera.last_update is None
+    engine.update_observations()
+    assert camera.last_update == 0
+
+
+def test_ray_sharing():
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=RandomContinuous())
+
+    camera = RgbCamera(agent.base_platform, invisible_elements=agent.parts, fov=180, resolution=64, max_range=300)
+    lidar = Lidar(agent.base_platform, invisible_elements=agent.parts, fov=180, resolution=64, max_range=300)
+    other_lidar = Lidar(agent.base_platform, invisible_elements=agent.parts, fov=90, resolution=64)
+    for sensor in [camera, lidar, other_lidar]:
+        agent.add_sensor(sensor)
+    playground.add_agent(agent)
+
+    # Sensors with the same invisible elements share a collision index
+    assert playground.sensor_collision_index == 3
+    assert camera.invisible_filter == lidar.invisible_filter == other_lidar.invisible_filter
+
+    engine = Engine(playground, time_limit=100)
+    engine.update_observations()
+
+    # Camera and lidar share their rays
+    assert len(playground.ray_cache) == 2
+
+    observations = {sensor: sensor.sensor_values.copy() for sensor in agent.sensors}
+
+    playground.ray_cache.clear()
+    engine.update_observations()
+
+    for sensor in agent.sensors:
+        assert np.array_equal(sensor.sensor_values, observations[sensor])
+
+    engine.step(engine.get_actions())
+    assert not playground.ray_cache
+
+
+def test_parallel_sensors():
+
+    playground = SingleRoom(size=(300, 300))
+
+    for position in [(80, 80), (220, 220), (80, 220)]:
+        agent = BaseAgent(controller=RandomContinuous())
+        agent.add_sensor(RgbCamera(agent.base_platform, invisible_elements=agent.parts))
+        agent.add_sensor(Lidar(agent.base_platform, invisible_elements=agent.parts))
+        agent.add_sensor(TopdownSensor(agent.base_platform))
+        playground.add_agent(agent, (position, 0))
+
+    with pytest.raises(ValueError):
+        Engine(playground, sensor_workers=0)
+
+    engine_parallel = Engine(playground, sensor_workers=2)
+    engine_parallel.update_observations()
+
+    observations = [{sensor: sensor.sensor_values.copy() for sensor in agent.sensors}
+                    for agent in playground.agents]
+
+    engine = Engine(playground)
+    engine.update_observations()
+
+    for agent, agent_observations in zip(playground.agents, observations):
+        for sensor in agent.sensors:
+            assert np.array_equal(sensor.sensor_values, agent_observations[sensor])
+
+    engine_parallel.terminate()
+
+
+def test_step_array():
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=External(), interactive=True, lateral=True)
+    playground.add_agent(agent, ((100, 100), 0))
+
+    engine = Engine(playground, time_limit=100)
+    engine_dict = engine.clone()
+    agent_dict = engine_dict.agents[0]
+
+    layout = agent.action_layout
+    assert layout.actuators == agent.actuators
+    assert layout.discrete.sum() == 2
+
+    # Out-of-range commands are clipped
+    actions = np.full((1, len(layout)), 0.6)
+    actions[0, 0] = 5
+
+    for _ in range(10):
+        engine.step_array(actions)
+        engine_dict.step({agent_dict: agent_dict.action_layout.to_dict(layout.clip(actions[0]))})
+
+    assert agent.position == agent_dict.position
+    assert agent.angle == agent_dict.angle
+    assert [actuator.value for actuator in agent.actuators] == \
+           [actuator.value for actuator in agent_dict.actuators]
+
+    with pytest.raises(ValueError):
+        engine.step_array(np.zeros((2, len(layout))))
+
+
+def test_observation_buffers():
+
+    playground = SingleRoom(size=(300, 300))
+
+    for position in [(80, 80), (220, 220)]:
+        agent = BaseAgent(controller=RandomContinuous())
+        agent.add_sensor(RgbCamera(agent.base_platform, invisible_elements=agent.parts, name='camera'))
+        agent.add_sensor(Touch(agent.base_platform, invisible_elements=agent.parts))
+        playground.add_agent(agent, (position, 0))
+
+    engine = Engine(playground, time_limit=3, observation_buffers=True)
+    buffers = engine.observation_buffers
+
+    # Sensors are stacked by their position in agent.sensors
+    assert buffers.sensors[0].shape == (2,) + playground.agents[0].sensors[0].shape
+    assert buffers.sensors[1].shape == (2,) + playground.agents[0].sensors[1].shape
+    assert len(buffers.sensors) == 2
+
+    sensors = buffers.sensors[0]
+
+    while engine.game_on:
+        engine.step(engine.get_actions())
+        engine.update_observations()
+
+        # Buffers are filled in place
+        assert buffers.sensors[0] is sensors
+
+        for index, agent in enumerate(playground.agents):
+            assert np.array_equal(sensors[index], agent.sensors[0].sensor_values)
+            assert np.array_equal(buffers.sensors[1][index], agent.sensors[1].sensor_values)
+            assert buffers.rewards[index] == agent.reward
+
+    assert buffers.dones.all()
+
+    # Agents must have the same sensors
+    agent = BaseAgent(controller=RandomContinuous())
+    agent.add_sensor(Touch(agent.base_platform, invisible_elements=agent.parts))
+    playground.add_agent(agent)
+
+    with pytest.raises(ValueError):
+        Engine(playground, observation_buffers=True)
+
+
+def test_observation_buffers_agents_change():
+
+    def touch_agent():
+        agent = BaseAgent(controller=RandomContinuous())
+        agent.add_sensor(Touch(agent.base_platform, invisible_elements=agent.parts))
+        return agent
+
+    playground = SingleRoom(size=(300, 300))
+    playground.add_agent(touch_agent(), ((80, 80), 0))
+
+    engine = Engine(playground, time_limit=10, observation_buffers=True)
+    buffers = engine.observation_buffers
+
+    # Buffers are reallocated when agents are added or removed after the Engine is built
+    playground.add_agent(touch_agent(), ((220, 220), 0))
+    engine.step(engine.get_actions())
+    engine.update_observations()
+
+    assert buffers.sensors[0].shape[0] == len(buffers.rewards) == len(buffers.dones) == 2
+    for index, agent in enumerate(playground.agents):
+        assert np.array_equal(buffers.sensors[0][index], agent.sensors[0].sensor_values)
+        assert buffers.rewards[index] == agent.reward
+
+    remaining_agent = playground.agents[1]
+    playground.remove_agent(playground.agents[0])
+    engine.step(engine.get_actions())
+    engine.update_observations()
+
+    assert buffers.sensors[0].shape[0] == len(buffers.rewards) == 1
+    assert np.array_equal(buffers.sensors[0][0], remaining_agent.sensors[0].sensor_values)
+
+
+def test_observation_buffers_lazy():
+
+    playground = SingleRoom(size=(300, 300))
+    agent = BaseAgent(controller=RandomContinuous())
+    agent.add_sensor(RgbCamera(agent.base_platform, invisible_elements=agent.parts, lazy=True))
+    playground.add_agent(agent)
+
+    engine = Engine(playground, time_limit=10, observation_buffers=True)
+    sensor = agent.sensors[0]
+
+    engine.step(engine.get_actions())
+    engine.update_observations()
+
+    # Filling the buffers doesn't compute lazy sensors
+    assert sensor.sensor_values is None
+    assert not engine.observation_buffers.sensors[0].any()
+
+    values = sensor.observe().copy()
+    engine.step(engine.get_actions())
+    engine.update_observations()
+
+    assert np.array_equal(engine.observation_buffers.sensors[0][0], values)
+
+
+def test_random_population():
+
+    playground = SingleRoom(size=(300, 300))
+
+    for _ in range(20):
+        playground.add_agent(BaseAgent(controller=External(), interactive=True, radius=5))
+
+    population = RandomPopulation(playground.agents, seed=3)
+    actions = population.generate_actions()
+
+    layout = playground.agents[0].action_layout
+    assert actions.shape == (20, len(layout))
+    assert np.all(actions >= layout.low) and np.all(actions <= layout.high)
+    assert np.array_equal(actions[:, layout.discrete], np.floor(actions[:, layout.discrete]))
+
+    population.seed(3)
+    assert np.array_equal(population.generate_actions(), actions)
+
+    # Without seed, the population is seeded with the playground
+    seeded_population = RandomPopulation(playground.agents, playground=playground)
+    playground.seed(7)
+    seeded_actions = seeded_population.generate_actions()
+    playground.seed(7)
+    assert np.array_equal(seeded_population.generate_actions(), seeded_actions)
+
+    discrete_actions = RandomPopulation(playground.agents, discrete=True).generate_actions()
+    assert set(np.unique(discrete_actions)) <= {-1, 0, 1}
+
+    engine = Engine(playground, time_limit=5)
+    engine.run(population=population)
+    assert not engine.game_on
+
+
+def test_multiple_steps_repeat_actions():
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=RandomContinuous(), lateral=True)
+    agent.add_sensor(Touch(agent.base_platform, invisible_elements=agent.parts))
+    playground.add_agent(agent, ((100, 100), 0))
+
+    engine = Engine(playground, time_limit=100)
+
+    branch_1 = engine.clone()
+    branch_2 = engine.clone()
+    agent_1, agent_2 = branch_1.agents[0], branch_2.agents[0]
+
+    commands = [0.5, -0.3, 0.2]
+
+    branch_1.multiple_steps({agent_1: dict(zip(agent_1.actuators, commands))}, n_steps=4, observe=True)
+
+    for _ in range(4):
+        branch_2.step({agent_2: dict(zip(agent_2.actuators, commands))})
+
+    assert branch_1.elapsed_time == branch_2.elapsed_time == 4
+    assert agent_1.position == agent_2.position
+    assert agent_1.sensors[0].last_update == 4
+
+
+def test_multiple_steps_hold_noise(monkeypatch):
+
+    playground = SingleRoom(size=(200, 200))
+    agent = BaseAgent(controller=External())
+    playground.add_agent(agent, ((100, 100), 0))
+
+    forward = next(actuator for actuator in agent.actuators if isinstance(actuator, LongitudinalForce))
+    monkeypatch.setattr(forward, '_noise', 'gaussian')
+    forward._parse_noise_params({'mean': 0, 'scale': 0.1})
+
+    values = []
+    update = playground.update
+
+    def record_and_update():
+        values.append((forward.command, forward.value))
+        update()
+
+    monkeypatch.setattr(playground, 'update', record_and_update)
+
+    engine = Engine(playground, time_limit=100)
+    engine.multiple_steps({agent: {forward: 0.5}}, n_steps=4)
+
+    # The noisy value of the first step is held, the last step draws new noise
+    assert values[0][1] != 0.5
+    assert values[0] == values[1] == values[2] == (0.5, values[0][1])
+    assert values[3][0] == 0.5 and values[3][1] != values[0][1]
+
+
+@pytest.mark.parametrize('mode', ['dict', 'array', 'multiple_steps'])
+def test_noisy_actions_reach_physics(monkeypatch, mode):
+
+    def run(noisy):
+        playground = SingleRoom(size=(200, 200))
+        agent = BaseAgent(controller=External())
+        playground.add_agent(agent, ((100, 100), 0))
+
+        forward = next(actuator for actuator in agent.actuators if isinstance(actuator, LongitudinalForce))
+        if noisy:
+            monkeypatch.setattr(forward, '_noise', 'gaussian')
+            forward._parse_noise_params({'mean': 0.5, 'scale': 0})
+
+        engine = Engine(playground, time_limit=100)
+
+        if mode == 'dict':
+            engine.step({agent: {forward: 0.2}})
+        elif mode == 'array':
+            actions = np.zeros((1, len(agent.action_layout)))
+            actions[0, agent.action_layout.actuators.index(forward)] = 0.2
+            engine.step_array(actions)
+        else:
+            engine.multiple_steps({agent: {forward: 0.2}}, n_steps=3)
+
+        assert forward.command == 0.2
+        return agent.velocity
+
+    clean_velocity, noisy_velocity = run(False), run(True)
+
+    # The noise is applied to the force, not only to the value of the actuator
+    assert noisy_velocity.length > clean_velocity.length > 0
+
+
+def test_physics_presets():
+
+    with pytest.raises(ValueError):
+        SingleRoom(size=(200, 200)).set_physics('unknown')
+
+    positions = {}
+
+    for preset in ['fast', 'default', 'accurate']:
+
+        playground = SingleRoom(size=(400, 400))
+        playground.set_physics(preset)
+        assert playground.space.iterations == PHYSICS_PRESETS[preset].iterations
+
+        agent = BaseAgent(controller=External())
+        playground.add_agent(agent, ((100, 200), 0))
+        forward = next(actuator for actuator in agent.actuators if isinstance(actuator, LongitudinalForce))
+
+        engine = Engine(playground, time_limit=100)
+        for _ in range(20):
+            engine.step({agent: {forward: 1}})
+
+        positions[preset] = agent.position
+
+    # Agents move alike with all presets
+    for position in positions.values():
+        assert position.get_distance(positions['default']) < 2
+    assert positions['default'].x > 150
+
+    playground.set_physics('adaptive')
+    assert playground._compute_substeps() > PHYSICS_PRESETS['adaptive'].substeps
+
+    agent.velocity = (0, 0)
+    assert playground._compute_substeps() == PHYSICS_PRESETS['adaptive'].substeps
+
+
+def test_sleeping_bodies():
+
+    playground = SingleRoom(size=(300, 300))
+    playground.set_physics('fast')
+
+    box = Physical(config_key='square', mass=5, movable=True)
+    playground.add_element(box, ((150, 150), 0))
+
+    # Walls are not prepared at each step
+    walls = [elem for elem in playground.elements if elem.background]
+    assert walls
+    assert not set(walls) & set(playground.elements.active)
+    assert box in playground.elements.active
+
+    engine = Engine(playground, time_limit=100)
+
+    box.velocity = (20, 0)
+    engine.step({})
+    assert not box.pm_body.is_sleeping
+
+    for _ in range(50):
+        engine.step({})
+
+    assert box.pm_body.is_sleeping
+
+    # Moving the body wakes it up
+    box.velocity = (20, 0)
+    assert not box.pm_body.is_sleeping
+
+
+def test_fast_forward():
+
+    def build():
+        playground = Conditioning()
+        playground.set_physics('fast')
+        agent = BaseAgent(controller=External(), interactive=True)
+        playground.add_agent(agent, ((150, 100), 0))
+        return Engine(playground, time_limit=300), playground._timers
+
+    engine, timers = build()
+    stepped_engine, stepped_timers = build()
+
+    # Agents are awake and can move, nothing is skipped
+    assert engine.fast_forward(100) == 0
+
+    while not all(body.is_sleeping for body in engine.playground.space.bodies
+                  if body.body_type == pymunk.Body.DYNAMIC):
+        engine.step({})
+        stepped_engine.step({})
+
+    # The jump stops right before the timer of the light is due
+    timer, light = next(iter(timers.items()))
+    n_skipped = engine.fast_forward(1000)
+    assert n_skipped > 0
+    assert engine.elapsed_time == 99
+    assert engine.fast_forward(1000) == 0
+
+    for _ in range(n_skipped):
+        stepped_engine.step({})
+
+    assert engine.elapsed_time == stepped_engine.elapsed_time
+    assert light.state == 0
+
+    engine.step({})
+    stepped_engine.step({})
+
+    stepped_light = next(iter(stepped_timers.values()))
+    assert timer.timer_done
+    assert light.state == stepped_light.state == 1
+
+    # Then until the time limit
+    n_skipped = 0
+    while engine.game_on:
+        n_steps = engine.fast_forward(1000)
+        if n_steps == 0:
+            engine.step({})
+        n_skipped += n_steps
+
+    while stepped_engine.game_on:
+        stepped_engine.step({})
+
+    assert n_skipped > 0
+    assert engine.elapsed_time == stepped_engine.elapsed_time == 299
+    assert engine.agents[0].position == stepped_engine.agents[0].position
+
+
+def test_fast_forward_fields():
+
+    def build():
+        playground = SingleRoom(size=(200, 200), physics='fast')
+        for center in ((50, 50), (150, 150)):
+            area = CoordinateSampler(center=center, area_shape='circle', radius=20)
+            playground.add_field(Field(Apple, production_area=area, probability=0.02,
+                                       limit=5, total_limit=5))
+        playground.add_agent(BaseAgent(controller=External()), ((100, 100), 0))
+        engine = Engine(playground, time_limit=400)
+        engine.reset(seed=12)
+        return engine
+
+    engine = build()
+    stepped_engine = build()
+
+    # Both fields draw from the generator of the playground at each step
+    n_skipped = 0
+    while engine.game_on:
+        n_steps = engine.fast_forward(1000)
+        if n_steps == 0:
+            engine.step({})
+        n_skipped += n_steps
+
+    while stepped_engine.game_on:
+        stepped_engine.step({})
+
+    assert n_skipped > 0
+    assert engine.elapsed_time == stepped_engine.elapsed_time
+
+    for field, stepped_field in zip(engine.playground.fields, stepped_engine.playground.fields):
+        assert field.total_produced == stepped_field.total_produced > 0
+        assert sorted(tuple(elem.position) for elem in field.produced_entities) \
+            == sorted(tuple(elem.position) for elem in stepped_field.produced_entities)
+
+    assert engine.playground.rng.random() == stepped_engine.playground.rng.random()
@@ -1,8 +1,10 @@
-from simple_playgrounds.agents.parts.controllers import RandomContinuous
+import numpy as np
+
+from simple_playgrounds.agents.parts.controllers import RandomContinuous, External
 from simple_playgrounds.agents.agents import HeadAgent
-from simple_playgrounds.agents.sensors import RgbCamera
+from simple_playgrounds.agents.sensors import RgbCamera, SemanticRay, SemanticCones, Lidar, TopdownSensor
 from simple_playgrounds.engine import Engine
-from simple_playgrounds.playgrounds.collection.test.test_playgrounds import Teleports
+from simple_playgrounds.playgrounds.collection.test.test_playgrounds import Teleports, Fields
 
 
 def test_sensor_without_params(any_sensor, pg_cls):
@@ -86,3 +88,116 @@ def test_rgb_on_teleports(base_forward_agent):
 
     playground.remove_agent(agent)
     playground.reset()
+
+
+def test_semantic_cones_closest_detection():
+
+    agent = HeadAgent(controller=RandomContinuous())
+
+    cones = SemanticCones(anchor=agent.head, invisible_elements=agent.parts,
+                          n_cones=5, rays_per_cone=4, fov=180, max_range=200)
+    rays = SemanticRay(anchor=agent.head, invisible_elements=agent.parts,
+                       remove_duplicates=False, fov=180, resolution=20, max_range=200)
+    agent.add_sensor(cones)
+    agent.add_sensor(rays)
+
+    playground = Fields()
+    playground.add_agent(agent)
+
+    engine = Engine(playground, time_limit=50)
+
+    while engine.game_on:
+        engine.step(engine.get_actions())
+        engine.update_observations()
+
+        # Each cone keeps the closest detection of its rays
+        for detection in cones.sensor_values:
+            cone_distances = [
+                ray_detection.distance for ray_detection in rays.sensor_values
+                if min(cones.angles_cone_center, key=lambda x: (x - ray_detection.angle)**2) == detection.angle
+            ]
+            assert detection.distance == min(cone_distances)
+
+        assert len(cones.sensor_values) <= 5
+
+
+def test_semantic_array_output():
+
+    agent = HeadAgent(controller=RandomContinuous())
+
+    sensors = []
+    for sensor_class, params in ((SemanticRay, {'resolution': 20}),
+                                 (SemanticCones, {'n_cones': 5, 'rays_per_cone': 4})):
+        for array_output in (False, True):
+            sensor = sensor_class(anchor=agent.head, invisible_elements=agent.parts,
+                                  fov=180, max_range=200, array_output=array_output, **params)
+            agent.add_sensor(sensor)
+            sensors.append(sensor)
+
+    playground = Fields()
+    playground.add_agent(agent)
+
+    engine = Engine(playground, time_limit=50, observation_buffers=True)
+
+    ray_list, ray_array, cone_list, cone_array = sensors
+    assert ray_array.shape == (20,)
+    assert cone_array.shape == (5,)
+
+    while engine.game_on:
+        engine.step(engine.get_actions())
+        engine.update_observations()
+
+        for list_sensor, array_sensor in ((ray_list, ray_array), (cone_list, cone_array)):
+
+            detections = array_sensor.sensor_values[array_sensor.sensor_values['valid']]
+            assert len(detections) == len(list_sensor.sensor_values)
+
+            for detection, row in zip(list_sensor.sensor_values, detections):
+                assert playground.elements.entity_from_id(row['entity_id']) is detection.entity
+                assert playground.elements.types_by_id[row['type_id']] is type(detection.entity)
+                assert row['distance'] == detection.distance
+                assert row['angle'] == detection.angle
+
+            assert (array_sensor.sensor_values['entity_id'][~array_sensor.sensor_values['valid']] == -1).all()
+
+        # Array outputs can be stacked in the observation buffers
+        assert np.array_equal(engine.observation_buffers.sensors[agent.sensors.index(cone_array)][0],
+                              cone_array.sensor_values)
+
+
+def test_sensor_noise_seeded():
+
+    agent = HeadAgent(controller=External())
+    agent.add_sensor(RgbCamera(anchor=agent.head, invisible_elements=agent.parts,
+                               noise_params={'type': 'gaussian', 'scale': 20}))
+    agent.add_sensor(Lidar(anchor=agent.head, invisible_elements=agent.parts,
+                           noise_params={'type': 'salt_pepper', 'probability': 0.2}))
+    agent.add_sensor(TopdownSensor(anchor=agent.head, invisible_elements=agent.parts,
+                                   noise_params={'type': 'salt_pepper', 'probability': 1}))
+
+    playground = Fields()
+    playground.add_agent(agent)
+
+    engine = Engine(playground, time_limit=10)
+
+    def observe(seed):
+
+        engine.reset(seed=seed)
+        engine.step({})
+        engine.update_observations()
+
+        return [sensor.sensor_values.copy() for sensor in agent.sensors]
+
+    first = observe(5)
+    second = observe(5)
+    other = observe(6)
+
+    for values, same_seed_values, other_seed_values in zip(first, second, other):
+        assert np.array_equal(values, same_seed_values)
+        assert not np.array_equal(values, other_seed_values)
+
+        assert values.min() >= 0
+        assert values.max() <= 1
+
+    # With probability 1, every pixel is either off or at its maximum value
+    assert np.isin(first[2], (0, 1)).all()